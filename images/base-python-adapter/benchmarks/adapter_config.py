@@ -0,0 +1,99 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compare the per-request cost of forwarding an adapter config to the adapter.
+
+Converts a typical request JSON to the adapter instance written to the adapter's
+input pipe, using:
+  * model: the generated 'AdapterConfig' model ('from_dict', then 'to_dict')
+  * fast:  'model_json.model_dict', which renames the keys directly
+
+Run from the 'base-python-adapter' directory:
+    python -m benchmarks.adapter_config [--requests N] [--identifiers N]
+"""
+import argparse
+import timeit
+from typing import Any
+from typing import Callable
+from typing import Dict
+
+from swagger_server.controllers import controller
+from swagger_server.model_json import model_dict
+from swagger_server.models.adapter_config import AdapterConfig
+
+EXTRAS = {
+    "collection_number": 1,
+    "collection_window": {"start_time": 0, "end_time": 1},
+}
+
+
+def request_json(identifiers: int) -> Dict[str, Any]:
+    return {
+        "adapterKey": {
+            "name": "Adapter Instance",
+            "adapterKind": "Adapter",
+            "objectKind": "Adapter_adapter_instance",
+            "identifiers": [
+                {"key": f"id-{i}", "value": str(i), "isPartOfUniqueness": i == 0}
+                for i in range(identifiers)
+            ],
+        },
+        "credentialConfig": {
+            "credentialKey": "credentials",
+            "credentialFields": [
+                {"key": "user", "value": "admin", "isPassword": False},
+                {"key": "password", "value": "secret", "isPassword": True},
+            ],
+        },
+        "clusterConnectionInfo": {
+            "userName": "maintenanceAdmin",
+            "password": "token",
+            "hostName": "operations.example.com",
+        },
+        "certificateConfig": {
+            "certificates": [
+                {
+                    "certPemString": "-----BEGIN CERTIFICATE-----",
+                    "isInvalidHostnameAccepted": False,
+                    "isExpiredCertificateAccepted": False,
+                }
+            ]
+        },
+    }
+
+
+def measure(name: str, convert: Callable[[], bytes], requests: int) -> float:
+    seconds = min(timeit.repeat(convert, number=requests, repeat=5)) / requests
+    print(f"{name:<6} {seconds * 1e6:8.1f} us per request")
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--identifiers", type=int, default=5)
+    args = parser.parse_args()
+
+    body = request_json(args.identifiers)
+    assert controller.encode_adapter_instance(  # nosec: benchmark sanity check
+        AdapterConfig.from_dict(body), EXTRAS
+    ) == controller.encode_adapter_instance(model_dict(body, AdapterConfig), EXTRAS)
+
+    model = measure(
+        "model",
+        lambda: controller.encode_adapter_instance(
+            AdapterConfig.from_dict(body), EXTRAS
+        ),
+        args.requests,
+    )
+    fast = measure(
+        "fast",
+        lambda: controller.encode_adapter_instance(
+            model_dict(body, AdapterConfig), EXTRAS
+        ),
+        args.requests,
+    )
+    print(f"speedup {model / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
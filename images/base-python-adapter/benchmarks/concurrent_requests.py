@@ -0,0 +1,137 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compare the server's handling of concurrent requests by transport.
+
+Runs a minimal adapter for many concurrent requests, from a fixed number of
+request threads (as the HTTP server does), using:
+  * fifo: named pipes, with a writer and a reader thread per request
+    ('controller.communicate')
+  * pipe: anonymous pipes, driven by the orchestrator's event loop
+    ('controller.exchange')
+
+Reports the wall time and the peak number of threads in the server process.
+
+Run from the 'base-python-adapter' directory:
+    python -m benchmarks.concurrent_requests [--requests N] [--threads N]
+"""
+import argparse
+import concurrent.futures
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable
+from typing import List
+from typing import Tuple
+
+from swagger_server import orchestrator
+from swagger_server.controllers import controller
+
+ADAPTER = """
+import json
+import sys
+import time
+
+
+def main(argv):
+    method, input_pipe, output_pipe = argv
+    with open(input_pipe) as f:
+        json.load(f)
+    # Simulate a test connection that waits on a remote system
+    time.sleep(0.2)
+    with open(output_pipe, "w") as f:
+        json.dump({"method": method}, f)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+"""
+
+
+def run_fifo(command: List[str], dir: str) -> Tuple[str, int]:
+    request_dir = tempfile.mkdtemp(dir=dir)
+    input_pipe = os.path.join(request_dir, "input_pipe")
+    output_pipe = os.path.join(request_dir, "output_pipe")
+    os.mkfifo(input_pipe)
+    os.mkfifo(output_pipe)
+    try:
+        return controller.communicate(
+            lambda: subprocess.Popen(
+                command + [input_pipe, output_pipe],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+            ),
+            input_pipe,
+            output_pipe,
+            None,
+            200,
+            None,
+        )
+    finally:
+        shutil.rmtree(request_dir)
+
+
+def run_pipe(command: List[str], dir: str) -> Tuple[str, int]:
+    return controller.exchange(command, "spawn", None, 200, None)
+
+
+def run_concurrently(
+    run: Callable[[List[str], str], Tuple[str, int]],
+    command: List[str],
+    dir: str,
+    requests: int,
+    threads: int,
+) -> Tuple[float, int]:
+    peak_threads = threading.active_count()
+    done = threading.Event()
+
+    def monitor() -> None:
+        nonlocal peak_threads
+        while not done.wait(0.005):
+            peak_threads = max(peak_threads, threading.active_count())
+
+    monitor_thread = threading.Thread(target=monitor)
+    monitor_thread.start()
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+        for result, code in executor.map(lambda _: run(command, dir), range(requests)):
+            assert code == 200, result  # nosec: benchmark sanity check
+    elapsed = time.perf_counter() - start
+    done.set()
+    monitor_thread.join()
+    # The monitor thread is not part of the server
+    return elapsed, peak_threads - 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=50)
+    args = parser.parse_args()
+
+    dir = tempfile.mkdtemp()
+    try:
+        script = os.path.join(dir, "adapter.py")
+        with open(script, "w") as f:
+            f.write(ADAPTER)
+        command = [sys.executable, script, "test"]
+
+        for name, run in (("fifo", run_fifo), ("pipe", run_pipe)):
+            elapsed, peak_threads = run_concurrently(
+                run, command, dir, args.requests, args.threads
+            )
+            print(
+                f"{name:<5} {args.requests} requests in {elapsed:6.2f} s   "
+                f"peak threads {peak_threads:4d}"
+            )
+    finally:
+        orchestrator.shutdown()
+        shutil.rmtree(dir)
+
+
+if __name__ == "__main__":
+    main()
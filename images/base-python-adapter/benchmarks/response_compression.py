@@ -0,0 +1,63 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compare the cost and size of compressing a large collect result response.
+
+Streams a generated collect result through 'compression.GzipMiddleware' in the
+chunks the server responds with, at each compression level, and reports the time
+taken and the size of the compressed response.
+
+Run from the 'base-python-adapter' directory:
+    python -m benchmarks.response_compression [--objects N] [--levels 1,6,9]
+"""
+import argparse
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+from benchmarks.result_passthrough import collect_result
+from swagger_server import compression
+from swagger_server.controllers import controller
+
+ENVIRON = {"REQUEST_METHOD": "POST", "HTTP_ACCEPT_ENCODING": "gzip, deflate"}
+
+
+def response_size(data: bytes, level: int) -> int:
+    def app(environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        start_response("200 OK", [("Content-Type", "application/json")])
+        for start in range(0, len(data), controller.RESPONSE_CHUNK_SIZE):
+            yield data[start : start + controller.RESPONSE_CHUNK_SIZE]
+
+    def start_response(
+        status: str, headers: List[Tuple[str, str]], exc_info: Any = None
+    ) -> None:
+        pass
+
+    middleware = compression.GzipMiddleware(app, level=level)
+    return sum(len(chunk) for chunk in middleware(dict(ENVIRON), start_response))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--objects", type=int, default=50000)
+    parser.add_argument("--levels", default="1,6,9")
+    args = parser.parse_args()
+
+    data = collect_result(args.objects)
+    mib = len(data) / 1024 / 1024
+    print(f"collect result of {mib:.1f} MiB")
+    for level in (int(level) for level in args.levels.split(",")):
+        start = time.perf_counter()
+        size = response_size(data, level)
+        elapsed = time.perf_counter() - start
+        print(
+            f"level {level}  {elapsed:6.2f} s  {mib / elapsed:7.1f} MiB/s   "
+            f"response {size / 1024 / 1024:6.2f} MiB ({len(data) / size:5.1f}x smaller)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compare the server's cost of turning a large collect result into a response.
+
+Feeds a generated collect result to 'controller.ResultReader' in pipe-sized
+chunks, and produces the response body:
+  * validate:    the result is parsed, and re-encoded by connexion
+  * passthrough: the result is checked to be complete, and its bytes are used as
+                 they are
+
+Reports the time, and the peak memory allocated by Python (measured in a separate
+run, since tracing slows it down) for each.
+
+Run from the 'base-python-adapter' directory:
+    python -m benchmarks.result_passthrough [--objects N]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable
+
+from connexion.apis.flask_api import FlaskApi
+from swagger_server.controllers import controller
+
+
+def collect_result(objects: int) -> bytes:
+    return json.dumps(
+        {
+            "result": [
+                {
+                    "key": {
+                        "adapterKind": "Adapter",
+                        "objectKind": "Object",
+                        "name": f"object-{i}",
+                        "identifiers": [
+                            {"key": "id", "value": str(i), "isPartOfUniqueness": True}
+                        ],
+                    },
+                    "metrics": [
+                        {"key": f"metric-{m}", "numberValue": i * 0.5, "timestamp": 1}
+                        for m in range(20)
+                    ],
+                    "properties": [
+                        {"key": "state", "stringValue": "ok", "timestamp": 1}
+                    ],
+                    "events": [],
+                }
+                for i in range(objects)
+            ],
+            "relationships": [],
+            "nonExistingObjects": [],
+        }
+    ).encode("utf-8")
+
+
+def respond(data: bytes, passthrough: bool) -> int:
+    reader = controller.ResultReader(passthrough)
+    for start in range(0, len(data), controller.READ_SIZE):
+        reader.feed(data[start : start + controller.READ_SIZE])
+    result = reader.result()
+    if passthrough:
+        return sum(len(chunk) for chunk in result.response)
+    return len(FlaskApi.jsonifier.dumps(result))
+
+
+def measure(name: str, run: Callable[[], int]) -> None:
+    start = time.perf_counter()
+    size = run()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<12} {elapsed:7.2f} s   peak memory {peak / 1024 / 1024:8.1f} MiB   "
+        f"response {size / 1024 / 1024:6.1f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--objects", type=int, default=50000)
+    args = parser.parse_args()
+
+    data = collect_result(args.objects)
+    print(f"collect result of {len(data) / 1024 / 1024:.1f} MiB")
+    measure("validate", lambda: respond(data, passthrough=False))
+    measure("passthrough", lambda: respond(data, passthrough=True))
+
+
+if __name__ == "__main__":
+    main()
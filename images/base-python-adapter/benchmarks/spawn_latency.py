@@ -0,0 +1,171 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compare the per-request latency of the server's adapter execution modes.
+
+Runs a minimal adapter that imports a set of commonly-used modules through
+'controller.communicate' using:
+  * spawn:  a new process for each request ('subprocess.Popen')
+  * fork:   a child forked from a zygote that has already imported the adapter
+  * worker: a long-lived worker that has already imported the adapter
+
+Run from the 'base-python-adapter' directory:
+    python -m benchmarks.spawn_latency [--requests N] [--imports module,module,...]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable
+from typing import List
+
+from swagger_server import worker_pool
+from swagger_server import zygote
+from swagger_server.controllers import controller
+
+DEFAULT_IMPORTS = [
+    "asyncio",
+    "decimal",
+    "email.mime.multipart",
+    "http.client",
+    "json",
+    "logging.handlers",
+    "ssl",
+    "xml.etree.ElementTree",
+    # These are only imported if they are installed
+    "aria.ops.result",
+    "requests",
+]
+
+ADAPTER = """
+import json
+import sys
+
+for module in {imports!r}:
+    try:
+        __import__(module)
+    except ImportError:
+        pass
+
+
+def main(argv):
+    method, input_pipe, output_pipe = argv
+    with open(input_pipe) as f:
+        json.load(f)
+    with open(output_pipe, "w") as f:
+        json.dump({{"method": method}}, f)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+"""
+
+
+def run_requests(
+    start_process: Callable[[str, str], object], requests: int, dir: str
+) -> List[float]:
+    times = []
+    for i in range(requests):
+        request_dir = tempfile.mkdtemp(dir=dir)
+        input_pipe = os.path.join(request_dir, "input_pipe")
+        output_pipe = os.path.join(request_dir, "output_pipe")
+        os.mkfifo(input_pipe)
+        os.mkfifo(output_pipe)
+        start = time.perf_counter()
+        result, code = controller.communicate(
+            lambda: start_process(input_pipe, output_pipe),
+            input_pipe,
+            output_pipe,
+            None,
+            200,
+            None,
+        )
+        times.append(time.perf_counter() - start)
+        assert code == 200, result  # nosec: benchmark sanity check
+        shutil.rmtree(request_dir)
+    return times
+
+
+def run_worker_requests(pool: worker_pool.WorkerPool, requests: int) -> List[float]:
+    times = []
+    for i in range(requests):
+        start = time.perf_counter()
+        with pool.acquire() as worker:
+            result, code = controller.communicate(
+                lambda: worker.start("collect"),
+                worker.input_pipe,
+                worker.output_pipe,
+                None,
+                200,
+                None,
+            )
+        times.append(time.perf_counter() - start)
+        assert code == 200, result  # nosec: benchmark sanity check
+    return times
+
+
+def report(name: str, times: List[float]) -> None:
+    times_ms = sorted(t * 1000 for t in times)
+    p95 = times_ms[int(0.95 * (len(times_ms) - 1))]
+    print(
+        f"{name:<8} mean {statistics.mean(times_ms):8.2f} ms   "
+        f"median {statistics.median(times_ms):8.2f} ms   p95 {p95:8.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--imports", default=",".join(DEFAULT_IMPORTS))
+    args = parser.parse_args()
+
+    dir = tempfile.mkdtemp()
+    try:
+        script = os.path.join(dir, "adapter.py")
+        with open(script, "w") as f:
+            f.write(ADAPTER.format(imports=args.imports.split(",")))
+        command = [sys.executable, script, "collect"]
+
+        report(
+            "spawn",
+            run_requests(
+                lambda input_pipe, output_pipe: subprocess.Popen(
+                    command + [input_pipe, output_pipe],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    universal_newlines=True,
+                ),
+                args.requests,
+                dir,
+            ),
+        )
+
+        adapter_zygote = zygote.Zygote(sys.executable, script)
+        try:
+            report(
+                "fork",
+                run_requests(
+                    lambda input_pipe, output_pipe: adapter_zygote.fork(
+                        "collect", input_pipe, output_pipe
+                    ),
+                    args.requests,
+                    dir,
+                ),
+            )
+        finally:
+            adapter_zygote.stop()
+
+        pool = worker_pool.WorkerPool(sys.executable, script)
+        try:
+            report("worker", run_worker_requests(pool, args.requests))
+        finally:
+            pool.shutdown()
+    finally:
+        shutil.rmtree(dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,13 @@ import os
 import connexion
 from cheroot import wsgi
 from cheroot.ssl.builtin import BuiltinSSLAdapter
+from swagger_server import compression
 from swagger_server import encoder
+from swagger_server import orchestrator
 from swagger_server import server_logging
+from swagger_server import worker_pool
+from swagger_server import zygote
+from swagger_server.controllers import controller
 
 
 def main() -> None:
@@ -22,6 +27,12 @@ def main() -> None:
         pythonic_params=True,
         validate_responses=False,
     )
+    config = controller.getexecutionconfig()
+    if config.getboolean("compress_responses", True):
+        app.app.wsgi_app = compression.GzipMiddleware(
+            app.app.wsgi_app,
+            level=config.getint("compression_level", compression.DEFAULT_LEVEL),
+        )
 
     ssl_cert = "/etc/ssl/certs/dockerized.crt"
     ssl_key = "/etc/ssl/certs/dockerized.key"
@@ -32,10 +43,20 @@ def main() -> None:
     logger.info(f"Port: {port}")
 
     # production server
-    server = wsgi.Server(("0.0.0.0", port), app)
+    server = wsgi.Server(
+        ("0.0.0.0", port),
+        app,
+        numthreads=config.getint("server_threads", 10),
+    )
     if port == 443:
         server.ssl_adapter = BuiltinSSLAdapter(ssl_cert, ssl_key, None)
-    server.start()
+    controller.start_workers()
+    try:
+        server.start()
+    finally:
+        worker_pool.shutdown()
+        zygote.shutdown()
+        orchestrator.shutdown()
 
 
 if __name__ == "__main__":
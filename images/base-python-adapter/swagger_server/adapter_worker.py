@@ -0,0 +1,199 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Long-lived adapter worker process.
+
+This module is run with the adapter's Python interpreter (not imported by the
+server). It imports the adapter script once, and then repeatedly invokes the
+adapter's `main(argv)` function for each request the server sends over a framed
+channel on stdin/stdout. This avoids paying interpreter startup and module import
+costs on every request.
+
+Usage: python -m swagger_server.adapter_worker <adapter script> <input pipe> <output pipe>
+
+Each frame is a 4-byte, big-endian, unsigned length followed by a UTF-8 encoded JSON
+document of that length. The worker sends a 'ready' frame once the adapter has been
+imported, then for each request frame of the form `{"method": <method>}` it replies
+with a frame containing the exit code, captured stdout/stderr and peak memory usage.
+
+The input and output pipes are fixed for the lifetime of the worker, and sys.argv
+is set before the adapter is imported. This ensures that default arguments bound
+to sys.argv at import time (e.g., `AdapterInstance.from_input()` and
+`send_results()`) resolve to the worker's pipes.
+"""
+import contextlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import resource
+import struct
+import sys
+import traceback
+from types import ModuleType
+from typing import Any
+from typing import Dict
+from typing import IO
+from typing import List
+from typing import Optional
+
+_HEADER = struct.Struct(">I")
+
+
+def write_frame(stream: IO[bytes], message: Dict[str, Any]) -> None:
+    """Write a single length-prefixed JSON frame to 'stream' and flush it."""
+    payload = json.dumps(message).encode("utf-8")
+    stream.write(_HEADER.pack(len(payload)))
+    stream.write(payload)
+    stream.flush()
+
+
+def read_frame(stream: IO[bytes]) -> Optional[Dict[str, Any]]:
+    """Read a single length-prefixed JSON frame from 'stream'.
+
+    Returns None if the stream was closed before a full frame could be read.
+    """
+    header = _read_exactly(stream, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    payload = _read_exactly(stream, length)
+    if payload is None:
+        return None
+    return json.loads(payload.decode("utf-8"))  # type: ignore[no-any-return]
+
+
+def _read_exactly(stream: IO[bytes], size: int) -> Optional[bytes]:
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def _max_rss_bytes() -> int:
+    # ru_maxrss is reported in kilobytes on Linux (the adapter container OS)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def system_exit_code(e: SystemExit) -> int:
+    """Return the exit code the interpreter would use for an uncaught SystemExit"""
+    if e.code is None:
+        return 0
+    if isinstance(e.code, int):
+        return e.code
+    # sys.exit("message") prints the message to stderr and exits with code 1
+    print(e.code, file=sys.stderr)
+    return 1
+
+
+def _reset_process_state() -> None:
+    """Reset process-wide state that an adapter expects to be fresh on each run."""
+    # Adapters call 'setup_logging' at the start of every run, which relies on
+    # 'logging.basicConfig' installing a new handler. 'basicConfig' is a no-op if
+    # the root logger already has handlers, so remove the previous run's handlers.
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+    # The adapter library's Timer accumulates timings in a class variable that is
+    # graphed at the end of each run.
+    timer_module = sys.modules.get("aria.ops.timer")
+    if timer_module is not None:
+        timer_module.Timer.timers.clear()
+
+
+def load_adapter(script: str) -> ModuleType:
+    """Import the adapter script as a module, as if it were run by 'python <script>'.
+
+    The module is not imported as '__main__', so the script's
+    `if __name__ == "__main__"` block is not executed.
+    """
+    script_dir = os.path.dirname(os.path.abspath(script))
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    name = os.path.splitext(os.path.basename(script))[0]
+    spec = importlib.util.spec_from_file_location(name, script)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load adapter script '{script}'")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    if not callable(getattr(module, "main", None)):
+        raise ImportError(f"Adapter script '{script}' does not define 'main(argv)'")
+    return module
+
+
+def run_request(
+    adapter: ModuleType, method: str, input_pipe: str, output_pipe: str
+) -> Dict[str, Any]:
+    """Run a single adapter invocation and return the reply frame."""
+    argv = [method, input_pipe, output_pipe]
+    sys.argv = [sys.argv[0]] + argv
+    _reset_process_state()
+
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    exit_code = 0
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            adapter.main(argv)
+        except SystemExit as e:
+            exit_code = system_exit_code(e)
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+    return {
+        "exit_code": exit_code,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "max_rss": _max_rss_bytes(),
+    }
+
+
+def main(argv: List[str]) -> None:
+    if len(argv) != 3:
+        print(
+            "Arguments must be <adapter script> <inputfile> <outputfile>",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    script, input_pipe, output_pipe = argv
+
+    # Move the channel off of fd 0 and 1 so that anything the adapter (or a native
+    # library it uses) writes to stdout cannot corrupt the framing. Stray writes to
+    # stdout end up on the worker's stderr instead.
+    channel_in = os.fdopen(os.dup(0), "rb")
+    channel_out = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    os.dup2(2, 1)
+
+    # The adapter is imported with the same arguments it would get if run by the
+    # server directly. The method is a placeholder; it is supplied per request.
+    sys.argv = [script, "worker", input_pipe, output_pipe]
+    try:
+        adapter = load_adapter(script)
+    except BaseException as e:
+        traceback.print_exc()
+        write_frame(channel_out, {"ready": False, "error": repr(e)})
+        sys.exit(1)
+    write_frame(channel_out, {"ready": True, "max_rss": _max_rss_bytes()})
+
+    while True:
+        request = read_frame(channel_in)
+        if request is None:
+            # The server closed the channel; this worker is being retired.
+            break
+        write_frame(
+            channel_out,
+            run_request(adapter, request["method"], input_pipe, output_pipe),
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,168 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Fork-server ('zygote') for adapter commands.
+
+This module is run with the adapter's Python interpreter (not imported by the
+server). It imports the adapter script once, and then forks a new child process for
+each request the server sends. Each request still runs in its own process, so a
+crash or memory leak only affects that request, but interpreter startup and module
+import costs are only paid once.
+
+Usage: python -m swagger_server.adapter_zygote <adapter script> <socket fd>
+
+Requests are received on a SOCK_SEQPACKET unix socket, one message per request: a
+JSON document of the form
+`{"argv": [<method>, <input pipe>, <output pipe>], "fds": [<fd>, ...]}`,
+accompanied by the write ends of the stdout and stderr pipes for the child, followed
+by the file descriptors listed in 'fds' (the server's numbers for them). Pipe paths
+of the form '/dev/fd/<fd>' that refer to one of those are rewritten to refer to the
+child's copy. The zygote replies with `{"pid": <pid>}` once the child has been
+forked, accompanied by a pidfd for the child if the system supports them. The server
+detects that the child has exited when the pidfd becomes readable, as the stdout and
+stderr pipes may be kept open by processes the child started. Without a pidfd, the
+server detects that the child has exited when both pipes are closed.
+"""
+import atexit
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+from types import ModuleType
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from swagger_server.adapter_worker import load_adapter
+from swagger_server.adapter_worker import system_exit_code
+
+MAX_MESSAGE_SIZE = 65536
+
+# The maximum number of file descriptors passed with a request, in addition to the
+# stdout and stderr pipes
+MAX_PASSED_FDS = 4
+
+
+def send_message(
+    sock: socket.socket, message: Dict[str, Any], fds: Sequence[int] = ()
+) -> None:
+    data = json.dumps(message).encode("utf-8")
+    if fds:
+        socket.send_fds(sock, [data], fds)
+    else:
+        sock.send(data)
+
+
+def open_pidfd(pid: int) -> Optional[int]:
+    """Open a pidfd for a child, or return None if pidfds are not supported (Python
+    < 3.9 or Linux < 5.3), or the child has already exited and been reaped"""
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None:
+        return None
+    try:
+        return pidfd_open(pid)  # type: ignore[no-any-return]
+    except OSError:
+        return None
+
+
+def child_argv(argv: List[str], server_fds: List[int], fds: List[int]) -> List[str]:
+    """Rewrite the '/dev/fd/<fd>' arguments of a request to refer to the file
+    descriptors the zygote received in place of the server's"""
+    paths = {
+        f"/dev/fd/{server_fd}": f"/dev/fd/{fd}"
+        for server_fd, fd in zip(server_fds, fds)
+    }
+    return [paths.get(arg, arg) for arg in argv]
+
+
+def run_child(
+    adapter: ModuleType, argv: List[str], stdout_fd: int, stderr_fd: int
+) -> None:
+    """Run a single adapter invocation in a newly-forked child. Does not return."""
+    exit_code = 0
+    try:
+        # Restore default signal handling for the adapter (e.g., so that
+        # 'subprocess' can wait for its own children)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        os.close(stdout_fd)
+        os.close(stderr_fd)
+
+        sys.argv = [sys.argv[0]] + argv
+        adapter.main(argv)
+    except SystemExit as e:
+        exit_code = system_exit_code(e)
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        # Emulate a normal interpreter exit, without unwinding into the zygote's
+        # request loop
+        try:
+            atexit._run_exitfuncs()
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(exit_code)
+
+
+def main(argv: List[str]) -> None:
+    if len(argv) != 2:
+        print("Arguments must be <adapter script> <socket fd>", file=sys.stderr)
+        sys.exit(1)
+    script, fd = argv
+    sock = socket.socket(fileno=int(fd))
+
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+
+    # Placeholder arguments, so that adapters that read sys.argv at import time can be
+    # imported. Each child is given the request's arguments before calling 'main'.
+    # Note that this requires a version of the adapter library that reads the pipe
+    # paths from sys.argv when 'from_input' and 'send_results' are called.
+    sys.argv = [script, "zygote", "input_pipe", "output_pipe"]
+    try:
+        adapter = load_adapter(script)
+    except BaseException as e:
+        traceback.print_exc()
+        send_message(sock, {"ready": False, "error": repr(e)})
+        sys.exit(1)
+
+    # Children are never waited on by the zygote; let the kernel reap them.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    send_message(sock, {"ready": True})
+
+    while True:
+        try:
+            message, fds, _, _ = socket.recv_fds(
+                sock, MAX_MESSAGE_SIZE, 2 + MAX_PASSED_FDS
+            )
+        except OSError:
+            break
+        if not message:
+            # The server closed the socket
+            break
+        request = json.loads(message.decode("utf-8"))
+        stdout_fd, stderr_fd, *passed_fds = fds
+        argv = child_argv(request["argv"], request.get("fds", []), passed_fds)
+        pid = os.fork()
+        if pid == 0:
+            sock.close()
+            run_child(adapter, argv, stdout_fd, stderr_fd)
+        for received_fd in fds:
+            os.close(received_fd)
+        pidfd = open_pidfd(pid)
+        if pidfd is None:
+            send_message(sock, {"pid": pid})
+        else:
+            send_message(sock, {"pid": pid}, [pidfd])
+            os.close(pidfd)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,145 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compresses responses for clients that accept gzip.
+
+Collect results are large and repetitive JSON (the same metric, property and
+identifier keys for every object), so they compress well. 'GzipMiddleware' wraps the
+WSGI application and compresses JSON and text responses as they are streamed to the
+client, so a response is never held in memory in full to be compressed.
+"""
+import zlib
+from types import TracebackType
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+
+# Level 1 compresses collect results about 20 times, to within 15% of the size at the
+# default level (6), in a third of the time
+DEFAULT_LEVEL = 1
+
+# Responses smaller than this are not worth compressing
+DEFAULT_MIN_SIZE = 1024
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+_ExcInfo = Tuple[Type[BaseException], BaseException, Optional[TracebackType]]
+_StartResponse = Callable[..., Any]
+_WsgiApp = Callable[[Dict[str, Any], _StartResponse], Iterable[bytes]]
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an 'Accept-Encoding' request header allows a gzip response"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in accepted:
+            return accepted[coding] > 0
+    return False
+
+
+class GzipMiddleware:
+    """WSGI middleware that gzip-compresses the responses of 'app'
+
+    A response is compressed if the request accepts gzip, the response is JSON or
+    text, is not already encoded, and is not known to be smaller than 'min_size'.
+    Compressed responses have no 'Content-Length', as their size is not known until
+    they are sent.
+    """
+
+    def __init__(
+        self,
+        app: _WsgiApp,
+        level: int = DEFAULT_LEVEL,
+        min_size: int = DEFAULT_MIN_SIZE,
+    ) -> None:
+        self.app = app
+        self.level = level
+        self.min_size = min_size
+
+    def __call__(
+        self, environ: Dict[str, Any], start_response: _StartResponse
+    ) -> Iterable[bytes]:
+        if environ.get("REQUEST_METHOD") == "HEAD" or not accepts_gzip(
+            environ.get("HTTP_ACCEPT_ENCODING", "")
+        ):
+            return self.app(environ, start_response)
+
+        compressor: List[Any] = []
+
+        def compressing_start_response(
+            status: str,
+            headers: List[Tuple[str, str]],
+            exc_info: Optional[_ExcInfo] = None,
+        ) -> Any:
+            compressor.clear()
+            if self._compressible(status, headers):
+                headers = [
+                    (name, value)
+                    for name, value in headers
+                    if name.lower() != "content-length"
+                ]
+                headers.append(("Content-Encoding", "gzip"))
+                headers.append(("Vary", "Accept-Encoding"))
+                # wbits=31 writes a gzip header and trailer
+                compressor.append(zlib.compressobj(self.level, zlib.DEFLATED, 31))
+            return start_response(status, headers, exc_info)
+
+        body = self.app(environ, compressing_start_response)
+        return _CompressedBody(body, compressor)
+
+    def _compressible(self, status: str, headers: List[Tuple[str, str]]) -> bool:
+        if status[:3] in ("204", "304"):
+            return False
+        content_type = ""
+        for name, value in headers:
+            name = name.lower()
+            if name == "content-encoding":
+                return False
+            if name == "content-type":
+                content_type = value.lower()
+            if name == "content-length" and value.isdigit():
+                if int(value) < self.min_size:
+                    return False
+        return content_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+class _CompressedBody:
+    """Compresses the chunks of a response body as the server reads them"""
+
+    def __init__(self, body: Iterable[bytes], compressor: List[Any]) -> None:
+        self._body = body
+        self._compressor = compressor
+
+    def __iter__(self) -> Iterator[bytes]:
+        # The application may call 'start_response' when its body is first read, so
+        # whether to compress is checked for each chunk
+        for chunk in self._body:
+            if not self._compressor:
+                yield chunk
+                continue
+            data = self._compressor[0].compress(chunk)
+            if data:
+                yield data
+        if self._compressor:
+            yield self._compressor[0].flush()
+
+    def close(self) -> None:
+        close = getattr(self._body, "close", None)
+        if close is not None:
+            close()
@@ -1,19 +1,33 @@
 #  Copyright 2022-2023 VMware, Inc.
 #  SPDX-License-Identifier: Apache-2.0
+import asyncio
 import configparser
 import json
 import logging
 import os.path
+import queue
+import re
 import subprocess
 import tempfile
 import threading
 import time
+from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Tuple
+from typing import Union
 
 import connexion
+import flask
+from swagger_server import json_codec
+from swagger_server import model_json
+from swagger_server import object_stream
+from swagger_server import orchestrator
+from swagger_server import worker_pool
+from swagger_server import zygote
 from swagger_server.models import ApiVersion
 from swagger_server.models.adapter_config import AdapterConfig  # noqa: E501
 from swagger_server.models.collect_result import CollectResult  # noqa: E501
@@ -22,11 +36,24 @@ from swagger_server.server_logging import update_log_levels
 
 logger = logging.getLogger(__name__)
 
+# The adapter config of a request, either as a model, or as the dict that the model's
+# 'to_dict' returns (see 'getadapterconfig')
+AdapterConfigBody = Union[AdapterConfig, Dict[str, Any]]
+
+# Number of bytes read from adapter pipes at a time
+READ_SIZE = 65536
+
+# Number of bytes of a passed-through result that are copied to the response at a time
+RESPONSE_CHUNK_SIZE = 1024 * 1024
+
+# The parsed 'commands.cfg', and the path, modification time and size it was read at
+_config: Optional[Tuple[Tuple[Any, ...], configparser.ConfigParser]] = None
+
 collection_number: int = 0
 last_collection_time: float = 0
 
 
-def collect(body: Optional[AdapterConfig] = None) -> Tuple[str, int]:  # noqa: E501
+def collect(body: Optional[AdapterConfigBody] = None) -> Tuple[str, int]:  # noqa: E501
     """Data Collection
 
     Do data collection # noqa: E501
@@ -40,7 +67,7 @@ def collect(body: Optional[AdapterConfig] = None) -> Tuple[str, int]:  # noqa: E
     logger.info("Request: collect")
 
     if connexion.request.is_json:
-        body = AdapterConfig.from_dict(connexion.request.get_json())  # noqa: E501
+        body = getadapterconfig(connexion.request.get_json())
 
     if body is None:
         logger.debug("No body in request")
@@ -86,7 +113,7 @@ def definition() -> Tuple[str, int]:
     return message, code
 
 
-def test(body: Optional[AdapterConfig] = None) -> Tuple[str, int]:  # noqa: E501
+def test(body: Optional[AdapterConfigBody] = None) -> Tuple[str, int]:  # noqa: E501
     """Connection Test
 
     Trigger a connection test # noqa: E501
@@ -100,7 +127,7 @@ def test(body: Optional[AdapterConfig] = None) -> Tuple[str, int]:  # noqa: E501
     logger.info("Request: test")
 
     if connexion.request.is_json:
-        body = AdapterConfig.from_dict(connexion.request.get_json())  # noqa: E501
+        body = getadapterconfig(connexion.request.get_json())
 
     if body is None:
         return "No body in request", 400
@@ -125,7 +152,7 @@ def api_version() -> ApiVersion:  # noqa: E501
 
 
 def get_endpoint_urls(
-    body: Optional[AdapterConfig] = None,
+    body: Optional[AdapterConfigBody] = None,
 ) -> Tuple[str, int]:  # # noqa: E501
     """Retrieve endpoint URLs
 
@@ -140,7 +167,7 @@ def get_endpoint_urls(
     logger.info("Request: endpointURLs")
 
     if connexion.request.is_json:
-        body = AdapterConfig.from_dict(connexion.request.get_json())  # noqa: E501
+        body = getadapterconfig(connexion.request.get_json())
 
     if body is None:
         logger.debug("No body in request")
@@ -151,29 +178,262 @@ def get_endpoint_urls(
     return runcommand(command, body, 200)
 
 
-def getcommand(commandtype: str) -> List[str]:
+def readconfig() -> configparser.ConfigParser:
+    """Read 'commands.cfg'. The file is only parsed again when it changes."""
+    global _config
+    path = os.path.abspath("commands.cfg")
+    try:
+        stat = os.stat(path)
+        version: Tuple[Any, ...] = (path, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        version = (path,)
+    cached = _config
+    if cached is not None and cached[0] == version:
+        return cached[1]
     config = configparser.ConfigParser()
-    config.read("commands.cfg")
+    config.read(path)
+    if not config.has_section("Server"):
+        config.add_section("Server")
+    _config = (version, config)
+    return config
+
+
+def getcommand(commandtype: str) -> List[str]:
+    config = readconfig()
     command = str(config["Commands"][commandtype])
     logger.debug(f"Command: {command}")
     return command.split(" ")
 
 
+def getexecutionconfig() -> configparser.SectionProxy:
+    """Get the server execution settings from the optional 'Server' section of
+    'commands.cfg'.
+
+    Supported settings:
+        execution_mode: 'spawn' (default) starts a new adapter process for every
+            request. 'worker' runs requests on a pool of long-lived adapter
+            processes that keep the adapter's modules imported between requests.
+            'fork' starts a process once that imports the adapter's modules, and
+            forks a new adapter process from it for every request.
+        worker_count: Number of worker processes (default 1).
+        worker_max_requests: Number of requests after which a worker is replaced
+            (default 0, never).
+        worker_max_memory: Peak memory usage in MiB above which a worker is
+            replaced (default 0, never).
+        transport: How the adapter instance and results are exchanged with adapter
+            processes in the 'spawn' and 'fork' modes. 'pipe' (default) passes
+            anonymous pipes to the process, as '/dev/fd/<n>' paths. 'fifo' creates
+            a pair of named pipes in a temporary directory for every request.
+            Workers always use their own named pipes.
+        max_processes: Maximum number of adapter processes that run at the same
+            time with the 'pipe' transport. Further requests wait until one
+            completes. Default 0, no limit.
+        server_threads: Number of threads that handle HTTP requests (default 10).
+    """
+    return readconfig()["Server"]
+
+
+def getadapterconfig(request_json: Any) -> AdapterConfigBody:
+    """Get the adapter config of a request, to forward to the adapter.
+
+    By default, the request JSON is converted directly to the dict that the
+    'AdapterConfig' model's 'to_dict' returns. If the request contains values the
+    direct conversion does not support, or 'deserialize_adapter_config' is true in
+    the 'Server' section of 'commands.cfg', the 'AdapterConfig' model is created
+    instead.
+    """
+    if not getexecutionconfig().getboolean("deserialize_adapter_config", False):
+        try:
+            config: Dict[str, Any] = model_json.model_dict(request_json, AdapterConfig)
+            return config
+        except ValueError as e:
+            logger.debug(f"Deserializing adapter config: {e}")
+    return AdapterConfig.from_dict(request_json)
+
+
+def start_workers() -> None:
+    """Start the adapter worker pool or zygote in the background, so that they are
+    ready before the first request. Does nothing if 'execution_mode' is 'spawn'.
+    """
+    execution_mode = getexecutionconfig().get("execution_mode", "spawn")
+    target: Callable[[List[str]], Any]
+    if execution_mode == "worker":
+        target = getworkerpool
+    elif execution_mode == "fork":
+        target = getzygote
+    else:
+        return
+    threading.Thread(target=target, args=(getcommand("collect"),), daemon=True).start()
+
+
+def getworkerpool(command: List[str]) -> Optional[worker_pool.WorkerPool]:
+    server_config = getexecutionconfig()
+    return worker_pool.get_worker_pool(
+        command,
+        size=server_config.getint("worker_count", 1),
+        max_requests=server_config.getint("worker_max_requests", 0),
+        max_memory=server_config.getint("worker_max_memory", 0) * 1024 * 1024,
+    )
+
+
+def getzygote(command: List[str]) -> Optional[zygote.Zygote]:
+    try:
+        return zygote.get_zygote(command)
+    except worker_pool.WorkerStartupError as e:
+        logger.warning(str(e))
+        return None
+
+
+def forkprocess(
+    command: List[str],
+    input_pipe: str,
+    output_pipe: str,
+    pass_fds: Tuple[int, ...] = (),
+) -> Optional[zygote.ForkedProcess]:
+    """Fork an adapter process for 'command' from its zygote.
+
+    Returns:
+        The forked process, or None if the command cannot be run from a zygote
+    """
+    adapter_zygote = getzygote(command)
+    if adapter_zygote is not None:
+        return adapter_zygote.fork(command[-1], input_pipe, output_pipe, pass_fds)
+    logger.info(
+        f"Command {repr(command)} cannot be run from a zygote, starting a new process"
+    )
+    return None
+
+
+def startprocess(
+    command: List[str], input_pipe: str, output_pipe: str, execution_mode: str
+) -> Any:
+    """Start an adapter process for 'command' that communicates using the given pipes.
+
+    If 'execution_mode' is 'fork' and the command can be run from a zygote, the
+    process is forked from the zygote. Otherwise, a new process is started.
+    """
+    if execution_mode == "fork":
+        forked_process = forkprocess(command, input_pipe, output_pipe)
+        if forked_process is not None:
+            return forked_process
+    return subprocess.Popen(
+        command + [input_pipe, output_pipe],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+async def startprocess_async(
+    command: List[str], pipes: "AdapterPipes", execution_mode: str
+) -> Union[zygote.ForkedProcess, asyncio.subprocess.Process]:
+    """Start an adapter process for 'command' that communicates using 'pipes', as
+    'startprocess' does.
+
+    Returns:
+        The forked process, or the started process with its stdout and stderr piped
+    """
+    if execution_mode == "fork":
+        # Starting the zygote (on the first request) and forking from it block, so
+        # they run on the event loop's executor
+        forked_process = await asyncio.get_running_loop().run_in_executor(
+            None,
+            forkprocess,
+            command,
+            pipes.input_path,
+            pipes.output_path,
+            pipes.child_fds,
+        )
+        if forked_process is not None:
+            return forked_process
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        pipes.input_path,
+        pipes.output_path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        pass_fds=pipes.child_fds,
+    )
+    return process
+
+
 def runcommand(
     command: List[str],
-    body: Optional[AdapterConfig] = None,
+    body: Optional[AdapterConfigBody] = None,
     good_response_code: int = 200,
     extras: Optional[Dict] = None,
 ) -> Tuple[str, int]:
     logger.debug(f"Running command {repr(command)}")
+
+    execution_mode = getexecutionconfig().get("execution_mode", "spawn")
+    if execution_mode == "worker":
+        pool = getworkerpool(command)
+        if pool is None:
+            logger.info(
+                f"Command {repr(command)} cannot be run on a worker, starting a new process"
+            )
+        else:
+            try:
+                with pool.acquire() as worker:
+                    return communicate(
+                        lambda: worker.start(command[-1]),
+                        worker.input_pipe,
+                        worker.output_pipe,
+                        body,
+                        good_response_code,
+                        extras,
+                    )
+            except worker_pool.WorkerStartupError as e:
+                logger.warning(f"{e}. Starting a new process instead.")
+
+    if getexecutionconfig().get("transport", "pipe") != "fifo":
+        return exchange(command, execution_mode, body, good_response_code, extras)
+
     dir = tempfile.mkdtemp()
     # These are named from the perspective of the subprocess. We write the subprocess input to the input pipe
     # and read the subprocess output from the output pipe.
     input_pipe = os.path.join(dir, "input_pipe")
     output_pipe = os.path.join(dir, "output_pipe")
 
+    try:
+        os.mkfifo(input_pipe)
+        os.mkfifo(output_pipe)
+        logger.debug("Finished making pipes")
+    except OSError as e:
+        logger.debug(f"Failed to create pipe {input_pipe} or {output_pipe}: {e}")
+        return "Error initializing adapter communication", 500
+    else:
+        return communicate(
+            lambda: startprocess(command, input_pipe, output_pipe, execution_mode),
+            input_pipe,
+            output_pipe,
+            body,
+            good_response_code,
+            extras,
+        )
+    finally:
+        safe_unlink(input_pipe)
+        safe_unlink(output_pipe)
+        os.rmdir(dir)
+
+
+def communicate(
+    start_process: Callable[[], Any],
+    input_pipe: str,
+    output_pipe: str,
+    body: Optional[AdapterConfigBody],
+    good_response_code: int,
+    extras: Optional[Dict],
+) -> Tuple[str, int]:
+    """Start an adapter process and exchange the adapter instance and results with
+    it over the input and output pipes.
+
+    :param start_process: Starts the adapter process and returns an object with a
+        'communicate()' method (e.g., 'subprocess.Popen') that waits for the
+        process to exit and returns its (stdout, stderr)
+    """
     # 'result' holds the adapter result and/or response code that the server should return
-    result: List[Optional[Tuple[str, int]]] = [None]
+    result: List[Optional[Tuple[Any, int]]] = [None]
 
     # Pipe operations are blocking; to prevent deadlocks if the adapter fails to read or write either or both of the
     # pipes, the read/write operations are run in separate threads
@@ -181,97 +441,362 @@ def runcommand(
         target=write_adapter_instance, args=(body, input_pipe, extras)
     )
     reader_thread = threading.Thread(
-        target=read_results, args=(output_pipe, result, good_response_code)
+        target=read_results,
+        args=(output_pipe, result, good_response_code, passthroughresults()),
     )
 
     try:
-        os.mkfifo(input_pipe)
-        os.mkfifo(output_pipe)
-        logger.debug("Finished making pipes")
-        process = subprocess.Popen(
-            command + [input_pipe, output_pipe],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=True,
-        )
+        process = start_process()
         logger.debug(f"Started process {process.args!r}")
     except OSError as e:
-        logger.debug(f"Failed to create pipe {input_pipe} or {output_pipe}: {e}")
+        logger.debug(f"Failed to start process: {e}")
         return "Error initializing adapter communication", 500
-    else:
-        # Subprocess has successfully started, so start writer and reader threads.
-        writer_thread.start()
-        reader_thread.start()
-
-        # Wait until the subprocess has exited, and log stdout and stderr (if any)
-        out, err = process.communicate()
-        if len(out.strip()) > 0:
-            logger.debug("Subprocess stdout:")
-            logger.debug(out)
-        if len(err.strip()) > 0:
-            logger.warning("Subprocess stderr:")
-            logger.warning(err)
-
-        # process.communicate() will wait until the subprocess has exited. If the
-        # subprocess has exited and writer_thread is still alive, then the input was
-        # not read. In that case we want the writer_thread to complete, and the easiest
-        # way to do that is to read the pipe. It's not required for the adapter info
-        # to be read, so this is not (necessarily) an error.
-        if writer_thread.is_alive():
-            logger.info("Subprocess exited before reading input.")
-            with open(input_pipe, "r") as fifo:
-                fifo.read()
-            writer_thread.join()
-
-        # If the subprocess has exited and reader_thread is still alive, there are two
-        # things that might have happened:
-        # 1. The reader thread is still processing.
-        # 2. The adapter didn't write any results/crashed.
-        # For case 1 we want to wait for the reader thread to complete.
-        # For case 2 we need to write to the named pipe so the reader_thread can
-        # complete, but return an error to the user.
-        if reader_thread.is_alive():
-            logger.info("Reader thread is still running")
-            # Ensure that the reader thread is past it's blocking read:
+
+    # Subprocess has successfully started, so start writer and reader threads.
+    writer_thread.start()
+    reader_thread.start()
+
+    # Wait until the subprocess has exited, and log stdout and stderr (if any)
+    out, err = process.communicate()
+    log_output(out, err)
+
+    # process.communicate() will wait until the subprocess has exited. If the
+    # subprocess has exited and writer_thread is still alive, then the input was
+    # not read. In that case we want the writer_thread to complete, and the easiest
+    # way to do that is to read the pipe. It's not required for the adapter info
+    # to be read, so this is not (necessarily) an error.
+    if writer_thread.is_alive():
+        logger.info("Subprocess exited before reading input.")
+        # The writer thread may also be just about to finish after the subprocess
+        # read the input, so the pipe is opened using the 'NONBLOCK' flag, which
+        # doesn't wait for a writer, and drained until the writer thread is done.
+        fifo = os.open(input_pipe, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            while writer_thread.is_alive():
+                try:
+                    os.read(fifo, 65536)
+                except BlockingIOError:
+                    pass
+                writer_thread.join(0.01)
+        finally:
+            os.close(fifo)
+
+    # If the subprocess has exited and reader_thread is still alive, there are two
+    # things that might have happened:
+    # 1. The reader thread is still processing.
+    # 2. The adapter didn't write any results/crashed.
+    # For case 1 we want to wait for the reader thread to complete.
+    # For case 2 we need to write to the named pipe so the reader_thread can
+    # complete, but return an error to the user.
+    if reader_thread.is_alive():
+        logger.info("Reader thread is still running")
+        # Ensure that the reader thread is past it's blocking read. The reader
+        # thread may not have reached its blocking open yet, so keep trying until
+        # the reader thread completes.
+        while reader_thread.is_alive():
             try:
                 # Opening a named pipe using the 'NONBLOCK' flag means that it will
                 # immediately fail if there isn't a corresponding blocking 'read'
                 # operation currently using the pipe
-                with os.fdopen(
-                    os.open(output_pipe, os.O_WRONLY | os.O_NONBLOCK), mode="w"
-                ) as fd:
-                    fd.write("")
-            except Exception as e:
-                # In some cases the open will fail with an OSError. This is ok. It means
-                # that the above open wasn't required. Unfortunately, it is not the case
-                # that if we don't get here than the open _was_ required. So we can't
-                # use this to distinguish between cases (1) and (2).
+                os.close(os.open(output_pipe, os.O_WRONLY | os.O_NONBLOCK))
+            except OSError:
+                # In some cases the open will fail with an OSError. This is ok. It
+                # means that the above open wasn't required (yet). Unfortunately, it
+                # is not the case that if we don't get here than the open _was_
+                # required. So we can't use this to distinguish between cases (1)
+                # and (2).
                 pass
-            logger.debug("Resolved potentially blocking read on reader thread")
+            reader_thread.join(0.01)
+        logger.debug("Resolved potentially blocking read on reader thread")
+
+    return response(result[0], out, err)
+
+
+class AdapterPipes:
+    """A pair of anonymous pipes for exchanging the adapter instance and results with
+    an adapter process.
+
+    The process is passed the read end of the input pipe and the write end of the
+    output pipe, and their '/dev/fd/<n>' paths in place of the paths of named pipes,
+    so adapters open them the same way.
+    """
+
+    def __init__(self) -> None:
+        self.input_read, self.input_write = os.pipe()
+        try:
+            self.output_read, self.output_write = os.pipe()
+        except OSError:
+            os.close(self.input_read)
+            os.close(self.input_write)
+            raise
+        self._open = {
+            self.input_read,
+            self.input_write,
+            self.output_read,
+            self.output_write,
+        }
+
+    @property
+    def child_fds(self) -> Tuple[int, int]:
+        return self.input_read, self.output_write
+
+    @property
+    def input_path(self) -> str:
+        return f"/dev/fd/{self.input_read}"
+
+    @property
+    def output_path(self) -> str:
+        return f"/dev/fd/{self.output_write}"
+
+    def close(self, fd: int) -> None:
+        if fd in self._open:
+            self._open.remove(fd)
+            os.close(fd)
+
+    def __enter__(self) -> "AdapterPipes":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        for fd in list(self._open):
+            self.close(fd)
+
+
+def getorchestrator() -> orchestrator.Orchestrator:
+    return orchestrator.get_orchestrator(
+        getexecutionconfig().getint("max_processes", 0)
+    )
+
+
+def exchange(
+    command: List[str],
+    execution_mode: str,
+    body: Optional[AdapterConfigBody],
+    good_response_code: int,
+    extras: Optional[Dict],
+) -> Tuple[str, int]:
+    """Run an adapter process on the orchestrator's event loop, and exchange the
+    adapter instance and results with it over anonymous pipes.
+
+    The calling thread encodes the adapter instance, and parses the results as the
+    event loop reads them, so that the event loop only does I/O.
+    """
+    try:
+        input_data = encode_adapter_instance(body, extras)
+    except Exception as e:
+        logger.warning(f"Unknown server error when encoding adapter instance: {e}")
+        input_data = b"{}"
 
-            # Wait for the reader thread to complete.
-            reader_thread.join()
+    output: "queue.SimpleQueue[Optional[bytes]]" = queue.SimpleQueue()
+    future = getorchestrator().submit(
+        exchange_async(command, execution_mode, input_data, output.put)
+    )
+    # Marks the end of the output, however the coroutine completes
+    future.add_done_callback(lambda _: output.put(None))
+
+    reader = ResultReader(passthroughresults())
+    error: Optional[Exception] = None
+    for data in iter(output.get, None):
+        if error is None:
+            try:
+                reader.feed(data)
+            except Exception as e:
+                error = e
+
+    try:
+        out, err = future.result()
+    except OSError as e:
+        logger.debug(f"Failed to start process: {e}")
+        return "Error initializing adapter communication", 500
+    log_output(out, err)
 
-        logger.debug(f"Result object value: {result[0]}")
+    result: Optional[Tuple[Any, int]] = None
+    if error is None:
+        try:
+            result = reader.result(), good_response_code
+        except Exception as e:
+            error = e
+    if error is not None:
+        logger.warning(f"Unknown server error when reading results: {error}")
+    return response(result, out, err)
 
-        if result[0]:
-            return result[0]
+
+async def exchange_async(
+    command: List[str],
+    execution_mode: str,
+    input_data: bytes,
+    output: Callable[[bytes], None],
+) -> Tuple[str, str]:
+    """Start an adapter process, write 'input_data' to its input pipe, and pass what
+    it writes to its output pipe to 'output', until it exits.
+
+    Unlike named pipes, the pipes are never left blocking if the process does not
+    open them: they are only open in the process, so they close when it exits. A
+    process forked from the zygote may leave copies of its pipes open in processes it
+    starts, so it is waited for by its pidfd rather than the pipes being closed.
+
+    Returns:
+        A tuple of the captured (stdout, stderr) of the process
+
+    Raises:
+        OSError: If the pipes could not be created or the process could not be
+            started
+    """
+    with AdapterPipes() as pipes:
+        try:
+            process = await startprocess_async(command, pipes, execution_mode)
+            logger.debug(f"Started process {command!r}")
+        finally:
+            # The process has its own copies. The pipes must only be open in the
+            # process, so that they are closed when it exits.
+            for fd in pipes.child_fds:
+                pipes.close(fd)
+
+        if isinstance(process, zygote.ForkedProcess):
+            out, err = await exchange_forked(process, pipes, input_data, output)
         else:
-            logger.debug("Building 500 error message")
-            message = "No result from adapter"
-            if len(out):
-                out = out.strip("\n")
-                message += f". Captured stdout:\n  {out}"
-            if len(err):
-                err = err.strip("\n")
-                message += f". Captured stderr:\n  {err}"
-
-            logger.debug(f"Server error message: {message}")
-            return message, 500
+            assert process.stdout and process.stderr  # nosec: assert for type checking
+            out, err, _, _ = await asyncio.gather(
+                process.stdout.read(),
+                process.stderr.read(),
+                write_input(pipes, input_data),
+                read_pipe(pipes.output_read, output),
+            )
+            await process.wait()
+    return (
+        out.decode("utf-8", errors="replace"),
+        err.decode("utf-8", errors="replace"),
+    )
+
+
+async def exchange_forked(
+    process: zygote.ForkedProcess,
+    pipes: "AdapterPipes",
+    input_data: bytes,
+    output: Callable[[bytes], None],
+) -> Tuple[bytes, bytes]:
+    """Exchange data with a process forked from the zygote until it exits.
+
+    Returns:
+        A tuple of the captured (stdout, stderr) of the process
+    """
+    out, err = bytearray(), bytearray()
+    exited = asyncio.ensure_future(process.wait_async())
+    try:
+        await asyncio.gather(
+            read_pipe(process.stdout.fileno(), out.extend, exited),
+            read_pipe(process.stderr.fileno(), err.extend, exited),
+            write_input(pipes, input_data, exited),
+            read_pipe(pipes.output_read, output, exited),
+        )
     finally:
-        safe_unlink(input_pipe)
-        safe_unlink(output_pipe)
-        os.rmdir(dir)
+        exited.cancel()
+        process.close()
+    return bytes(out), bytes(err)
+
+
+class _InputProtocol(asyncio.Protocol):
+    def __init__(self) -> None:
+        self.closed: "asyncio.Future[Optional[Exception]]" = (
+            asyncio.get_running_loop().create_future()
+        )
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if not self.closed.done():
+            self.closed.set_result(exc)
+
+
+async def write_input(
+    pipes: AdapterPipes,
+    data: bytes,
+    exited: "Optional[asyncio.Future[None]]" = None,
+) -> None:
+    """Write 'data' to the input pipe, until it has been written or 'exited'
+    completes"""
+    # The pipe is closed by 'pipes' rather than the transport, so that the process
+    # sees the end of the input once it has been written
+    input_file = open(pipes.input_write, "wb", buffering=0, closefd=False)
+    transport, protocol = await asyncio.get_running_loop().connect_write_pipe(
+        _InputProtocol, input_file
+    )
+    transport.write(data)
+    transport.close()
+    if exited is not None:
+        waiting: List["asyncio.Future[Any]"] = [protocol.closed, exited]
+        await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+        if not protocol.closed.done():
+            # The input is still buffered, e.g., in a process the process started
+            transport.abort()
+    if await protocol.closed is not None:
+        logger.info("Subprocess exited before reading input.")
+    pipes.close(pipes.input_write)
+
+
+async def read_pipe(
+    fd: int,
+    output: Callable[[bytes], None],
+    exited: "Optional[asyncio.Future[None]]" = None,
+) -> None:
+    """Pass what is written to the pipe 'fd' to 'output' until the pipe is closed,
+    or until what was written before 'exited' completes has been read. The pipe is
+    left open."""
+    loop = asyncio.get_running_loop()
+    closed: "asyncio.Future[None]" = loop.create_future()
+
+    def on_readable() -> None:
+        try:
+            data = os.read(fd, READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            if not closed.done():
+                closed.set_exception(e)
+            return
+        if data:
+            output(data)
+        elif not closed.done():
+            closed.set_result(None)
+
+    os.set_blocking(fd, False)
+    loop.add_reader(fd, on_readable)
+    try:
+        if exited is not None:
+            await asyncio.wait([closed, exited], return_when=asyncio.FIRST_COMPLETED)
+            if not closed.done():
+                loop.remove_reader(fd)
+                for data in zygote.read_available(fd):
+                    output(data)
+                return
+        await closed
+    finally:
+        loop.remove_reader(fd)
+
+
+def log_output(out: str, err: str) -> None:
+    if len(out.strip()) > 0:
+        logger.debug("Subprocess stdout:")
+        logger.debug(out)
+    if len(err.strip()) > 0:
+        logger.warning("Subprocess stderr:")
+        logger.warning(err)
+
+
+def response(result: Optional[Tuple[Any, int]], out: str, err: str) -> Tuple[Any, int]:
+    logger.debug(f"Result object value: {result}")
+
+    if result:
+        return result
+    else:
+        logger.debug("Building 500 error message")
+        message = "No result from adapter"
+        if len(out):
+            out = out.strip("\n")
+            message += f". Captured stdout:\n  {out}"
+        if len(err):
+            err = err.strip("\n")
+            message += f". Captured stderr:\n  {err}"
+
+        logger.debug(f"Server error message: {message}")
+        return message, 500
 
 
 def safe_unlink(file: str) -> None:
@@ -283,27 +808,43 @@ def safe_unlink(file: str) -> None:
         logger.exception(e)
 
 
+def encode_adapter_instance(
+    body: Optional[AdapterConfigBody], extras: Optional[Dict]
+) -> bytes:
+    body_dict: Dict = {}
+    if isinstance(body, dict):
+        body_dict = dict(body)
+    elif body:
+        body_dict = body.to_dict()  # type: ignore
+
+    if extras:
+        for key in extras.keys():
+            if key not in body_dict or not body_dict[key]:
+                body_dict[key] = extras[key]
+
+    data = json_codec.get_codec().dumps(body_dict)
+
+    if body and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Adapter instance:")
+        # Don't log sensitive information!
+        body_dict["credential_config"] = "REDACTED"
+        body_dict["cluster_connection_info"] = "REDACTED"
+        logger.debug(f"{json.dumps(body_dict, indent=3)}")
+
+    return data
+
+
 def write_adapter_instance(
-    body: AdapterConfig, input_pipe: str, extras: Optional[Dict]
+    body: Optional[AdapterConfigBody], input_pipe: str, extras: Optional[Dict]
 ) -> None:
     try:
-        body_dict: Dict = body.to_dict() if body else {}  # type: ignore
-
-        if extras:
-            for key in extras.keys():
-                if key not in body_dict or not body_dict[key]:
-                    body_dict[key] = extras[key]
+        data = encode_adapter_instance(body, extras)
 
-        with open(input_pipe, "w") as fifo:
+        with open(input_pipe, "wb") as fifo:
             logger.debug("Opened input pipe for writing")
-            json.dump(body_dict, fifo)
+            fifo.write(data)
 
-        if body:
-            logger.debug(f"Wrote adapter instance to input pipe {input_pipe}:")
-            # Don't log sensitive information!
-            body_dict["credential_config"] = "REDACTED"
-            body_dict["cluster_connection_info"] = "REDACTED"
-            logger.debug(f"{json.dumps(body_dict, indent=3)}")
+        logger.debug(f"Wrote adapter instance to input pipe {input_pipe}")
 
     except Exception as e:
         logger.warning(
@@ -312,12 +853,178 @@ def write_adapter_instance(
 
 
 def read_results(
-    output_pipe: str, result: List[Optional[Tuple[str, int]]], good_response_code: int
+    output_pipe: str,
+    result: List[Optional[Tuple[Any, int]]],
+    good_response_code: int,
+    passthrough: bool = False,
 ) -> None:
     try:
-        with open(output_pipe, "r") as fifo:
+        with open(output_pipe, "rb") as fifo:
             logger.debug(f"Opened output pipe {fifo} for reading")
-            result[0] = json.load(fifo), good_response_code
+            reader = ResultReader(passthrough)
+            for data in iter(lambda: fifo.read(READ_SIZE), b""):
+                reader.feed(data)
+            result[0] = reader.result(), good_response_code
     except Exception as e:
         logger.warning(f"Unknown server error when reading results: {e}")
         result[0] = None
+
+
+def passthroughresults() -> bool:
+    """Whether collect results that are a single JSON document are passed through to
+    the response as they are, rather than parsed and re-encoded. Set
+    'passthrough_results = true' in the 'Server' section of 'commands.cfg' to pass
+    them through. Passed through results are only checked to be complete, so a
+    malformed result from the adapter is not reported by the server.
+    """
+    return getexecutionconfig().getboolean("passthrough_results", False)
+
+
+class ResultReader:
+    """Parses the results written to the output pipe as they arrive.
+
+    Results are either a single JSON document, or an object stream (newline-delimited
+    JSON records, written as the adapter collects). Object streams are assembled
+    record by record, so they are never held in memory in full.
+
+    With 'passthrough', a single JSON document that is a collect result (see
+    'is_collect_result') is not parsed. It is only checked to be complete (see
+    'is_complete_json'), and returned as a response with the adapter's bytes as its
+    body. Other documents are always parsed.
+    """
+
+    def __init__(self, passthrough: bool = False) -> None:
+        self.passthrough = passthrough
+        self._buffer = bytearray()
+        self._stream: Optional[object_stream.ObjectStreamReader] = None
+        # The first line is buffered until it is complete, to tell the formats apart
+        self._first_line = True
+        self._partial_line = b""
+
+    def feed(self, data: bytes) -> None:
+        """Add the next bytes of the output
+
+        Raises:
+            Exception: If the output is a malformed object stream
+        """
+        if self._stream is None:
+            self._buffer += data
+            if not self._first_line or b"\n" not in data:
+                return
+            self._first_line = False
+            end = self._buffer.find(b"\n")
+            if not self._is_stream_header(end):
+                return
+            logger.debug("Reading object stream")
+            self._stream = object_stream.ObjectStreamReader(bytes(self._buffer[:end]))
+            data = bytes(self._buffer[end + 1 :])
+            self._buffer = bytearray()
+        lines = (self._partial_line + data).split(b"\n")
+        self._partial_line = lines.pop()
+        for line in lines:
+            self._stream.add(line)
+
+    def _is_stream_header(self, end: int) -> bool:
+        # Checks the start of the line first, so that the first line of a large
+        # document is not copied
+        return self._buffer.startswith(b'{"stream"') and object_stream.is_stream_header(
+            bytes(self._buffer[:end])
+        )
+
+    def result(self) -> Any:
+        """Get the results, once the output has been read in full
+
+        Raises:
+            Exception: If the output is not a valid result
+        """
+        if self._stream is not None:
+            self._stream.add(self._partial_line)
+            return self._stream.result()
+        if self._first_line and self._is_stream_header(len(self._buffer)):
+            return object_stream.read_object_stream(bytes(self._buffer), [])
+        if not self.passthrough or not is_collect_result(self._buffer):
+            return json_codec.get_codec().loads(self._buffer)
+        if not is_complete_json(self._buffer):
+            raise ValueError("Result is not a complete JSON document")
+        return json_response(self._buffer)
+
+
+# Bytes that are not needed to check the structure of a JSON document
+_NON_STRUCTURAL = bytes(set(range(256)) - set(b'"{}[]'))
+
+# Matches a JSON string without escape sequences, including its quotes
+_JSON_STRING = re.compile(rb'"[^"]*"')
+
+_WHITESPACE = b" \t\r\n"
+
+# Matches the start of a collect result, which is an object whose first key is
+# 'result', or 'errorMessage' if the collection failed
+_COLLECT_RESULT = re.compile(
+    rb'[ \t\r\n]*\{[ \t\r\n]*"(?:result|errorMessage)"[ \t\r\n]*:'
+)
+
+
+def is_collect_result(data: Union[bytes, bytearray]) -> bool:
+    """Check that a JSON document starts as a collect result does, i.e., with the
+    'result' or 'errorMessage' key
+
+    Args:
+        data (Union[bytes, bytearray]): The document
+
+    Returns:
+        True if the document starts as a collect result
+    """
+    return _COLLECT_RESULT.match(data) is not None
+
+
+def is_complete_json(data: Union[bytes, bytearray]) -> bool:
+    """Check that a JSON object or array is complete, without parsing it.
+
+    Checks that the document starts with '{' or '[' and ends with the matching
+    bracket, that every string is terminated, and that outside of strings there are
+    as many opening as closing brackets. This rejects every truncated document,
+    since a document that ends early always has unclosed brackets or an
+    unterminated string. It does not check that the document is otherwise valid.
+
+    Args:
+        data (Union[bytes, bytearray]): The document
+
+    Returns:
+        True if the document is complete
+    """
+    start, end = 0, len(data)
+    while start < end and data[start] in _WHITESPACE:
+        start += 1
+    while end > start and data[end - 1] in _WHITESPACE:
+        end -= 1
+    if end - start < 2 or (data[start], data[end - 1]) not in (
+        (ord("{"), ord("}")),
+        (ord("["), ord("]")),
+    ):
+        return False
+    # Escape sequences only occur in strings, and do not change the structure
+    if b"\\" in data:
+        data = data.replace(b"\\\\", b"").replace(b'\\"', b"")
+    skeleton = data.translate(None, _NON_STRUCTURAL)
+    # Removing two adjacent quotes (an empty string, or the end of a string and the
+    # start of the next) does not change which brackets are in strings. This
+    # leaves only the strings that contain brackets.
+    skeleton = _JSON_STRING.sub(b"", skeleton.replace(b'""', b""))
+    return (
+        b'"' not in skeleton
+        and skeleton.count(b"{") == skeleton.count(b"}")
+        and skeleton.count(b"[") == skeleton.count(b"]")
+    )
+
+
+def json_response(data: bytearray) -> flask.Response:
+    """Create a JSON response whose body is streamed from 'data' as it is"""
+
+    def body() -> Iterator[bytes]:
+        with memoryview(data) as view:
+            for start in range(0, len(view), RESPONSE_CHUNK_SIZE):
+                yield bytes(view[start : start + RESPONSE_CHUNK_SIZE])
+
+    response = flask.Response(body(), mimetype="application/json")
+    response.headers["Content-Length"] = str(len(data))
+    return response
@@ -0,0 +1,113 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Converts request JSON to the dict a generated model's 'to_dict' returns, without
+creating the model.
+
+Requests to the adapter endpoints only forward their body to the adapter. Creating
+the generated models (with 'from_dict') and converting them back (with 'to_dict')
+renames the keys to snake case, but is a significant part of the cost of a request.
+'model_dict' renames the keys directly, using the attribute names, types and
+required attributes of the generated models.
+
+Values that the generated models would convert (e.g., a string where a boolean is
+expected) are not supported; 'model_dict' raises a ValueError for them, so that the
+caller can fall back to the generated models.
+"""
+import datetime
+import typing
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Type
+
+from swagger_server.models.base_model_ import Model
+
+# The (attribute, JSON key, type, required) of each attribute of a model
+_AttributeSpec = Tuple[str, str, Any, bool]
+
+_specs: Dict[Type[Model], List[_AttributeSpec]] = {}
+
+
+def model_dict(data: Any, klass: Type[Model]) -> Any:
+    """Convert the JSON of a model to the dict its 'to_dict' returns
+
+    Args:
+        data (Any): The decoded JSON of the model
+        klass (Type[Model]): The generated model class
+
+    Returns:
+        The dict of the model, with every attribute of the model (None if it is not
+        in 'data')
+
+    Raises:
+        ValueError: If a required attribute is null, or a value does not have the
+            type of its attribute
+    """
+    spec = _model_spec(klass)
+    if not spec:
+        # As 'util.deserialize_model'
+        return data
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected an object for {klass.__name__}")
+    result: Dict[str, Any] = {}
+    for attr, key, attr_type, required in spec:
+        value = data.get(key)
+        if value is None:
+            if required and key in data:
+                raise ValueError(f"Invalid value for `{attr}`, must not be `None`")
+            result[attr] = None
+        else:
+            result[attr] = _convert(value, attr_type)
+    return result
+
+
+def _convert(value: Any, klass: Any) -> Any:
+    if klass in (str, bool, int, float):
+        if type(value) is klass:
+            return value
+        if klass is float and type(value) is int:
+            return float(value)
+        raise ValueError(f"Expected {klass.__name__}, got {type(value).__name__}")
+    if klass is object:
+        return value
+    if klass in (bytearray, datetime.date, datetime.datetime):
+        raise ValueError(f"{klass.__name__} values are not supported")
+    origin = typing.get_origin(klass)
+    if origin is list:
+        if not isinstance(value, list):
+            raise ValueError(f"Expected a list, got {type(value).__name__}")
+        return [_convert(item, klass.__args__[0]) for item in value]
+    if origin is dict:
+        if not isinstance(value, dict):
+            raise ValueError(f"Expected an object, got {type(value).__name__}")
+        return {k: _convert(v, klass.__args__[1]) for k, v in value.items()}
+    if origin is not None:
+        raise ValueError(f"{klass} values are not supported")
+    return model_dict(value, klass)
+
+
+def _model_spec(klass: Type[Model]) -> List[_AttributeSpec]:
+    spec = _specs.get(klass)
+    if spec is None:
+        instance = klass()
+        spec = [
+            (
+                attr,
+                instance.attribute_map[attr],
+                attr_type,
+                _is_required(instance, attr),
+            )
+            for attr, attr_type in instance.swagger_types.items()
+        ]
+        _specs[klass] = spec
+    return spec
+
+
+def _is_required(instance: Model, attr: str) -> bool:
+    # The setters of the generated models reject None for required attributes
+    try:
+        setattr(instance, attr, None)
+    except ValueError:
+        return True
+    return False
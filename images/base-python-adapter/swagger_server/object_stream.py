@@ -0,0 +1,138 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Assembles collect results that adapters write incrementally as an object stream.
+
+An object stream is a sequence of newline-delimited JSON records. It starts with a
+header record, followed by any number of `{"object": ...}`, `{"relationship": ...}`
+and `{"errorMessage": ...}` records, and ends with an `{"end": true}` record. See
+'aria.ops.pipe_utils.ObjectStreamWriter' for the writer.
+"""
+import json
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+from swagger_server.json_codec import get_codec
+
+# Must match 'aria.ops.pipe_utils.OBJECT_STREAM_HEADER'
+STREAM_NAME = "aria.ops.objects"
+STREAM_VERSION = 1
+
+
+class ObjectStreamError(Exception):
+    """Raised when an object stream is incomplete or malformed"""
+
+
+def is_stream_header(line: bytes) -> bool:
+    """Check if a line is the header record of an object stream
+
+    Args:
+        line (bytes): The first line written to the output pipe
+
+    Returns:
+        True if the output pipe contains an object stream
+    """
+    if not line.startswith(b'{"stream"'):
+        return False
+    try:
+        header = get_codec().loads(line)
+    except ValueError:
+        return False
+    return isinstance(header, dict) and header.get("stream") == STREAM_NAME
+
+
+def read_object_stream(header: bytes, records: Iterable[bytes]) -> Dict[str, Any]:
+    """Assemble an object stream into a single collect result
+
+    Objects that are sent more than once (e.g., because data was added to an object
+    after it was sent) are merged into a single object.
+
+    Args:
+        header (bytes): The header record of the stream
+        records (Iterable[bytes]): The remaining records of the stream, one per line
+
+    Returns:
+        The collect result
+
+    Raises:
+        ObjectStreamError: If the stream has an unsupported version, or doesn't end
+            with an 'end' record.
+    """
+    reader = ObjectStreamReader(header)
+    for line in records:
+        if reader.add(line):
+            break
+    return reader.result()
+
+
+class ObjectStreamReader:
+    """Assembles an object stream into a single collect result as its records
+    arrive, see :func:`read_object_stream`"""
+
+    def __init__(self, header: bytes) -> None:
+        """Initializes an ObjectStreamReader
+
+        Args:
+            header (bytes): The header record of the stream
+
+        Raises:
+            ObjectStreamError: If the stream has an unsupported version
+        """
+        self._codec = get_codec()
+        version = self._codec.loads(header).get("version")
+        if version != STREAM_VERSION:
+            raise ObjectStreamError(f"Unsupported object stream version '{version}'")
+        self._objects: Dict[str, Dict[str, Any]] = {}
+        self._relationships: List[Dict[str, Any]] = []
+        self._error_message: Optional[str] = None
+        self.ended = False
+
+    def add(self, line: bytes) -> bool:
+        """Add a record to the result. Records after the 'end' record are ignored.
+
+        Args:
+            line (bytes): A record of the stream
+
+        Returns:
+            True if the stream has ended
+        """
+        if self.ended or not line.strip():
+            return self.ended
+        record = self._codec.loads(line)
+        if "object" in record:
+            obj = record["object"]
+            key = json.dumps(obj["key"], sort_keys=True)
+            existing = self._objects.get(key)
+            if existing is None:
+                self._objects[key] = obj
+            else:
+                for field in ("metrics", "properties", "events"):
+                    existing[field].extend(obj[field])
+        elif "relationship" in record:
+            self._relationships.append(record["relationship"])
+        elif "errorMessage" in record:
+            self._error_message = record["errorMessage"]
+        elif "end" in record:
+            self.ended = True
+        return self.ended
+
+    def result(self) -> Dict[str, Any]:
+        """Get the collect result
+
+        Returns:
+            The collect result
+
+        Raises:
+            ObjectStreamError: If the stream has not ended
+        """
+        if not self.ended:
+            raise ObjectStreamError("Object stream ended before the end record")
+        if self._error_message is not None:
+            return {"errorMessage": self._error_message}
+        return {
+            "result": list(self._objects.values()),
+            "relationships": self._relationships,
+            "nonExistingObjects": [],
+        }
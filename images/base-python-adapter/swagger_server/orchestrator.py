@@ -0,0 +1,131 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Event loop that runs the adapter processes of all requests.
+
+Requests are handled on the HTTP server's threads. Rather than each thread driving
+its own adapter process (and helper threads for the process's pipes), the threads
+submit a coroutine that runs the process to the orchestrator, and wait for its
+result. All adapter processes are started, fed and read from a single event loop
+running in the orchestrator's thread.
+"""
+import asyncio
+import concurrent.futures
+import logging
+import os
+import sys
+import threading
+from typing import Any
+from typing import Coroutine
+from typing import Optional
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Orchestrator:
+    """An event loop in a background thread, with an optional limit on the number of
+    coroutines that run at the same time"""
+
+    def __init__(self, max_processes: int = 0) -> None:
+        """Initializes an Orchestrator, and starts its event loop
+
+        Args:
+            max_processes (int): The maximum number of submitted coroutines (i.e.,
+                adapter processes) that run at the same time. Others wait until one
+                completes. '0' (default) means no limit.
+        """
+        self.max_processes = max_processes
+        self.loop = asyncio.new_event_loop()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._thread = threading.Thread(
+            target=self._run, name="adapter-orchestrator", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        _attach_child_watcher(self.loop)
+        self.loop.run_forever()
+
+    def submit(
+        self, coroutine: Coroutine[Any, Any, T]
+    ) -> "concurrent.futures.Future[T]":
+        """Run a coroutine on the event loop, once the number of running coroutines
+        is below the limit
+
+        Args:
+            coroutine (Coroutine): The coroutine to run
+
+        Returns:
+            A future that can be waited on from any thread for the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(self._limited(coroutine), self.loop)
+
+    async def _limited(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        if self.max_processes <= 0:
+            return await coroutine
+        if self._semaphore is None:
+            # Created on the event loop, so that it is bound to it
+            self._semaphore = asyncio.Semaphore(self.max_processes)
+        async with self._semaphore:
+            return await coroutine
+
+    def stop(self) -> None:
+        """Stop the event loop. Coroutines that are still running are cancelled."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        for task in asyncio.all_tasks(self.loop):
+            task.cancel()
+        self.loop.close()
+
+
+def _attach_child_watcher(loop: asyncio.AbstractEventLoop) -> None:
+    # Before Python 3.12, the default child watcher waits for each process on a
+    # thread of its own. Where pidfds are supported, processes are waited for on
+    # the event loop instead, as Python 3.12 and later do by default.
+    if sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+        return
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return
+    watcher = asyncio.PidfdChildWatcher()
+    watcher.attach_loop(loop)
+    asyncio.set_child_watcher(watcher)
+
+
+_orchestrator: Optional[Orchestrator] = None
+_orchestrator_lock = threading.Lock()
+
+
+def get_orchestrator(max_processes: int = 0) -> Orchestrator:
+    """Get the orchestrator, starting it if it isn't running.
+
+    Args:
+        max_processes (int): The maximum number of adapter processes that run at the
+            same time. Only used when the orchestrator is started. Defaults to 0,
+            no limit.
+
+    Returns:
+        The orchestrator
+    """
+    global _orchestrator
+    with _orchestrator_lock:
+        if _orchestrator is None:
+            _orchestrator = Orchestrator(max_processes)
+            logger.info(
+                "Started adapter orchestrator, max processes: "
+                f"{max_processes if max_processes > 0 else 'no limit'}"
+            )
+        return _orchestrator
+
+
+def shutdown() -> None:
+    """Stop the orchestrator"""
+    global _orchestrator
+    with _orchestrator_lock:
+        if _orchestrator is not None:
+            _orchestrator.stop()
+            _orchestrator = None
@@ -1,8 +1,10 @@
 #  Copyright 2022 VMware, Inc.
 #  SPDX-License-Identifier: Apache-2.0
+import json
 import logging
 
 import connexion
+import flask
 from flask_testing import TestCase
 from swagger_server.encoder import JSONEncoder
 
@@ -14,3 +16,12 @@ class BaseTestCase(TestCase):
         app.app.json_encoder = JSONEncoder
         app.add_api("swagger.yaml")
         return app.app
+
+
+def decode_result(result):
+    """Decode the body of a result that was passed through as a response, as the
+    HTTP client would"""
+    body, code = result
+    if isinstance(body, flask.Response):
+        body = json.loads(body.get_data())
+    return body, code
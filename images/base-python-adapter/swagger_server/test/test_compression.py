@@ -0,0 +1,110 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import gzip
+import json
+import unittest
+
+import flask
+from swagger_server import compression
+from swagger_server.controllers import controller
+from werkzeug.test import Client
+
+DOCUMENT = json.dumps(
+    {"result": [{"key": {"name": f"object-{i}"}} for i in range(1000)]}
+).encode("utf-8")
+
+
+def create_app():
+    app = flask.Flask(__name__)
+
+    @app.route("/passthrough")
+    def passthrough():
+        return controller.json_response(bytearray(DOCUMENT))
+
+    @app.route("/small")
+    def small():
+        return flask.jsonify({"small": True})
+
+    @app.route("/text")
+    def text():
+        return flask.Response(DOCUMENT, mimetype="application/octet-stream")
+
+    @app.route("/encoded")
+    def encoded():
+        response = flask.Response(gzip.compress(DOCUMENT), mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+        return response
+
+    app.wsgi_app = compression.GzipMiddleware(app.wsgi_app)
+    return app
+
+
+class TestAcceptsGzip(unittest.TestCase):
+    def test_accepts_gzip(self):
+        for header in ("gzip", "gzip, deflate", "br;q=1.0, GZIP;q=0.5", "*", "x-gzip"):
+            with self.subTest(header=header):
+                self.assertTrue(compression.accepts_gzip(header))
+
+    def test_does_not_accept_gzip(self):
+        for header in ("", "identity", "deflate, br", "gzip;q=0", "*, gzip;q=0"):
+            with self.subTest(header=header):
+                self.assertFalse(compression.accepts_gzip(header))
+
+
+class TestGzipMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.client = Client(create_app())
+
+    def get(self, path, accept_encoding="gzip, deflate"):
+        return self.client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+    def test_compressed(self):
+        response = self.get("/passthrough")
+        self.assertEqual("gzip", response.headers["Content-Encoding"])
+        self.assertEqual("Accept-Encoding", response.headers["Vary"])
+        self.assertNotIn("Content-Length", response.headers)
+        data = response.get_data()
+        self.assertLess(len(data), len(DOCUMENT) / 5)
+        self.assertEqual(DOCUMENT, gzip.decompress(data))
+
+    def test_not_accepted(self):
+        response = self.get("/passthrough", accept_encoding="identity")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(str(len(DOCUMENT)), response.headers["Content-Length"])
+        self.assertEqual(DOCUMENT, response.get_data())
+
+    def test_not_compressed(self):
+        for path in ("/small", "/text", "/encoded"):
+            with self.subTest(path=path):
+                response = self.get(path)
+                self.assertIn("Content-Length", response.headers)
+                self.assertNotEqual("Accept-Encoding", response.headers.get("Vary"))
+
+    def test_head(self):
+        response = self.client.head("/passthrough", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_body_is_closed(self):
+        closed = []
+
+        class Body:
+            def __iter__(self):
+                yield DOCUMENT
+
+            def close(self):
+                closed.append(True)
+
+        def app(environ, start_response):
+            start_response("200 OK", [("Content-Type", "application/json")])
+            return Body()
+
+        response = Client(compression.GzipMiddleware(app)).get(
+            "/", headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(DOCUMENT, gzip.decompress(response.get_data()))
+        response.close()
+        self.assertEqual([True], closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
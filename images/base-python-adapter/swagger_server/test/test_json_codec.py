@@ -0,0 +1,55 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from swagger_server import json_codec
+from swagger_server.controllers import controller
+
+
+class TestJsonCodec(unittest.TestCase):
+    def test_select_codec(self):
+        with mock.patch.dict(os.environ, {"ARIA_OPS_JSON_CODEC": "json"}):
+            self.assertEqual(json_codec.get_codec().name, "json")
+
+    def test_unknown_codec(self):
+        with mock.patch.dict(os.environ, {"ARIA_OPS_JSON_CODEC": "unknown"}):
+            self.assertEqual(json_codec.get_codec().name, "json")
+
+    def test_codecs_are_interchangeable(self):
+        document = {"key": "välue", "values": [1, 2.5, None, True], "big": 2**70}
+        for name in ("json", "orjson"):
+            codec = json_codec._create_codec(name)
+            if codec is None:
+                continue
+            with self.subTest(codec=name):
+                self.assertEqual(json.loads(codec.dumps(document)), document)
+                self.assertEqual(codec.loads(json.dumps(document)), document)
+
+    def test_non_finite_floats(self):
+        codec = json_codec._create_codec("orjson")
+        if codec is None:
+            self.skipTest("orjson is not installed")
+        for value in (float("nan"), float("inf"), float("-inf")):
+            with self.subTest(value=value):
+                document = {"values": [value, None]}
+                self.assertEqual(
+                    codec.dumps(document), json_codec.JsonCodec().dumps(document)
+                )
+
+    def test_write_adapter_instance(self):
+        fd, input_pipe = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            controller.write_adapter_instance(None, input_pipe, {"extra": [1, "a"]})
+            with open(input_pipe) as f:
+                self.assertEqual(json.load(f), {"extra": [1, "a"]})
+        finally:
+            os.unlink(input_pipe)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+
+from swagger_server.controllers import controller
+from swagger_server.model_json import model_dict
+from swagger_server.models.adapter_config import AdapterConfig
+
+ADAPTER_CONFIG = {
+    "adapterKey": {
+        "name": "Adapter Instance",
+        "adapterKind": "TestAdapter",
+        "objectKind": "TestAdapter_adapter_instance",
+        "identifiers": [
+            {"key": "host", "value": "10.0.0.1", "isPartOfUniqueness": True},
+            {"key": "port", "value": "443", "isPartOfUniqueness": False},
+        ],
+    },
+    "credentialConfig": {
+        "credentialKey": "credentials",
+        "credentialFields": [
+            {"key": "user", "value": "admin", "isPassword": False},
+            {"key": "password", "value": "secret", "isPassword": True},
+        ],
+    },
+    "clusterConnectionInfo": {
+        "userName": "maintenanceAdmin",
+        "password": "token",
+        "hostName": "vrops.example.com",
+    },
+    "certificateConfig": {
+        "certificates": [
+            {
+                "certPemString": "-----BEGIN CERTIFICATE-----",
+                "isInvalidHostnameAccepted": False,
+                "isExpiredCertificateAccepted": True,
+            }
+        ]
+    },
+    "collectionNumber": 3,
+    "collectionWindow": {"startTime": 1000, "endTime": 2000.5},
+}
+
+
+def model_path(request_json):
+    return AdapterConfig.from_dict(request_json).to_dict()
+
+
+class TestModelJson(unittest.TestCase):
+    def test_same_as_model(self):
+        self.assertEqual(
+            model_path(ADAPTER_CONFIG), model_dict(ADAPTER_CONFIG, AdapterConfig)
+        )
+
+    def test_missing_attributes(self):
+        request_json = {"adapterKey": ADAPTER_CONFIG["adapterKey"]}
+        result = model_dict(request_json, AdapterConfig)
+        self.assertEqual(model_path(request_json), result)
+        self.assertIsNone(result["credential_config"])
+        self.assertIsNone(result["collection_number"])
+
+    def test_ints_for_floats(self):
+        result = model_dict(ADAPTER_CONFIG, AdapterConfig)
+        self.assertIsInstance(result["collection_window"]["start_time"], float)
+
+    def test_null_required_attribute(self):
+        request_json = copy.deepcopy(ADAPTER_CONFIG)
+        request_json["adapterKey"]["name"] = None
+        with self.assertRaises(ValueError):
+            model_dict(request_json, AdapterConfig)
+        request_json = copy.deepcopy(ADAPTER_CONFIG)
+        request_json["adapterKey"]["identifiers"][0]["value"] = None
+        self.assertEqual(
+            model_path(request_json), model_dict(request_json, AdapterConfig)
+        )
+
+    def test_values_the_model_converts(self):
+        for path, value in (
+            (("collectionNumber",), "3"),
+            (("adapterKey", "identifiers", 0, "isPartOfUniqueness"), "true"),
+            (("collectionWindow", "startTime"), True),
+            (("credentialConfig", "credentialFields"), {}),
+        ):
+            with self.subTest(path=path):
+                request_json = copy.deepcopy(ADAPTER_CONFIG)
+                parent = request_json
+                for key in path[:-1]:
+                    parent = parent[key]
+                parent[path[-1]] = value
+                with self.assertRaises(ValueError):
+                    model_dict(request_json, AdapterConfig)
+
+    def test_getadapterconfig_falls_back_to_model(self):
+        self.assertEqual(
+            model_dict(ADAPTER_CONFIG, AdapterConfig),
+            controller.getadapterconfig(ADAPTER_CONFIG),
+        )
+        request_json = dict(ADAPTER_CONFIG, collectionNumber="3")
+        config = controller.getadapterconfig(request_json)
+        self.assertIsInstance(config, AdapterConfig)
+        self.assertEqual(3, config.collection_number)
+
+    def test_encoded_adapter_instance_is_unchanged(self):
+        extras = {"collection_number": 4, "collection_window": {"start_time": 1}}
+        request_json = dict(ADAPTER_CONFIG, collectionNumber=None)
+        self.assertEqual(
+            controller.encode_adapter_instance(
+                AdapterConfig.from_dict(request_json), extras
+            ),
+            controller.encode_adapter_instance(
+                model_dict(request_json, AdapterConfig), extras
+            ),
+        )
+
+
+class TestReadConfig(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.dir = tempfile.mkdtemp()
+        os.chdir(self.dir)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.dir)
+
+    def write_config(self, execution_mode):
+        with open("commands.cfg", "w") as f:
+            f.write(f"[Server]\nexecution_mode = {execution_mode}\n")
+
+    def test_reread_when_changed(self):
+        self.assertIsNone(controller.getexecutionconfig().get("execution_mode"))
+        self.write_config("fork")
+        self.assertEqual("fork", controller.getexecutionconfig().get("execution_mode"))
+        self.assertIs(controller.readconfig(), controller.readconfig())
+        self.write_config("worker")
+        self.assertEqual(
+            "worker", controller.getexecutionconfig().get("execution_mode")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
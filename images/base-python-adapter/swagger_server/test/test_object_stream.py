@@ -0,0 +1,96 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import json
+import os
+import tempfile
+import unittest
+
+from swagger_server.controllers import controller
+
+HEADER = {"stream": "aria.ops.objects", "version": 1}
+
+
+def key(name):
+    return {
+        "adapterKind": "Adapter",
+        "objectKind": "Object",
+        "name": name,
+        "identifiers": [],
+    }
+
+
+def obj(name, metrics=()):
+    return {
+        "key": key(name),
+        "metrics": list(metrics),
+        "properties": [],
+        "events": [],
+    }
+
+
+class TestObjectStream(unittest.TestCase):
+    def setUp(self):
+        fd, self.output_pipe = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.unlink(self.output_pipe)
+
+    def read(self, records):
+        with open(self.output_pipe, "w") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        result = [None]
+        controller.read_results(self.output_pipe, result, 200)
+        return result[0]
+
+    def test_single_document(self):
+        document = {"result": [obj("a")], "relationships": []}
+        with open(self.output_pipe, "w") as f:
+            json.dump(document, f, indent=2)
+        result = [None]
+        controller.read_results(self.output_pipe, result, 200)
+        self.assertEqual(result[0], (document, 200))
+
+    def test_stream(self):
+        metric = {"key": "m", "numberValue": 1.0, "timestamp": 1}
+        relationship = {"parent": key("a"), "children": [key("b")]}
+        result = self.read(
+            [
+                HEADER,
+                {"object": obj("a", [metric])},
+                {"object": obj("b")},
+                {"relationship": relationship},
+                # Objects sent more than once are merged
+                {"object": obj("a", [metric])},
+                {"end": True},
+            ]
+        )
+        self.assertEqual(
+            result,
+            (
+                {
+                    "result": [obj("a", [metric, metric]), obj("b")],
+                    "relationships": [relationship],
+                    "nonExistingObjects": [],
+                },
+                200,
+            ),
+        )
+
+    def test_stream_error(self):
+        result = self.read(
+            [HEADER, {"object": obj("a")}, {"errorMessage": "error"}, {"end": True}]
+        )
+        self.assertEqual(result, ({"errorMessage": "error"}, 200))
+
+    def test_incomplete_stream(self):
+        # The adapter exited before finishing the stream
+        self.assertIsNone(self.read([HEADER, {"object": obj("a")}]))
+
+    def test_unsupported_version(self):
+        self.assertIsNone(self.read([{"stream": "aria.ops.objects", "version": 2}]))
+
+
+if __name__ == "__main__":
+    unittest.main()
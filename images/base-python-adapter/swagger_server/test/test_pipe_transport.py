@@ -0,0 +1,172 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import asyncio
+import concurrent.futures
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import unittest
+
+from swagger_server import orchestrator
+from swagger_server import zygote
+from swagger_server.controllers import controller
+from swagger_server.test import decode_result
+
+ADAPTER = """
+import json
+import os
+import sys
+import time
+
+
+def main(argv):
+    method, input_pipe, output_pipe = argv
+    print("stdout from " + method)
+    if method == "ignore":
+        sys.exit(0)
+    with open(input_pipe) as f:
+        body = json.load(f)
+    with open(output_pipe, "w") as f:
+        if method == "stream":
+            f.write(json.dumps({"stream": "aria.ops.objects", "version": 1}) + "\\n")
+            for name in body["names"]:
+                obj = {
+                    "key": {"name": name},
+                    "metrics": [],
+                    "properties": [],
+                    "events": [],
+                }
+                f.write(json.dumps({"object": obj}) + "\\n")
+            f.write(json.dumps({"end": True}) + "\\n")
+        elif method == "daemon":
+            # Starts a process that keeps the adapter's pipes open
+            daemon = os.fork()
+            if daemon == 0:
+                time.sleep(30)
+                os._exit(0)
+            json.dump({"method": method, "daemon": daemon}, f)
+        else:
+            json.dump({"method": method, "body": body}, f)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+"""
+
+
+class Body:
+    def __init__(self, body):
+        self.body = body
+
+    def to_dict(self):
+        return dict(self.body)
+
+
+class TestPipeTransport(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.script = os.path.join(self.dir, "adapter.py")
+        with open(self.script, "w") as f:
+            f.write(ADAPTER)
+        # The zygote imports 'swagger_server' from the working directory
+        self.cwd = os.getcwd()
+        os.chdir(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+    def tearDown(self):
+        zygote.shutdown()
+        orchestrator.shutdown()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.dir)
+
+    def run_spawned(self, method, body=None, extras=None):
+        command = [sys.executable, self.script, method]
+        return decode_result(controller.exchange(command, "spawn", body, 200, extras))
+
+    def test_spawned(self):
+        (result, code) = self.run_spawned("test", extras={"collection_number": 3})
+        self.assertEqual(200, code)
+        self.assertEqual({"method": "test", "body": {"collection_number": 3}}, result)
+
+    def test_input_larger_than_pipe_buffer(self):
+        names = [f"object-{i}" for i in range(100000)]
+        (result, code) = self.run_spawned("stream", Body({"names": names}))
+        self.assertEqual(200, code)
+        self.assertEqual(names, [obj["key"]["name"] for obj in result["result"]])
+
+    def test_adapter_ignores_pipes(self):
+        (message, code) = self.run_spawned("ignore", Body({"names": ["a"] * 100000}))
+        self.assertEqual(500, code)
+        self.assertIn("No result from adapter", message)
+        self.assertIn("stdout from ignore", message)
+
+    def test_command_not_found(self):
+        (message, code) = controller.exchange(
+            [os.path.join(self.dir, "missing")], "spawn", None, 200, None
+        )
+        self.assertEqual(500, code)
+        self.assertEqual("Error initializing adapter communication", message)
+
+    def test_concurrent_requests(self):
+        with concurrent.futures.ThreadPoolExecutor(8) as executor:
+            results = list(
+                executor.map(
+                    lambda i: self.run_spawned("test", extras={"collection_number": i}),
+                    range(16),
+                )
+            )
+        for i, (result, code) in enumerate(results):
+            self.assertEqual(200, code)
+            self.assertEqual({"collection_number": i}, result["body"])
+
+    def test_forked(self):
+        command = [sys.executable, self.script, "collect"]
+        (result, code) = decode_result(
+            controller.exchange(command, "fork", None, 200, {"collection_number": 1})
+        )
+        self.assertEqual(200, code)
+        self.assertEqual(
+            {"method": "collect", "body": {"collection_number": 1}}, result
+        )
+
+    def test_forked_descriptors_left_open_by_a_child(self):
+        command = [sys.executable, self.script, "daemon"]
+        start = time.monotonic()
+        (result, code) = decode_result(
+            controller.exchange(command, "fork", None, 200, {"collection_number": 1})
+        )
+        os.kill(result["daemon"], signal.SIGKILL)
+        self.assertEqual(200, code)
+        self.assertEqual("daemon", result["method"])
+        self.assertLess(time.monotonic() - start, 10)
+
+
+class TestOrchestrator(unittest.TestCase):
+    def setUp(self):
+        self.orchestrator = orchestrator.Orchestrator(max_processes=2)
+
+    def tearDown(self):
+        self.orchestrator.stop()
+
+    def test_max_processes(self):
+        running = []
+        peak = []
+
+        async def process():
+            running.append(None)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+
+        futures = [self.orchestrator.submit(process()) for _ in range(8)]
+        for future in futures:
+            future.result()
+        self.assertEqual(8, len(peak))
+        self.assertEqual(2, max(peak))
+
+
+if __name__ == "__main__":
+    unittest.main()
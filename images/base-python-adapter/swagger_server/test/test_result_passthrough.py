@@ -0,0 +1,99 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import json
+import unittest
+
+import flask
+from swagger_server.controllers import controller
+
+DOCUMENT = json.dumps(
+    {
+        "result": [
+            {
+                "key": {"name": 'a "quoted" {name} with [brackets]\\'},
+                "metrics": [{"key": "m", "numberValue": 1.5}],
+                "properties": [],
+            }
+        ],
+        "relationships": [],
+    },
+    indent=2,
+).encode("utf-8")
+
+
+class TestIsCompleteJson(unittest.TestCase):
+    def test_complete(self):
+        self.assertTrue(controller.is_complete_json(DOCUMENT))
+        self.assertTrue(controller.is_complete_json(b' ["https://a", "b]"]\n'))
+        self.assertTrue(controller.is_complete_json(b"{}"))
+
+    def test_every_truncation_is_incomplete(self):
+        for end in range(len(DOCUMENT)):
+            with self.subTest(end=end):
+                self.assertFalse(controller.is_complete_json(DOCUMENT[:end]))
+
+    def test_not_an_object_or_array(self):
+        self.assertFalse(controller.is_complete_json(b""))
+        self.assertFalse(controller.is_complete_json(b'"result"'))
+        self.assertFalse(controller.is_complete_json(b"[1}"))
+
+
+class TestResultReader(unittest.TestCase):
+    def read(self, data, passthrough=True):
+        reader = controller.ResultReader(passthrough)
+        for start in range(0, len(data), 7):
+            reader.feed(data[start : start + 7])
+        return reader.result()
+
+    def test_passthrough(self):
+        response = self.read(DOCUMENT)
+        self.assertIsInstance(response, flask.Response)
+        self.assertEqual("application/json", response.mimetype)
+        self.assertEqual(str(len(DOCUMENT)), response.headers["Content-Length"])
+        self.assertEqual(DOCUMENT, response.get_data())
+
+    def test_passthrough_incomplete(self):
+        with self.assertRaises(ValueError):
+            self.read(DOCUMENT[:-2])
+
+    def test_validate(self):
+        self.assertEqual(json.loads(DOCUMENT), self.read(DOCUMENT, passthrough=False))
+        with self.assertRaises(ValueError):
+            self.read(DOCUMENT[:-2], passthrough=False)
+
+    def test_malformed_with_balanced_brackets(self):
+        malformed = b'{"result": [{"key": }], "relationships" []}'
+        self.assertTrue(controller.is_complete_json(malformed))
+        with self.assertRaises(ValueError):
+            self.read(malformed, passthrough=False)
+
+    def test_only_collect_results_are_passed_through(self):
+        self.assertTrue(controller.is_collect_result(DOCUMENT))
+        self.assertTrue(controller.is_collect_result(b' {\n"errorMessage" : "e"}'))
+        self.assertFalse(controller.is_collect_result(b'{"endpointUrls": []}'))
+        self.assertFalse(controller.is_collect_result(b'["result"]'))
+        self.assertEqual({"endpointUrls": []}, self.read(b'{"endpointUrls": []}'))
+        with self.assertRaises(ValueError):
+            self.read(b'{"endpointUrls": [] "a"}')
+
+    def test_object_stream_is_assembled(self):
+        stream = b"\n".join(
+            json.dumps(record).encode("utf-8")
+            for record in (
+                {"stream": "aria.ops.objects", "version": 1},
+                {"relationship": {"parent": "a", "children": []}},
+                {"end": True},
+            )
+        )
+        self.assertEqual(
+            {
+                "result": [],
+                "relationships": [{"parent": "a", "children": []}],
+                "nonExistingObjects": [],
+            },
+            self.read(stream),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+from swagger_server import worker_pool
+from swagger_server.controllers import controller
+from swagger_server.test import decode_result
+
+ADAPTER = """
+import json
+import os
+import sys
+
+IMPORT_PID = os.getpid()
+
+
+def main(argv):
+    method, input_pipe, output_pipe = argv
+    with open(input_pipe) as f:
+        body = json.load(f)
+    print("stdout from " + method)
+    with open(output_pipe, "w") as f:
+        json.dump({"method": method, "pid": IMPORT_PID, "body": body}, f)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+"""
+
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.script = os.path.join(self.dir, "adapter.py")
+        with open(self.script, "w") as f:
+            f.write(ADAPTER)
+        # The worker imports 'swagger_server' from the working directory
+        self.cwd = os.getcwd()
+        os.chdir(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+    def tearDown(self):
+        worker_pool.shutdown()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.dir)
+
+    def run_on_pool(self, pool, method):
+        with pool.acquire() as worker:
+            return decode_result(
+                controller.communicate(
+                    lambda: worker.start(method),
+                    worker.input_pipe,
+                    worker.output_pipe,
+                    None,
+                    200,
+                    {"collection_number": 1},
+                )
+            )
+
+    def test_worker_command(self):
+        self.assertEqual(
+            ("/usr/bin/python3", "app/adapter.py"),
+            worker_pool.worker_command(["/usr/bin/python3", "app/adapter.py", "test"]),
+        )
+        self.assertIsNone(
+            worker_pool.worker_command(["/usr/bin/java", "-jar", "app.jar", "test"])
+        )
+
+    def test_worker_reuses_process(self):
+        pool = worker_pool.WorkerPool(sys.executable, self.script)
+        (first, code) = self.run_on_pool(pool, "collect")
+        (second, _) = self.run_on_pool(pool, "test")
+        self.assertEqual(200, code)
+        self.assertEqual("collect", first["method"])
+        self.assertEqual("test", second["method"])
+        self.assertEqual({"collection_number": 1}, second["body"])
+        self.assertEqual(first["pid"], second["pid"])
+        pool.shutdown()
+
+    def test_worker_recycled_after_max_requests(self):
+        pool = worker_pool.WorkerPool(sys.executable, self.script, max_requests=1)
+        (first, _) = self.run_on_pool(pool, "collect")
+        (second, _) = self.run_on_pool(pool, "collect")
+        self.assertNotEqual(first["pid"], second["pid"])
+        pool.shutdown()
+
+    def test_concurrent_requests(self):
+        pool = worker_pool.WorkerPool(sys.executable, self.script, size=2)
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(self.run_on_pool(pool, "collect"))
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([200] * 4, [code for _, code in results])
+        pool.shutdown()
+
+    def test_worker_replaced_after_failed_request(self):
+        pool = worker_pool.WorkerPool(sys.executable, self.script)
+        (first, _) = self.run_on_pool(pool, "collect")
+
+        def receive():
+            raise ValueError("reply could not be decoded")
+
+        with self.assertRaises(ValueError):
+            with pool.acquire() as worker:
+                request = worker.start("collect")
+                worker.receive = receive
+                request.communicate()
+        self.assertIsNotNone(worker.process.poll())
+        (second, code) = self.run_on_pool(pool, "collect")
+        self.assertEqual(200, code)
+        self.assertNotEqual(first["pid"], second["pid"])
+        pool.shutdown()
+
+    def test_worker_startup_error(self):
+        with open(self.script, "w") as f:
+            f.write("raise ImportError('missing dependency')\n")
+        with self.assertRaises(worker_pool.WorkerStartupError):
+            worker_pool.Worker(sys.executable, self.script)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import unittest
+
+from swagger_server import zygote
+from swagger_server.controllers import controller
+from swagger_server.test import decode_result
+
+ADAPTER = """
+import json
+import os
+import sys
+import time
+
+IMPORT_PID = os.getpid()
+
+
+def main(argv):
+    method, input_pipe, output_pipe = argv
+    with open(input_pipe) as f:
+        body = json.load(f)
+    print("stdout from " + method)
+    if method == "crash":
+        os.abort()
+    daemon = None
+    if method == "daemon":
+        # Starts a process that keeps the adapter's stdout and stderr open
+        daemon = os.fork()
+        if daemon == 0:
+            time.sleep(30)
+            os._exit(0)
+    with open(output_pipe, "w") as f:
+        json.dump(
+            {
+                "method": method,
+                "import_pid": IMPORT_PID,
+                "pid": os.getpid(),
+                "daemon": daemon,
+            },
+            f,
+        )
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+"""
+
+
+class TestZygote(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.script = os.path.join(self.dir, "adapter.py")
+        with open(self.script, "w") as f:
+            f.write(ADAPTER)
+        # The zygote imports 'swagger_server' from the working directory
+        self.cwd = os.getcwd()
+        os.chdir(os.path.join(os.path.dirname(__file__), "..", ".."))
+        self.zygote = zygote.Zygote(sys.executable, self.script)
+
+    def tearDown(self):
+        self.zygote.stop()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.dir)
+
+    def run_forked(self, method):
+        request_dir = tempfile.mkdtemp(dir=self.dir)
+        input_pipe = os.path.join(request_dir, "input_pipe")
+        output_pipe = os.path.join(request_dir, "output_pipe")
+        os.mkfifo(input_pipe)
+        os.mkfifo(output_pipe)
+        return decode_result(
+            controller.communicate(
+                lambda: self.zygote.fork(method, input_pipe, output_pipe),
+                input_pipe,
+                output_pipe,
+                None,
+                200,
+                None,
+            )
+        )
+
+    def test_each_request_is_forked(self):
+        (first, code) = self.run_forked("collect")
+        (second, _) = self.run_forked("test")
+        self.assertEqual(200, code)
+        self.assertEqual("collect", first["method"])
+        self.assertEqual("test", second["method"])
+        # Both requests share the zygote's imports, but run in separate processes
+        self.assertEqual(first["import_pid"], second["import_pid"])
+        self.assertNotEqual(first["import_pid"], first["pid"])
+        self.assertNotEqual(first["pid"], second["pid"])
+
+    def test_crash_does_not_affect_zygote(self):
+        (message, code) = self.run_forked("crash")
+        self.assertEqual(500, code)
+        self.assertIn("stdout from crash", message)
+        (result, code) = self.run_forked("collect")
+        self.assertEqual(200, code)
+        self.assertTrue(self.zygote.is_alive())
+
+    def test_descriptors_left_open_by_a_child(self):
+        start = time.monotonic()
+        (result, code) = self.run_forked("daemon")
+        os.kill(result["daemon"], signal.SIGKILL)
+        self.assertEqual(200, code)
+        self.assertEqual("daemon", result["method"])
+        self.assertLess(time.monotonic() - start, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
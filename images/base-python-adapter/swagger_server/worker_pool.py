@@ -0,0 +1,304 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Pool of long-lived adapter worker processes.
+
+Workers are started with `python -m swagger_server.adapter_worker` using the same
+interpreter and adapter script as the command in 'commands.cfg', and keep the
+adapter's modules imported between requests. A worker is retired and replaced after
+it has handled 'max_requests' requests, or when its peak memory usage exceeds
+'max_memory' bytes. A worker that did not reply to a request, e.g., because waiting
+for the reply raised, is killed and replaced, as it may still be running the request.
+"""
+import contextlib
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from swagger_server.adapter_worker import read_frame
+from swagger_server.adapter_worker import write_frame
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerStartupError(Exception):
+    """Exception when a worker process could not import the adapter"""
+
+    pass
+
+
+class WorkerRequest:
+    """A single adapter invocation running on a worker.
+
+    Mirrors the subset of the 'subprocess.Popen' interface used by the controller.
+    """
+
+    def __init__(self, worker: "Worker", method: str) -> None:
+        self.worker = worker
+        self.args = worker.args + [method]
+        # Set before sending, as a partially sent frame also leaves the worker
+        # unusable
+        worker.busy = True
+        worker.send({"method": method})
+
+    def communicate(self) -> Tuple[str, str]:
+        """Wait for the adapter invocation to complete.
+
+        Returns:
+            A tuple of the captured (stdout, stderr) of the invocation
+        """
+        reply = self.worker.receive()
+        if reply is None:
+            self.worker.retire()
+            return "", "Adapter worker exited unexpectedly"
+        self.worker.busy = False
+        self.worker.requests += 1
+        self.worker.max_rss = reply.get("max_rss", 0)
+        if reply.get("exit_code", 0) != 0:
+            logger.debug(f"Adapter exited with code {reply['exit_code']}")
+        return reply.get("stdout", ""), reply.get("stderr", "")
+
+
+class Worker:
+    """A long-lived adapter process with its own fixed pair of named pipes"""
+
+    def __init__(self, interpreter: str, script: str) -> None:
+        self.dir = tempfile.mkdtemp()
+        # Named from the perspective of the worker, as in 'controller.runcommand'
+        self.input_pipe = os.path.join(self.dir, "input_pipe")
+        self.output_pipe = os.path.join(self.dir, "output_pipe")
+        self.args = [interpreter, script]
+        self.requests = 0
+        self.max_rss = 0
+        self.retired = False
+        # Whether a request has been sent to the worker without a reply being read
+        self.busy = False
+        try:
+            os.mkfifo(self.input_pipe)
+            os.mkfifo(self.output_pipe)
+            self.process = subprocess.Popen(
+                [
+                    interpreter,
+                    "-m",
+                    "swagger_server.adapter_worker",
+                    script,
+                    self.input_pipe,
+                    self.output_pipe,
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        except OSError as e:
+            shutil.rmtree(self.dir, ignore_errors=True)
+            raise WorkerStartupError(f"Could not start adapter worker: {e}") from e
+
+        ready = self.receive()
+        if not ready or not ready.get("ready"):
+            self.retire()
+            error = ready.get("error") if ready else "worker exited"
+            raise WorkerStartupError(f"Adapter worker failed to start: {error}")
+        self.max_rss = ready.get("max_rss", 0)
+        logger.info(f"Started adapter worker {self.process.pid}")
+
+    def start(self, method: str) -> WorkerRequest:
+        """Start running 'method' on this worker
+
+        Args:
+            method (str): The adapter method, e.g., 'collect'
+
+        Returns:
+            A handle that can be used to wait for the method to complete
+        """
+        return WorkerRequest(self, method)
+
+    def send(self, message: Dict[str, Any]) -> None:
+        assert self.process.stdin is not None  # nosec: assert used for type checking
+        write_frame(self.process.stdin, message)
+
+    def receive(self) -> Optional[Dict[str, Any]]:
+        assert self.process.stdout is not None  # nosec: assert used for type checking
+        return read_frame(self.process.stdout)
+
+    def is_alive(self) -> bool:
+        return not self.retired and self.process.poll() is None
+
+    def retire(self) -> None:
+        """Stop the worker process and remove its pipes. A busy worker is killed."""
+        if self.retired:
+            return
+        self.retired = True
+        logger.info(
+            f"Retiring adapter worker {self.process.pid} after {self.requests} "
+            f"request(s), peak memory {self.max_rss // (1024 * 1024)} MiB"
+        )
+        try:
+            if self.busy:
+                self.process.kill()
+            # Closing stdin signals the worker to exit its request loop
+            if self.process.stdin:
+                self.process.stdin.close()
+            self.process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        finally:
+            if self.process.stdout:
+                self.process.stdout.close()
+            shutil.rmtree(self.dir, ignore_errors=True)
+
+
+class WorkerPool:
+    """A fixed-size pool of adapter workers for a single adapter command"""
+
+    def __init__(
+        self,
+        interpreter: str,
+        script: str,
+        size: int = 1,
+        max_requests: int = 0,
+        max_memory: int = 0,
+    ) -> None:
+        """Initializes a WorkerPool. Workers are started when the pool is created.
+
+        Args:
+            interpreter (str): Path to the Python interpreter used by the adapter
+            script (str): Path to the adapter script
+            size (int): Number of workers to keep running. Defaults to 1.
+            max_requests (int): Number of requests a worker handles before it is
+                replaced. '0' (default) means workers are never replaced due to the
+                number of requests.
+            max_memory (int): Peak memory usage (in bytes) above which a worker is
+                replaced. '0' (default) means workers are never replaced due to
+                memory usage.
+        """
+        self.interpreter = interpreter
+        self.script = script
+        self.size = size
+        self.max_requests = max_requests
+        self.max_memory = max_memory
+        self.idle: "queue.Queue[Optional[Worker]]" = queue.Queue()
+        for _ in range(size):
+            self.idle.put(self._start_worker())
+
+    def _start_worker(self) -> Optional[Worker]:
+        try:
+            return Worker(self.interpreter, self.script)
+        except WorkerStartupError as e:
+            logger.error(str(e))
+            return None
+
+    def _should_retire(self, worker: Worker) -> bool:
+        if worker.busy or not worker.is_alive():
+            return True
+        if self.max_requests and worker.requests >= self.max_requests:
+            return True
+        if self.max_memory and worker.max_rss > self.max_memory:
+            return True
+        return False
+
+    @contextlib.contextmanager
+    def acquire(self) -> Iterator[Worker]:
+        """Reserve an idle worker for the duration of a request, waiting for one to
+        become available if necessary.
+
+        Raises:
+            WorkerStartupError: If a worker could not be started
+        """
+        worker = self.idle.get()
+        try:
+            if worker is None or not worker.is_alive():
+                if worker is not None:
+                    worker.retire()
+                    worker = None
+                worker = Worker(self.interpreter, self.script)
+            yield worker
+        finally:
+            if worker is not None and self._should_retire(worker):
+                worker.retire()
+                # Replace lazily on the next request, so the replacement doesn't
+                # delay the response to this request.
+                worker = None
+            self.idle.put(worker)
+
+    def shutdown(self) -> None:
+        """Retire all idle workers"""
+        while not self.idle.empty():
+            worker = self.idle.get_nowait()
+            if worker is not None:
+                worker.retire()
+
+
+_pools: Dict[Tuple[str, ...], Optional[WorkerPool]] = {}
+_pools_lock = threading.Lock()
+
+
+def worker_command(command: List[str]) -> Optional[Tuple[str, str]]:
+    """Determine the interpreter and adapter script used by a command, if the command
+    can be run on a worker.
+
+    Only commands of the form '<python interpreter> <script>.py <method>' can be run
+    on a worker.
+
+    Args:
+        command (List[str]): The command from 'commands.cfg', split into arguments
+
+    Returns:
+        A tuple of (interpreter, script), or None if the command is not supported
+    """
+    if len(command) != 3:
+        return None
+    interpreter, script, _ = command
+    if not os.path.basename(interpreter).startswith("python"):
+        return None
+    if not script.endswith(".py"):
+        return None
+    return interpreter, script
+
+
+def get_worker_pool(
+    command: List[str], size: int, max_requests: int, max_memory: int
+) -> Optional[WorkerPool]:
+    """Get the pool of workers for the given command, creating it if necessary.
+
+    Args:
+        command (List[str]): The command from 'commands.cfg', split into arguments
+        size (int): Number of workers to start if the pool is created
+        max_requests (int): See :class:`WorkerPool`
+        max_memory (int): See :class:`WorkerPool`
+
+    Returns:
+        The worker pool, or None if the command cannot be run on a worker
+    """
+    interpreter_and_script = worker_command(command)
+    if interpreter_and_script is None:
+        return None
+    with _pools_lock:
+        if interpreter_and_script not in _pools:
+            logger.info(
+                f"Starting {size} adapter worker(s) for {' '.join(interpreter_and_script)}"
+            )
+            _pools[interpreter_and_script] = WorkerPool(
+                *interpreter_and_script,
+                size=size,
+                max_requests=max_requests,
+                max_memory=max_memory,
+            )
+        return _pools[interpreter_and_script]
+
+
+def shutdown() -> None:
+    """Retire all workers in all pools"""
+    with _pools_lock:
+        for pool in _pools.values():
+            if pool is not None:
+                pool.shutdown()
+        _pools.clear()
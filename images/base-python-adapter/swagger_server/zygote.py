@@ -0,0 +1,285 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Server side of the adapter fork-server ('zygote') execution mode.
+
+The zygote is started with `python -m swagger_server.adapter_zygote` using the same
+interpreter and adapter script as the command in 'commands.cfg'. It imports the
+adapter once, and forks a child process for each request.
+"""
+import asyncio
+import json
+import logging
+import os
+import select
+import selectors
+import socket
+import subprocess
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from swagger_server.adapter_zygote import MAX_MESSAGE_SIZE
+from swagger_server.worker_pool import worker_command
+from swagger_server.worker_pool import WorkerStartupError
+
+logger = logging.getLogger(__name__)
+
+
+class ForkedProcess:
+    """An adapter process forked from the zygote.
+
+    Mirrors the subset of the 'subprocess.Popen' interface used by the controller.
+
+    The zygote's children are not children of the server, so the server cannot wait
+    for them. Instead, the process has exited when its pidfd becomes readable. Its
+    stdout and stderr may still be open then, e.g., in a daemon the process started,
+    so they are only read until the data written before the process exited has been
+    read. Without a pidfd, the process is considered to have exited when both its
+    stdout and stderr have been closed.
+    """
+
+    def __init__(
+        self,
+        args: List[str],
+        pid: int,
+        stdout: int,
+        stderr: int,
+        pidfd: Optional[int] = None,
+    ) -> None:
+        self.args = args
+        self.pid = pid
+        self.pidfd = pidfd
+        self.stdout = open(stdout, "rb", buffering=0)
+        self.stderr = open(stderr, "rb", buffering=0)
+
+    def wait(self) -> None:
+        """Wait for the process to exit. Without a pidfd, does nothing: the process
+        has exited once its stdout and stderr have been closed."""
+        if self.pidfd is not None:
+            select.select([self.pidfd], [], [])
+
+    async def wait_async(self) -> None:
+        """Wait for the process to exit on the running event loop. Without a pidfd,
+        never completes."""
+        loop = asyncio.get_running_loop()
+        exited = loop.create_future()
+        if self.pidfd is None:
+            await exited
+            return
+        pidfd = self.pidfd
+
+        def on_exit() -> None:
+            if not exited.done():
+                exited.set_result(None)
+
+        loop.add_reader(pidfd, on_exit)
+        try:
+            await exited
+        finally:
+            loop.remove_reader(pidfd)
+
+    def close(self) -> None:
+        """Close the process's stdout, stderr and pidfd"""
+        self.stdout.close()
+        self.stderr.close()
+        if self.pidfd is not None:
+            os.close(self.pidfd)
+            self.pidfd = None
+
+    def communicate(self) -> Tuple[str, str]:
+        """Wait for the process to exit.
+
+        Returns:
+            A tuple of the captured (stdout, stderr) of the process
+        """
+        stdout, stderr = self.stdout.fileno(), self.stderr.fileno()
+        output: Dict[int, List[bytes]] = {stdout: [], stderr: []}
+        with selectors.DefaultSelector() as selector:
+            selector.register(stdout, selectors.EVENT_READ)
+            selector.register(stderr, selectors.EVENT_READ)
+            if self.pidfd is not None:
+                selector.register(self.pidfd, selectors.EVENT_READ)
+            exited = False
+            while not exited and len(selector.get_map()) > (self.pidfd is not None):
+                for key, _ in selector.select():
+                    if key.fd == self.pidfd:
+                        exited = True
+                        continue
+                    data = os.read(key.fd, 32768)
+                    if data:
+                        output[key.fd].append(data)
+                    else:
+                        selector.unregister(key.fd)
+        if exited:
+            for fd in (stdout, stderr):
+                output[fd].extend(read_available(fd))
+        self.close()
+        return (
+            b"".join(output[stdout]).decode("utf-8", errors="replace"),
+            b"".join(output[stderr]).decode("utf-8", errors="replace"),
+        )
+
+
+def read_available(fd: int) -> List[bytes]:
+    """Read what has been written to a pipe, without waiting for more"""
+    chunks = []
+    os.set_blocking(fd, False)
+    try:
+        while True:
+            data = os.read(fd, 32768)
+            if not data:
+                break
+            chunks.append(data)
+    except BlockingIOError:
+        pass
+    finally:
+        os.set_blocking(fd, True)
+    return chunks
+
+
+class Zygote:
+    """A process that has imported the adapter, and forks a new process for each
+    request"""
+
+    def __init__(self, interpreter: str, script: str) -> None:
+        self.args = [interpreter, script]
+        self.lock = threading.Lock()
+        self.socket, child_socket = socket.socketpair(
+            socket.AF_UNIX, socket.SOCK_SEQPACKET
+        )
+        try:
+            self.process = subprocess.Popen(
+                [
+                    interpreter,
+                    "-m",
+                    "swagger_server.adapter_zygote",
+                    script,
+                    str(child_socket.fileno()),
+                ],
+                pass_fds=(child_socket.fileno(),),
+            )
+        except OSError as e:
+            self.socket.close()
+            raise WorkerStartupError(f"Could not start adapter zygote: {e}") from e
+        finally:
+            child_socket.close()
+
+        ready, _ = self._receive()
+        if not ready or not ready.get("ready"):
+            self.stop()
+            error = ready.get("error") if ready else "zygote exited"
+            raise WorkerStartupError(f"Adapter zygote failed to start: {error}")
+        logger.info(f"Started adapter zygote {self.process.pid}")
+
+    def _receive(self) -> Tuple[Optional[Dict[str, Any]], List[int]]:
+        message, fds, _, _ = socket.recv_fds(self.socket, MAX_MESSAGE_SIZE, 1)
+        if not message:
+            for fd in fds:
+                os.close(fd)
+            return None, []
+        return json.loads(message.decode("utf-8")), fds
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def fork(
+        self,
+        method: str,
+        input_pipe: str,
+        output_pipe: str,
+        pass_fds: Sequence[int] = (),
+    ) -> ForkedProcess:
+        """Fork a new adapter process that runs 'method'
+
+        Args:
+            method (str): The adapter method, e.g., 'collect'
+            input_pipe (str): Path to the pipe the adapter reads its input from
+            output_pipe (str): Path to the pipe the adapter writes its result to
+            pass_fds (Sequence[int]): File descriptors to pass to the process.
+                Pipe paths of the form '/dev/fd/<fd>' that refer to one of them
+                are rewritten to refer to the process's copy. Defaults to none.
+
+        Returns:
+            A handle that can be used to wait for the process to complete
+
+        Raises:
+            OSError: If the process could not be forked
+        """
+        argv = [method, input_pipe, output_pipe]
+        stdout_r, stdout_w = os.pipe()
+        stderr_r, stderr_w = os.pipe()
+        try:
+            with self.lock:
+                socket.send_fds(
+                    self.socket,
+                    [json.dumps({"argv": argv, "fds": list(pass_fds)}).encode("utf-8")],
+                    [stdout_w, stderr_w, *pass_fds],
+                )
+                reply, reply_fds = self._receive()
+        except OSError:
+            os.close(stdout_r)
+            os.close(stderr_r)
+            raise
+        finally:
+            # The child has its own copies; we only need the read ends
+            os.close(stdout_w)
+            os.close(stderr_w)
+        if reply is None:
+            os.close(stdout_r)
+            os.close(stderr_r)
+            raise OSError("Adapter zygote exited unexpectedly")
+        pidfd = reply_fds[0] if reply_fds else None
+        return ForkedProcess(
+            self.args + [method], reply["pid"], stdout_r, stderr_r, pidfd
+        )
+
+    def stop(self) -> None:
+        """Stop the zygote. Children that are still running are not affected."""
+        self.socket.close()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+_zygotes: Dict[Tuple[str, ...], Zygote] = {}
+_zygotes_lock = threading.Lock()
+
+
+def get_zygote(command: List[str]) -> Optional[Zygote]:
+    """Get the zygote for the given command, starting it if it isn't running.
+
+    Args:
+        command (List[str]): The command from 'commands.cfg', split into arguments
+
+    Returns:
+        The zygote, or None if the command cannot be run from a zygote
+
+    Raises:
+        WorkerStartupError: If the zygote could not be started
+    """
+    interpreter_and_script = worker_command(command)
+    if interpreter_and_script is None:
+        return None
+    with _zygotes_lock:
+        zygote = _zygotes.get(interpreter_and_script)
+        if zygote is None or not zygote.is_alive():
+            if zygote is not None:
+                logger.warning("Adapter zygote exited, restarting")
+                zygote.stop()
+            zygote = Zygote(*interpreter_and_script)
+            _zygotes[interpreter_and_script] = zygote
+        return zygote
+
+
+def shutdown() -> None:
+    """Stop all zygotes"""
+    with _zygotes_lock:
+        for zygote in _zygotes.values():
+            zygote.stop()
+        _zygotes.clear()
@@ -0,0 +1,82 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compare adding table-shaped metric data one data point at a time with the bulk API.
+
+Each row of the table is an object, and each column a metric, as in a query result
+(MySQL) or a table walk (SNMP). Adds the table using:
+  * with_metric:         'obj.with_metric(key, value)' for each data point
+  * with_metrics:        'obj.with_metrics(keys, row)' for each object
+  * with_metric_columns: 'result.with_metric_columns(objects, columns)' once
+
+Run from the 'lib/python' directory:
+    python -m benchmarks.bulk_metrics [--objects N] [--metrics N]
+"""
+import argparse
+import random
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from aria.ops.object import Object
+from aria.ops.result import CollectResult
+
+
+def new_result(objects: int) -> CollectResult:
+    result = CollectResult()
+    for i in range(objects):
+        result.object("Adapter", "Object", f"object-{i}")
+    return result
+
+
+def measure(
+    name: str,
+    add: Callable[[CollectResult, List[Object]], None],
+    objects: int,
+    expected: dict,
+) -> None:
+    result = new_result(objects)
+    start = time.perf_counter()
+    add(result, list(result.objects.values()))
+    elapsed = time.perf_counter() - start
+    assert result.get_json() == expected  # nosec: benchmark sanity check
+    print(f"{name:<20} {elapsed:7.3f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--objects", type=int, default=50000)
+    parser.add_argument("--metrics", type=int, default=20)
+    args = parser.parse_args()
+
+    timestamp = 1700000000000
+    keys = [f"Interface|Counter {m}" for m in range(args.metrics)]
+    rows = [
+        [float(random.randint(0, 2**32)) for _ in keys] for _ in range(args.objects)
+    ]
+    columns: Dict[str, List[float]] = {
+        key: [row[m] for row in rows] for m, key in enumerate(keys)
+    }
+
+    def with_metric(result: CollectResult, objects: List[Object]) -> None:
+        for obj, row in zip(objects, rows):
+            for key, value in zip(keys, row):
+                obj.with_metric(key, value, timestamp)
+
+    def with_metrics(result: CollectResult, objects: List[Object]) -> None:
+        for obj, row in zip(objects, rows):
+            obj.with_metrics(keys, row, timestamp)
+
+    def with_metric_columns(result: CollectResult, objects: List[Object]) -> None:
+        result.with_metric_columns(objects, columns, timestamp)
+
+    expected = new_result(args.objects)
+    with_metric(expected, list(expected.objects.values()))
+
+    print(f"{args.objects} objects x {args.metrics} metrics")
+    for add in [with_metric, with_metrics, with_metric_columns]:
+        measure(add.__name__, add, args.objects, expected.get_json())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compare the memory use and throughput of serializing a large CollectResult.
+
+Writes a CollectResult to a file using:
+  * dump:   'json.dump(result.get_json())', which builds the complete document first
+  * stream: 'result.send_results()', which writes each object as it is encoded
+
+Run from the 'lib/python' directory:
+    python -m benchmarks.collect_result_serialization [--objects N] [--metrics N]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from aria.ops.json_codec import CODEC_ENVIRONMENT_VARIABLE
+from aria.ops.result import CollectResult
+
+
+def build_result(objects: int, metrics: int) -> CollectResult:
+    result = CollectResult()
+    parent = result.object("Adapter", "Parent", "parent")
+    for i in range(objects):
+        obj = result.object("Adapter", "Object", f"object-{i}")
+        for m in range(metrics):
+            obj.with_metric(f"group|metric-{m}", i * 0.5 + m, 1700000000000)
+        obj.with_property("description", f"Object number {i}", 1700000000000)
+        obj.with_property("index", i, 1700000000000)
+        parent.add_child(obj)
+    return result
+
+
+def dump(result: CollectResult, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(result.get_json(), f)
+
+
+def stream(result: CollectResult, path: str) -> None:
+    result.send_results(path)
+
+
+def measure(
+    name: str,
+    write: Callable[[CollectResult, str], None],
+    result: CollectResult,
+    path: str,
+) -> None:
+    # Time without tracemalloc, which slows down allocations considerably
+    start = time.perf_counter()
+    write(result, path)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(path)
+
+    tracemalloc.start()
+    write(result, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<7} {elapsed:7.2f} s   {size / elapsed / 2**20:7.1f} MiB/s   "
+        f"peak {peak / 2**20:8.1f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--objects", type=int, default=100000)
+    parser.add_argument("--metrics", type=int, default=5)
+    args = parser.parse_args()
+    # The output is compared byte-for-byte with 'json.dump'
+    os.environ[CODEC_ENVIRONMENT_VARIABLE] = "json"
+
+    result = build_result(args.objects, args.metrics)
+    with tempfile.TemporaryDirectory() as dir:
+        path = os.path.join(dir, "output")
+        measure("dump", dump, result, path)
+        with open(path, "rb") as f:
+            expected = f.read()
+        measure("stream", stream, result, path)
+        with open(path, "rb") as f:
+            assert f.read() == expected  # nosec: benchmark sanity check
+    print(f"{args.objects} objects, {len(expected) / 2**20:.1f} MiB of JSON")
+
+
+if __name__ == "__main__":
+    main()
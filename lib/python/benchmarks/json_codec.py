@@ -0,0 +1,69 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compare the encode and decode throughput of the available JSON codecs.
+
+Builds a collect result of roughly the given size, and for each codec measures:
+  * encode: 'codec.dumps(result.get_json())'
+  * stream: encoding the result in fragments, as 'send_results' does
+  * decode: 'codec.loads(...)', as the server does when reading the output pipe
+
+Run from the 'lib/python' directory:
+    python -m benchmarks.json_codec [--size-mb N]
+"""
+import argparse
+import time
+from typing import Any
+from typing import Callable
+from typing import List
+
+from aria.ops.json_codec import _CODECS
+from aria.ops.json_codec import _create_codec
+from aria.ops.json_codec import JsonCodec
+from aria.ops.result import CollectResult
+from benchmarks.collect_result_serialization import build_result
+
+METRICS = 5
+
+
+def build_result_of_size(size_mb: float) -> CollectResult:
+    sample_objects = 1000
+    sample = JsonCodec().dumps(build_result(sample_objects, METRICS).get_json())
+    objects = int(size_mb * 2**20 / len(sample) * sample_objects)
+    return build_result(objects, METRICS)
+
+
+def measure(name: str, size: int, function: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    value = function()
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<7} {elapsed:7.2f} s   {size / elapsed / 2**20:7.1f} MiB/s")
+    return value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--size-mb", type=float, default=200)
+    args = parser.parse_args()
+
+    result = build_result_of_size(args.size_mb)
+    document = result.get_json()
+    size = len(JsonCodec().dumps(document))
+    print(f"{len(result.objects)} objects, {size / 2**20:.1f} MiB of JSON")
+
+    for name in _CODECS:
+        codec = _create_codec(name)
+        if codec is None:
+            print(f"{name}: not installed")
+            continue
+        print(f"{name}:")
+        encoded = measure("encode", size, lambda: codec.dumps(document))
+        fragments: List[bytes] = measure(
+            "stream", size, lambda: list(result._encode(codec))
+        )
+        assert b"".join(fragments) == encoded  # nosec: benchmark sanity check
+        decoded = measure("decode", size, lambda: codec.loads(encoded))
+        assert decoded == document  # nosec: benchmark sanity check
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Measure the cost of looking up objects in a CollectResult by key.
+
+Creates a set of distinct objects, then calls 'result.object(...)' repeatedly for
+keys that already exist in the result, as adapters do when they look up an object
+to add data or relationships to it.
+
+Run from the 'lib/python' directory:
+    python -m benchmarks.object_lookup [--calls N] [--objects N] [--identifiers N]
+"""
+import argparse
+import time
+
+from aria.ops.object import Identifier
+from aria.ops.result import CollectResult
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--calls", type=int, default=1000000)
+    parser.add_argument("--objects", type=int, default=10000)
+    parser.add_argument("--identifiers", type=int, default=2)
+    args = parser.parse_args()
+
+    result = CollectResult()
+    names = [f"object-{i}" for i in range(args.objects)]
+    for name in names:
+        result.object("Adapter", "Object", name)
+
+    start = time.perf_counter()
+    for i in range(args.calls):
+        result.object("Adapter", "Object", names[i % args.objects])
+    report("name", args.calls, time.perf_counter() - start)
+
+    result = CollectResult()
+    identifiers = [
+        [Identifier(f"id-{j}", f"{name}-{j}") for j in range(args.identifiers)]
+        for name in names
+    ]
+    for name, ids in zip(names, identifiers):
+        result.object("Adapter", "Object", name, ids)
+
+    start = time.perf_counter()
+    for i in range(args.calls):
+        j = i % args.objects
+        result.object("Adapter", "Object", names[j], identifiers[j])
+    report("identifiers", args.calls, time.perf_counter() - start)
+
+
+def report(name: str, calls: int, elapsed: float) -> None:
+    print(
+        f"{name:<12} {calls} lookups in {elapsed:6.2f} s   "
+        f"{elapsed / calls * 1e6:6.2f} µs/lookup"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Measure the memory use and CPU time of metric-heavy collections.
+
+Adds metrics to a set of objects, then reads the latest value of every metric and
+serializes the result.
+
+Run from the 'lib/python' directory:
+    python -m benchmarks.object_metrics [--objects N] [--metrics N] [--points N]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from aria.ops.result import CollectResult
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--objects", type=int, default=5000)
+    parser.add_argument("--metrics", type=int, default=200)
+    parser.add_argument("--points", type=int, default=1)
+    args = parser.parse_args()
+
+    keys = [f"group|metric-{m}" for m in range(args.metrics)]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = CollectResult()
+    objects = [
+        result.object("Adapter", "Object", f"object-{i}") for i in range(args.objects)
+    ]
+    for p in range(args.points):
+        timestamp = 1700000000000 + p * 300000
+        for obj in objects:
+            for m, key in enumerate(keys):
+                obj.with_metric(key, m, timestamp)
+    add_time = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for obj in objects:
+        for key in keys:
+            obj.get_last_metric_value(key)
+    lookup_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    json.dumps(result.get_json())
+    serialize_time = time.perf_counter() - start
+
+    total = args.objects * args.metrics * args.points
+    print(f"{total} data points ({args.objects} objects x {args.metrics} metrics)")
+    print(f"add        {add_time:7.2f} s   (with tracemalloc)")
+    print(f"memory     {memory / 2**20:7.1f} MiB")
+    print(f"last value {lookup_time:7.2f} s")
+    print(f"serialize  {serialize_time:7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compare the payload size and serialization time of a collection with and
+without a PropertyCache.
+
+Simulates consecutive collections of an inventory where a small fraction of the
+property values change between collections, using:
+  * full:  every property is sent in every collection
+  * delta: only changed properties are sent (except for the full refresh)
+
+Run from the 'lib/python' directory:
+    python -m benchmarks.property_cache [--objects N] [--properties N] [--changed F]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Optional
+
+from aria.ops.property_cache import PropertyCache
+from aria.ops.result import CollectResult
+
+
+def build_result(
+    objects: int,
+    properties: int,
+    changed: float,
+    collection_number: int,
+    property_cache: Optional[PropertyCache],
+) -> CollectResult:
+    result = CollectResult(property_cache=property_cache)
+    generator = random.Random(collection_number)
+    for i in range(objects):
+        obj = result.object("Adapter", "Object", f"object-{i}")
+        obj.with_metric("cpu|usage", generator.random() * 100, 1700000000000)
+        for p in range(properties):
+            version = collection_number if generator.random() < changed else 0
+            obj.with_property(
+                f"config|property-{p}", f"value-{p}-{version}", 1700000000000
+            )
+    return result
+
+
+def collect(
+    name: str,
+    args: argparse.Namespace,
+    collection_number: int,
+    path: str,
+    property_cache: Optional[PropertyCache],
+) -> None:
+    result = build_result(
+        args.objects, args.properties, args.changed, collection_number, property_cache
+    )
+    start = time.perf_counter()
+    result.send_results(path)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<6} {os.path.getsize(path) / 2**20:8.1f} MiB   {elapsed:7.2f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--objects", type=int, default=20000)
+    parser.add_argument("--properties", type=int, default=20)
+    parser.add_argument("--changed", type=float, default=0.02)
+    parser.add_argument("--collections", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as dir:
+        path = os.path.join(dir, "output")
+        cache_path = os.path.join(dir, "properties.cache")
+        for collection_number in range(args.collections):
+            print(f"collection {collection_number}:")
+            collect("full", args, collection_number, path, None)
+            property_cache = PropertyCache(
+                cache_path, collection_number, args.collections
+            )
+            collect("delta", args, collection_number, path, property_cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compare the memory and lookup time of indexing Suite API resources by identifier.
+
+Decodes the pages of a resource query response and indexes the resources by an
+identifier, using:
+  * dict:  all pages combined into one list, converted to Objects with
+           'key_to_object', then a dict of Objects by identifier value, as the
+           extension samples do
+  * index: a ResourceIndex, built page by page
+
+Reports the peak memory while building, the memory retained by the result, and the
+time to look up every resource twice. The index creates the Object of a resource on
+its first lookup, so the first lookups are slower.
+
+Run from the 'lib/python' directory:
+    python -m benchmarks.resource_index [--resources N] [--page-size N]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import List
+
+from aria.ops.resource_index import ResourceIndex
+from aria.ops.suite_api_client import key_to_object
+
+from benchmarks.suite_api_server import resource
+
+
+def decoded_pages(pages: List[bytes]) -> Iterator[List[Any]]:
+    for page in pages:
+        yield json.loads(page)["resourceList"]
+
+
+def run(name: str, build: Callable[[], Any], lookup: Callable[[Any], int]) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = build()
+    build_time = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    lookup_times = []
+    for _ in range(2):
+        start = time.perf_counter()
+        found = lookup(index)
+        lookup_times.append(time.perf_counter() - start)
+    print(
+        f"{name:<6} build {build_time * 1000:8.1f} ms   peak {peak / 2**20:7.1f} MiB"
+        f"   retained {retained / 2**20:7.1f} MiB   lookups "
+        f"{lookup_times[0] * 1000:7.1f} ms, then {lookup_times[1] * 1000:7.1f} ms"
+        f" ({found} found)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--resources", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    pages = [
+        json.dumps(
+            {
+                "resourceList": [
+                    resource(i)
+                    for i in range(start, min(start + args.page_size, args.resources))
+                ]
+            }
+        ).encode("utf-8")
+        for start in range(0, args.resources, args.page_size)
+    ]
+    values = [str(i) for i in range(args.resources)]
+
+    def build_dict() -> dict:
+        resources = [resource for page in decoded_pages(pages) for resource in page]
+        objects = [key_to_object(resource["resourceKey"]) for resource in resources]
+        return {obj.get_identifier_value("id"): obj for obj in objects}
+
+    def build_index() -> ResourceIndex:
+        return ResourceIndex.from_resources(
+            (resource for page in decoded_pages(pages) for resource in page),
+            identifier_keys=["id"],
+        )
+
+    run(
+        "dict",
+        build_dict,
+        lambda objects: sum(1 for value in values if objects.get(value) is not None),
+    )
+    run(
+        "index",
+        build_index,
+        lambda index: sum(1 for value in values if index.get("id", value) is not None),
+    )
+
+
+if __name__ == "__main__":
+    main()
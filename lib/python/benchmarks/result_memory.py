@@ -0,0 +1,77 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Measure the memory used by a synthetic collect result with 1M metric data points.
+
+Builds a result where each object has an identifier, a few properties, and many
+metrics, and reports the memory allocated while building it, as measured by
+tracemalloc. Adapters often create 'Metric' instances before adding them to an
+object, so the size of the same number of 'Metric' instances is also reported.
+
+Run from the 'lib/python' directory:
+    python -m benchmarks.result_memory [--objects N] [--metrics N] [--limit MiB]
+
+If '--limit' is given, exits with a non-zero status when the result uses more memory
+than the limit, so that the benchmark can be used to catch regressions.
+"""
+import argparse
+import sys
+import tracemalloc
+from typing import Callable
+from typing import Tuple
+from typing import TypeVar
+
+from aria.ops.data import Metric
+from aria.ops.object import Identifier
+from aria.ops.result import CollectResult
+
+
+def build_result(objects: int, metrics: int) -> CollectResult:
+    result = CollectResult()
+    keys = [f"group|metric-{m}" for m in range(metrics)]
+    for i in range(objects):
+        obj = result.object(
+            "Adapter", "Object", f"object-{i}", [Identifier("id", str(i))]
+        )
+        obj.with_property("description", f"Object number {i}", 1700000000000)
+        obj.with_property("index", i, 1700000000000)
+        for m, key in enumerate(keys):
+            obj.with_metric(key, i + m, 1700000000000)
+    return result
+
+
+T = TypeVar("T")
+
+
+def traced(build: Callable[[], T]) -> Tuple[T, float, float]:
+    tracemalloc.start()
+    value = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, current / 2**20, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--objects", type=int, default=10000)
+    parser.add_argument("--metrics", type=int, default=100)
+    parser.add_argument("--limit", type=float, help="Maximum result size in MiB")
+    args = parser.parse_args()
+
+    total = args.objects * args.metrics
+    _, result_size, result_peak = traced(
+        lambda: build_result(args.objects, args.metrics)
+    )
+    _, metrics_size, _ = traced(
+        lambda: [Metric("group|metric", i, 1700000000000) for i in range(total)]
+    )
+
+    print(f"{args.objects} objects x {args.metrics} metrics ({total} data points)")
+    print(f"result           {result_size:8.1f} MiB   (peak {result_peak:.1f} MiB)")
+    print(f"Metric instances {metrics_size:8.1f} MiB")
+    if args.limit is not None and result_size > args.limit:
+        print(f"Result exceeds the limit of {args.limit} MiB")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
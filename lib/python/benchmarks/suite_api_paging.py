@@ -0,0 +1,89 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compare the latency of a paged Suite API query using different request strategies.
+
+Runs a resource query against a local stand-in HTTPS server using:
+  * connect:    a new connection for each page ('requests.post'), one page at a time
+  * pooled:     the SuiteApiClient's session, which keeps connections alive, one
+                page at a time
+  * concurrent: the SuiteApiClient's session, requesting pages concurrently
+
+Run from the 'lib/python' directory:
+    python -m benchmarks.suite_api_paging [--pages N] [--page-size N] [--latency S]
+        [--concurrency N]
+"""
+import argparse
+import statistics
+import time
+from typing import Callable
+from typing import List
+
+import requests
+from aria.ops.suite_api_client import SuiteApiClient
+from aria.ops.suite_api_client import SuiteApiConnectionParameters
+from benchmarks.suite_api_server import SuiteApiServer
+
+
+def run(query: Callable[[], dict], repeat: int, expected: int) -> List[float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = query()
+        times.append(time.perf_counter() - start)
+        assert len(result["resourceList"]) == expected  # nosec: benchmark sanity check
+    return times
+
+
+def report(name: str, times: List[float]) -> None:
+    print(
+        f"{name:<10} mean {statistics.mean(times) * 1000:8.1f} ms   "
+        f"min {min(times) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.002)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    resources = args.pages * args.page_size
+    with SuiteApiServer(resources=resources, latency=args.latency) as server:
+        with SuiteApiClient(
+            SuiteApiConnectionParameters(server.host, "user", "password")
+        ) as client:
+
+            def query(request_func: Callable, concurrency: int) -> dict:
+                client.page_concurrency = concurrency
+                return client._paged_request(
+                    request_func,
+                    "/api/resources/query",
+                    "resourceList",
+                    json={},
+                    pageSize=args.page_size,
+                )
+
+            report(
+                "connect",
+                run(lambda: query(requests.post, 1), args.repeat, resources),
+            )
+            report(
+                "pooled",
+                run(lambda: query(client.session.post, 1), args.repeat, resources),
+            )
+            report(
+                "concurrent",
+                run(
+                    lambda: query(client.session.post, args.concurrency),
+                    args.repeat,
+                    resources,
+                ),
+            )
+    print(f"{args.pages} pages of {args.page_size} resources")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compare paged Suite API queries against a server that rejects requests above a rate.
+
+Runs a resource query against a local stand-in HTTPS server that answers '429 Too
+Many Requests' above '--server-rate' queries per second, using a SuiteApiClient
+with:
+  * no-retry:   a RequestScheduler that does not retry, so rejected pages are lost
+  * retry:      the default RequestScheduler, which retries rejected pages with
+                jittered exponential backoff
+  * rate-limit: a RequestScheduler limited to the server's rate, so that requests
+                are not rejected
+
+Run from the 'lib/python' directory:
+    python -m benchmarks.suite_api_rate_limit [--pages N] [--server-rate R]
+        [--concurrency N]
+"""
+import argparse
+import time
+
+from aria.ops.request_scheduler import RequestScheduler
+from aria.ops.suite_api_client import SuiteApiClient
+from aria.ops.suite_api_client import SuiteApiConnectionParameters
+
+from benchmarks.suite_api_server import SuiteApiServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--server-rate", type=float, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    schedulers = {
+        "no-retry": RequestScheduler(max_retries=0),
+        "retry": RequestScheduler(max_retries=10, backoff=0.1),
+        "rate-limit": RequestScheduler(rate=args.server_rate),
+    }
+    for name, scheduler in schedulers.items():
+        with SuiteApiServer(
+            resources=args.pages * args.page_size,
+            latency=args.latency,
+            max_rate=args.server_rate,
+        ) as server:
+            with SuiteApiClient(
+                SuiteApiConnectionParameters(server.host, "user", "password"),
+                page_concurrency=args.concurrency,
+                scheduler=scheduler,
+            ) as client:
+                start = time.perf_counter()
+                result = client.paged_post(
+                    "/api/resources/query",
+                    "resourceList",
+                    json={},
+                    pageSize=args.page_size,
+                )
+                elapsed = time.perf_counter() - start
+            print(
+                f"{name:<10} {elapsed * 1000:8.1f} ms   "
+                f"{len(result['failedPages']):4d} failed pages   "
+                f"{server.rejected:4d} rejected requests"
+            )
+    print(f"{args.pages} pages, server limited to {args.server_rate} requests/s")
+
+
+if __name__ == "__main__":
+    main()
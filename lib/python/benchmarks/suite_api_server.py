@@ -0,0 +1,209 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""A local stand-in for the Suite API, used by the SuiteApiClient benchmarks.
+
+Serves token acquisition and release, and a paged resource query, over HTTPS with a
+self-signed certificate. An optional latency is added to each response to simulate
+a remote server, and queries above an optional rate are rejected with '429 Too Many
+Requests' to simulate a loaded server.
+"""
+import datetime
+import json
+import os
+import ssl
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from types import TracebackType
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Type
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+
+def resource(i: int) -> Dict[str, Any]:
+    return {
+        "identifier": f"00000000-0000-0000-0000-{i:012d}",
+        "resourceKey": {
+            "name": f"resource-{i}",
+            "adapterKindKey": "Adapter",
+            "resourceKindKey": "Resource",
+            "resourceIdentifiers": [
+                {
+                    "identifierType": {
+                        "name": "id",
+                        "dataType": "STRING",
+                        "isPartOfUniqueness": True,
+                    },
+                    "value": str(i),
+                }
+            ],
+        },
+    }
+
+
+class SuiteApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "SuiteApiServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def send_json(self, body: Dict[str, Any], status: int = 200) -> None:
+        data = json.dumps(body).encode("utf-8")
+        time.sleep(self.server.latency)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        self.handle_request()
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+        self.handle_request()
+
+    def handle_request(self) -> None:
+        with self.server.lock:
+            self.server.requests += 1
+        url = urlparse(self.path)
+        if url.path.endswith("/api/auth/token/acquire"):
+            self.send_json({"token": "token"})
+        elif url.path.endswith("/api/auth/token/release"):
+            self.send_json({})
+        elif url.path.endswith("/api/resources/query") or url.path.endswith(
+            "/api/resources"
+        ):
+            params = parse_qs(url.query)
+            page = int(params.get("page", ["0"])[0])
+            page_size = int(params.get("pageSize", ["1000"])[0])
+            if page in self.server.failing_pages:
+                self.send_json({"message": "error"}, 500)
+                return
+            if not self.server.admit():
+                self.send_json({"message": "too many requests"}, 429)
+                return
+            start = page * page_size
+            end = min(start + page_size, self.server.resources)
+            self.send_json(
+                {
+                    "pageInfo": {
+                        "totalCount": self.server.resources,
+                        "page": page,
+                        "pageSize": page_size,
+                    },
+                    "resourceList": [resource(i) for i in range(start, end)],
+                }
+            )
+        else:
+            self.send_json({"message": "not found"}, 404)
+
+
+class SuiteApiServer(ThreadingHTTPServer):
+    """Runs the stand-in server in a background thread while used as a context
+    manager"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        resources: int = 1000,
+        latency: float = 0,
+        tls: bool = True,
+        failing_pages: Optional[List[int]] = None,
+        max_rate: Optional[float] = None,
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), SuiteApiHandler)
+        self.resources = resources
+        self.latency = latency
+        self.failing_pages = set(failing_pages or [])
+        self.requests = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+        # Token bucket of queries, holding up to a tenth of a second of queries
+        self.max_rate = max_rate
+        self.tokens = max(1.0, (max_rate or 0) / 10)
+        self.updated = time.monotonic()
+        if tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            with tempfile.TemporaryDirectory() as dir:
+                certificate, key = write_self_signed_certificate(dir)
+                context.load_cert_chain(certificate, key)
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+        scheme = "https" if tls else "http"
+        self.host = f"{scheme}://127.0.0.1:{self.server_address[1]}"
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def admit(self) -> bool:
+        if self.max_rate is None:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                max(1.0, self.max_rate / 10),
+                self.tokens + (now - self.updated) * self.max_rate,
+            )
+            self.updated = now
+            if self.tokens < 1:
+                self.rejected += 1
+                return False
+            self.tokens -= 1
+            return True
+
+    def __enter__(self) -> "SuiteApiServer":
+        self.thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exception_type: Optional[Type[BaseException]],
+        exception_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def write_self_signed_certificate(dir: str) -> "tuple[str, str]":
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    certificate_path = os.path.join(dir, "certificate.pem")
+    key_path = os.path.join(dir, "key.pem")
+    with open(certificate_path, "wb") as f:
+        f.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+    return certificate_path, key_path
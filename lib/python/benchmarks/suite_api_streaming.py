@@ -0,0 +1,88 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""Compare the time and peak memory of enumerating every resource of a large query.
+
+Runs a resource query against a local stand-in HTTPS server, and converts each
+resource to an Object using:
+  * list:     'paged_post', which combines all pages into one list
+  * streamed: 'iter_paged_post', which yields the resources page by page
+  * prefetch: 'iter_paged_post', requesting the next page while the current page is
+              processed
+
+The time and the peak memory are measured in separate runs, as tracing memory
+allocations slows the run down.
+
+Run from the 'lib/python' directory:
+    python -m benchmarks.suite_api_streaming [--pages N] [--page-size N]
+        [--latency S]
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Any
+from typing import Callable
+from typing import Iterable
+
+from aria.ops.suite_api_client import key_to_object
+from aria.ops.suite_api_client import SuiteApiClient
+from aria.ops.suite_api_client import SuiteApiConnectionParameters
+from benchmarks.suite_api_server import SuiteApiServer
+
+
+def count_objects(resources: Iterable[Any]) -> int:
+    return sum(1 for resource in resources if key_to_object(resource["resourceKey"]))
+
+
+def run(name: str, query: Callable[[], Iterable[Any]], expected: int) -> None:
+    start = time.perf_counter()
+    count = count_objects(query())
+    elapsed = time.perf_counter() - start
+    assert count == expected  # nosec: benchmark sanity check
+
+    tracemalloc.start()
+    count_objects(query())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<10} {elapsed * 1000:8.1f} ms   peak {peak / 2**20:8.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    resources = args.pages * args.page_size
+    with SuiteApiServer(resources=resources, latency=args.latency) as server:
+        with SuiteApiClient(
+            SuiteApiConnectionParameters(server.host, "user", "password")
+        ) as client:
+            url = "/api/resources/query"
+            key = "resourceList"
+            run(
+                "list",
+                lambda: client.paged_post(url, key, json={}, pageSize=args.page_size)[
+                    key
+                ],
+                resources,
+            )
+            run(
+                "streamed",
+                lambda: client.iter_paged_post(
+                    url, key, prefetch=False, json={}, pageSize=args.page_size
+                ),
+                resources,
+            )
+            run(
+                "prefetch",
+                lambda: client.iter_paged_post(
+                    url, key, json={}, pageSize=args.page_size
+                ),
+                resources,
+            )
+    print(f"{args.pages} pages of {args.page_size} resources")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,20 @@ from __future__ import annotations
 import sys
 from typing import Dict
 from typing import Optional
+from typing import TYPE_CHECKING
 
 from aria.ops.certificate_info import CertificateInfo
 from aria.ops.object import Identifier
 from aria.ops.object import Key
 from aria.ops.object import Object
 from aria.ops.pipe_utils import read_from_pipe
+from aria.ops.state import StateStore
 from aria.ops.suite_api_client import SuiteApiClient
 from aria.ops.suite_api_client import SuiteApiConnectionParameters
 
+if TYPE_CHECKING:
+    from aria.ops.async_suite_api_client import AsyncSuiteApiClient
+
 
 class AdapterInstance(Object):  # type: ignore
     def __init__(self, json: dict) -> None:
@@ -47,7 +52,7 @@ class AdapterInstance(Object):  # type: ignore
 
         cluster_connection_info = json.get("cluster_connection_info")
         if type(cluster_connection_info) is dict:
-            self.suite_api_client = SuiteApiClient(
+            self.suite_api_client: Optional[SuiteApiClient] = SuiteApiClient(
                 SuiteApiConnectionParameters(
                     username=cluster_connection_info.get("user_name"),
                     password=cluster_connection_info.get("password"),
@@ -67,6 +72,29 @@ class AdapterInstance(Object):  # type: ignore
 
         self.collection_number: Optional[int] = json.get("collection_number", None)
         self.collection_window: Optional[Dict] = json.get("collection_window", None)
+        self._state: Optional[StateStore] = None
+
+    @property
+    def state(self) -> StateStore:
+        """
+        Gets a persistent key-value store for data that this adapter instance needs
+        to remember between collections, e.g., a cursor or the time of the last
+        collected event. Values must be JSON-serializable.
+
+        Changes are committed when the CollectResult of the collection is sent
+        without an error, so a failed collection leaves the state of the last
+        successful collection in place. For example, to collect incrementally:
+
+            last_event_time = adapter_instance.state.get("last_event_time", 0)
+            # ... collect events newer than 'last_event_time' ...
+            adapter_instance.state["last_event_time"] = newest_event_time
+
+        Returns:
+            The StateStore of this adapter instance
+        """
+        if self._state is None:
+            self._state = StateStore.for_adapter_instance(self.get_key())
+        return self._state
 
     def get_suite_api_client(self) -> Optional[SuiteApiClient]:
         """
@@ -79,6 +107,27 @@ class AdapterInstance(Object):  # type: ignore
         """
         return self.suite_api_client
 
+    def get_async_suite_api_client(self) -> Optional[AsyncSuiteApiClient]:
+        """
+        Gets an asyncio Suite API Client, with the same connection parameters,
+        caches and request scheduler as the client returned by
+        'get_suite_api_client'. Returns 'None' when called from
+        'test' and 'get_endpoints'. Requires the 'httpx' package.
+
+        Returns:
+            AsyncSuiteApiClient, or None
+        """
+        if self.suite_api_client is None:
+            return None
+        from aria.ops.async_suite_api_client import AsyncSuiteApiClient
+
+        return AsyncSuiteApiClient(
+            self.suite_api_client.credential,
+            token_cache=self.suite_api_client.token_cache,
+            response_cache=self.suite_api_client.response_cache,
+            scheduler=self.suite_api_client.scheduler,
+        )
+
     def get_certificates(self) -> list[CertificateInfo]:
         """
         Gets a list of all certificates that have been validated by a CA or manually
@@ -140,6 +189,10 @@ class AdapterInstance(Object):  # type: ignore
         return self.credentials.get(credential_key)
 
     @classmethod
-    def from_input(cls, infile: str = sys.argv[-2]) -> AdapterInstance:
-        # The server always invokes methods with the input file as the second to last argument
+    def from_input(cls, infile: Optional[str] = None) -> AdapterInstance:
+        # The server always invokes methods with the input file as the second to last
+        # argument. This is resolved when called rather than when defined, so that
+        # adapter processes that are reused for multiple requests read the right pipe.
+        if infile is None:
+            infile = sys.argv[-2]
         return cls(read_from_pipe(infile))
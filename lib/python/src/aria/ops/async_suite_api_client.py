@@ -0,0 +1,665 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import asyncio
+import logging
+from types import TracebackType
+from typing import Any
+from typing import AsyncIterator
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+
+import httpx
+from aria.ops.object import Object
+from aria.ops.request_scheduler import RequestScheduler
+from aria.ops.resource_index import ResourceIndex
+from aria.ops.response_cache import ResponseCache
+from aria.ops.suite_api_client import BaseSuiteApiClient
+from aria.ops.suite_api_client import DEFAULT_PAGE_CONCURRENCY
+from aria.ops.suite_api_client import DEFAULT_POOL_SIZE
+from aria.ops.suite_api_client import key_to_object
+from aria.ops.suite_api_client import SuiteApiConnectionParameters
+from aria.ops.token_cache import TokenCache
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSuiteApiClient(BaseSuiteApiClient):
+    """Class for simplifying calls to the SuiteAPI from asyncio code
+
+    Provides the same methods as :class:`SuiteApiClient`, as coroutines, using the
+    'httpx' package. Requests from different tasks are sent concurrently, so an
+    adapter can overlap Suite API calls with calls to its target. Requires the
+    'httpx' package, which is installed with the 'async' extra of this library.
+
+    This class is intended to be used in an async with statement:
+    async with AsyncSuiteApiClient(connection_params) as suite_api_client:
+        # Code using suite_api_client goes here
+        ...
+    """
+
+    def __init__(
+        self,
+        connection_params: SuiteApiConnectionParameters,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        page_concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+        timeout: Optional[float] = None,
+        token_cache: Optional[TokenCache] = None,
+        response_cache: Optional[ResponseCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        """Initializes an asynchronous SuiteAPI client.
+
+        Args:
+             connection_params (SuiteApiConnectionParameters): Connection parameters for the Suite API.
+             pool_size (int): The maximum number of concurrent connections to the
+                Suite API. Defaults to 10.
+             page_concurrency (int): The maximum number of pages of a paged request
+                that are fetched at the same time. Defaults to 4.
+             timeout (Optional[float]): Timeout in seconds for each request. Defaults
+                to None, no timeout.
+             token_cache (Optional[TokenCache]): A cache to reuse tokens from. See
+                :class:`SuiteApiClient`. Defaults to None.
+             response_cache (Optional[ResponseCache]): A cache for the responses of
+                the 'cached_' methods. Defaults to None, responses are not cached.
+             scheduler (Optional[RequestScheduler]): Schedules and retries the
+                requests of the client. See :class:`SuiteApiClient`. The
+                'max_in_flight' limit of the scheduler applies to the requests of
+                this client. Defaults to None.
+        """
+        super().__init__(
+            connection_params,
+            page_concurrency,
+            token_cache,
+            response_cache,
+            scheduler,
+        )
+        # Created on first use, as they must be created in the event loop
+        self._token_lock: Optional[asyncio.Lock] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self.client = httpx.AsyncClient(
+            verify=False,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+        )
+
+    async def __aenter__(self) -> AsyncSuiteApiClient:
+        """Acquire a token upon entering the 'async with' context
+
+        Returns:
+            AsyncSuiteApiClient: The current instance of the class.
+        """
+        self.token = await self.get_token()
+        return self
+
+    async def __aexit__(
+        self,
+        exception_type: Optional[Type[BaseException]],
+        exception_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Release the token and close all connections upon exiting the 'async with'
+        context. If the client has a token cache, the token is kept for reuse
+        instead of released.
+
+        Args:
+            exception_type (Optional[Type[BaseException]]): Unused
+            exception_value (Optional[BaseException]): Unused
+            traceback (Optional[TracebackType]): Unused
+        """
+        try:
+            if self.token_cache is None:
+                await self.release_token()
+            else:
+                self.token = ""
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Close all connections to the Suite API"""
+        await self.client.aclose()
+
+    async def get_token(self) -> str:
+        """Get the authentication token
+
+        Gets the current authentication token. If no current token exists, acquires an authentication token first,
+        or reuses a token from the token cache.
+
+        Returns:
+             The authentication token
+        """
+        if self.token == "":
+            self.token = self._cached_token()
+        if self.token == "":
+            token_response = await self.post(
+                "/api/auth/token/acquire", json=self._token_request()
+            )
+            if token_response.is_success:
+                token_response_body = token_response.json()
+                self.token = token_response_body["token"]
+                logger.debug("Acquired token " + self.token)
+                self._cache_token(token_response_body)
+            else:
+                logger.warning(f"Could not acquire SuiteAPI token: {token_response}")
+
+        return self.token
+
+    async def release_token(self) -> None:
+        """Release the authentication token, if it exists, and remove it from the
+        token cache"""
+
+        if self.token != "":
+            self._uncache_token()
+            await self.post("auth/token/release")
+            self.token = ""
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a GET request to the SuiteAPI
+
+        Args:
+            url (str): URL to send GET request to
+            kwargs (Any): Additional keyword arguments to pass to 'httpx.AsyncClient.request'
+
+        Returns:
+            The API response
+        """
+        return await self._request_wrapper("GET", url, **kwargs)
+
+    async def paged_get(self, url: str, key: str, **kwargs: Any) -> dict:
+        """Send a GET request to the SuiteAPI that gets a paged response
+
+        Args:
+            url (str): URL to send GET request to
+            key (str): Json key that contains the paged data
+            kwargs (Any): Additional keyword arguments to pass to 'httpx.AsyncClient.request'
+
+        Returns:
+             The API response
+        """
+        return await self._paged_request("GET", url, key, **kwargs)
+
+    async def cached_get(self, url: str, ttl: float, **kwargs: Any) -> Optional[Any]:
+        """Send a GET request to the SuiteAPI, or get its response from the response
+        cache. See :meth:`SuiteApiClient.cached_get`.
+
+        Args:
+            url (str): URL to send GET request to
+            ttl (float): The number of seconds to cache the response for
+            kwargs (Any): Additional keyword arguments to pass to 'httpx.AsyncClient.request'
+
+        Returns:
+            The decoded json of the API response, or None if the request failed
+        """
+        cache_key = self._response_cache_key("GET", url, **kwargs)
+        cached_response = self._cached_response(cache_key)
+        if cached_response is not None:
+            return cached_response
+        response = await self.get(url, **kwargs)
+        if not response.is_success:
+            # _request_wrapper will log the error
+            return None
+        body = response.json()
+        self._cache_response(cache_key, body, ttl)
+        return body
+
+    async def cached_paged_get(
+        self, url: str, key: str, ttl: float, **kwargs: Any
+    ) -> dict:
+        """Send a GET request to the SuiteAPI that gets a paged response, or get the
+        combined response from the response cache. See
+        :meth:`SuiteApiClient.cached_paged_get`.
+
+        Args:
+            url (str): URL to send GET request to
+            key (str): Json key that contains the paged data
+            ttl (float): The number of seconds to cache the response for
+            kwargs (Any): Additional keyword arguments to pass to 'httpx.AsyncClient.request'
+
+        Returns:
+             The API response
+        """
+        cache_key = self._response_cache_key("GET", url, key=key, **kwargs)
+        cached_response = self._cached_response(cache_key)
+        if cached_response is not None:
+            return cached_response  # type: ignore[no-any-return]
+        result = await self.paged_get(url, key, **kwargs)
+        if not result["failedPages"]:
+            self._cache_response(cache_key, result, ttl)
+        return result
+
+    def iter_paged_get(
+        self, url: str, key: str, prefetch: bool = True, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        """Send a GET request to the SuiteAPI that gets a paged response, and iterate
+        over the paged data one page at a time. See 'iter_paged_post'.
+
+        Args:
+            url (str): URL to send GET request to
+            key (str): Json key that contains the paged data
+            prefetch (bool): Request the next page while the items of the current
+                page are processed. Defaults to True.
+            kwargs (Any): Additional keyword arguments to pass to 'httpx.AsyncClient.request'
+
+        Returns:
+             An asynchronous iterator over the items of the paged data
+        """
+        return self._iter_paged_request("GET", url, key, prefetch, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a POST request to the SuiteAPI
+
+        Args:
+            url (str): URL to send POST request to
+            kwargs (Any): Additional keyword arguments to pass to 'httpx.AsyncClient.request'
+
+        Returns:
+             The API response
+        """
+        kwargs.setdefault("headers", {})
+        kwargs["headers"].setdefault("Content-Type", "application/json")
+        return await self._request_wrapper("POST", url, **kwargs)
+
+    async def paged_post(self, url: str, key: str, **kwargs: Any) -> dict:
+        """Send a POST request to the SuiteAPI that gets a paged response.
+
+        Args:
+            url (str): URL to send POST request to
+            key (str): Json key that contains the paged data
+            kwargs (Any): Additional keyword arguments to pass to 'httpx.AsyncClient.request'
+
+        Returns:
+             The API response
+        """
+        kwargs.setdefault("headers", {})
+        kwargs["headers"].setdefault("Content-Type", "application/json")
+        return await self._paged_request("POST", url, key, **kwargs)
+
+    async def cached_paged_post(
+        self, url: str, key: str, ttl: float, **kwargs: Any
+    ) -> dict:
+        """Send a POST request to the SuiteAPI that gets a paged response, e.g., a
+        query, or get the combined response from the response cache. See
+        :meth:`SuiteApiClient.cached_paged_post`.
+
+        Args:
+            url (str): URL to send POST request to
+            key (str): Json key that contains the paged data
+            ttl (float): The number of seconds to cache the response for
+            kwargs (Any): Additional keyword arguments to pass to 'httpx.AsyncClient.request'
+
+        Returns:
+             The API response
+        """
+        cache_key = self._response_cache_key("POST", url, key=key, **kwargs)
+        cached_response = self._cached_response(cache_key)
+        if cached_response is not None:
+            return cached_response  # type: ignore[no-any-return]
+        result = await self.paged_post(url, key, **kwargs)
+        if not result["failedPages"]:
+            self._cache_response(cache_key, result, ttl)
+        return result
+
+    def iter_paged_post(
+        self, url: str, key: str, prefetch: bool = True, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        """Send a POST request to the SuiteAPI that gets a paged response, and iterate
+        over the paged data one page at a time. See
+        :meth:`SuiteApiClient.iter_paged_post`.
+
+        This is used in an 'async for' statement:
+        async for resource in suite_api_client.iter_paged_post(url, key, json=query):
+            ...
+
+        Args:
+            url (str): URL to send POST request to
+            key (str): Json key that contains the paged data
+            prefetch (bool): Request the next page while the items of the current
+                page are processed. Defaults to True.
+            kwargs (Any): Additional keyword arguments to pass to 'httpx.AsyncClient.request'
+
+        Returns:
+             An asynchronous iterator over the items of the paged data
+        """
+        kwargs.setdefault("headers", {})
+        kwargs["headers"].setdefault("Content-Type", "application/json")
+        return self._iter_paged_request("POST", url, key, prefetch, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a PUT request to the SuiteAPI
+
+        Args:
+            url (str): URL to send PUT request to
+            kwargs (Any): Additional keyword arguments to pass to 'httpx.AsyncClient.request'
+
+        Returns:
+             The API response
+        """
+        return await self._request_wrapper("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a PATCH request to the SuiteAPI
+
+        Args:
+            url (str): URL to send PATCH request to
+            kwargs (Any): Additional keyword arguments to pass to 'httpx.AsyncClient.request'
+
+        Returns:
+            The API response
+        """
+        return await self._request_wrapper("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a DELETE request to the SuiteAPI
+
+        Args:
+            url (str): URL to send DELETE request to
+            kwargs (Any): Additional keyword arguments to pass to 'httpx.AsyncClient.request'
+
+        Returns:
+             The API response
+        """
+        return await self._request_wrapper("DELETE", url, **kwargs)
+
+    # Implementations for common endpoints:
+
+    async def query_for_resources(
+        self, query: Dict[str, Any], cache_ttl: Optional[float] = None
+    ) -> list[Object]:
+        """Query for resources using the Suite API, and convert the
+        responses to SDK Objects.
+
+        If the query contains multiple names, the query for each name is sent
+        concurrently. See :meth:`SuiteApiClient.query_for_resources`.
+
+        Args:
+            query (Dict[str, Any]): json of the resourceQuery, as defined in the SuiteAPI docs:
+                https://[[aria-ops-hostname]]/suite-api/doc/swagger-ui.html#/Resources/getMatchingResourcesUsingPOST
+            cache_ttl (Optional[float]): The number of seconds to cache the query
+                results for in the response cache. Defaults to None, the results are
+                not cached.
+
+        Returns:
+             list of sdk Objects representing each of the returned objects.
+        """
+        try:
+            responses = await asyncio.gather(
+                *(
+                    (
+                        self.paged_post(
+                            "/api/resources/query", "resourceList", json=resource_query
+                        )
+                        if cache_ttl is None
+                        else self.cached_paged_post(
+                            "/api/resources/query",
+                            "resourceList",
+                            cache_ttl,
+                            json=resource_query,
+                        )
+                    )
+                    for resource_query in self._resource_queries(query)
+                )
+            )
+            return [
+                key_to_object(obj["resourceKey"])
+                for response in responses
+                for obj in response.get("resourceList", [])
+            ]
+        except Exception as e:
+            logger.error(e)
+            logger.exception(e)
+            return []
+
+    async def iter_resources(
+        self, query: Dict[str, Any], prefetch: bool = True
+    ) -> AsyncIterator[Object]:
+        """Query for resources using the Suite API, and convert the responses to
+        SDK Objects one page at a time. See :meth:`SuiteApiClient.iter_resources`.
+
+        Unlike 'query_for_resources', the queries for multiple names are sent one
+        after the other.
+
+        Args:
+            query (Dict[str, Any]): json of the resourceQuery, as defined in the SuiteAPI docs:
+                https://[[aria-ops-hostname]]/suite-api/doc/swagger-ui.html#/Resources/getMatchingResourcesUsingPOST
+            prefetch (bool): Request the next page while the current page is
+                processed. Defaults to True.
+
+        Returns:
+             asynchronous iterator of sdk Objects representing each of the returned objects.
+        """
+        try:
+            for resource_query in self._resource_queries(query):
+                async for obj in self.iter_paged_post(
+                    "/api/resources/query",
+                    "resourceList",
+                    prefetch,
+                    json=resource_query,
+                ):
+                    yield key_to_object(obj["resourceKey"])
+        except Exception as e:
+            logger.error(e)
+            logger.exception(e)
+
+    async def index_resources(
+        self,
+        query: Dict[str, Any],
+        identifier_keys: Iterable[str] = (),
+        prefetch: bool = True,
+    ) -> ResourceIndex:
+        """Query for resources using the Suite API, and index them for looking up by
+        identifier, name and resource kind. See
+        :meth:`SuiteApiClient.index_resources`.
+
+        Args:
+            query (Dict[str, Any]): json of the resourceQuery, as defined in the SuiteAPI docs:
+                https://[[aria-ops-hostname]]/suite-api/doc/swagger-ui.html#/Resources/getMatchingResourcesUsingPOST
+            identifier_keys (Iterable[str]): The keys of the identifiers that
+                resources can be looked up by. Defaults to none.
+            prefetch (bool): Request the next page while the current page is
+                indexed. Defaults to True.
+
+        Returns:
+             The index of the returned resources.
+        """
+        index = ResourceIndex(identifier_keys)
+        try:
+            for resource_query in self._resource_queries(query):
+                async for resource in self.iter_paged_post(
+                    "/api/resources/query",
+                    "resourceList",
+                    prefetch,
+                    json=resource_query,
+                ):
+                    index.add_resource(resource)
+            return index
+        except Exception as e:
+            logger.error(e)
+            logger.exception(e)
+            return ResourceIndex(index.identifier_keys)
+
+    async def _paged_request(
+        self, method: str, url: str, key: str, **kwargs: Any
+    ) -> dict:
+        """Send a request to the SuiteAPI that returns a paged response. See
+        :meth:`SuiteApiClient._paged_request`.
+
+        Args:
+            method (str): HTTP method of the request
+            url(str): URL to send request to
+            key (str): Json key that contains the paged data
+            kwargs (Any): Additional keyword arguments to pass to request
+
+        Returns:
+             The API response
+        """
+        kwargs = self._add_paging(**kwargs)
+        page_0_body = await self._get_page(method, url, 0, **kwargs)
+        if page_0_body is None:
+            return {key: [], "failedPages": [0]}
+        remaining_pages = range(1, self._page_count(page_0_body, **kwargs))
+        semaphore = asyncio.Semaphore(self.page_concurrency)
+
+        async def get_page(page: int) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self._get_page(method, url, page, **kwargs)
+
+        # 'gather' returns the pages in order
+        page_bodies = await asyncio.gather(*map(get_page, remaining_pages))
+        objects = page_0_body.get(key, [])
+        failed_pages: List[int] = []
+        for page, page_n_body in zip(remaining_pages, page_bodies):
+            if page_n_body is None:
+                failed_pages.append(page)
+            else:
+                objects.extend(page_n_body.get(key, []))
+        self._log_failed_pages(url, failed_pages, len(remaining_pages) + 1)
+        return {key: objects, "failedPages": failed_pages}
+
+    async def _iter_paged_request(
+        self, method: str, url: str, key: str, prefetch: bool, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        failed_pages = []
+        pages = 0
+        async for page, page_body in self._iter_pages(method, url, prefetch, **kwargs):
+            pages += 1
+            if page_body is None:
+                failed_pages.append(page)
+            else:
+                for item in page_body.get(key, []):
+                    yield item
+        self._log_failed_pages(url, failed_pages, pages)
+
+    async def _iter_pages(
+        self, method: str, url: str, prefetch: bool, **kwargs: Any
+    ) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]]]]:
+        kwargs = self._add_paging(**kwargs)
+        page_body = await self._get_page(method, url, 0, **kwargs)
+        pages = 1 if page_body is None else self._page_count(page_body, **kwargs)
+        next_page: Optional[asyncio.Task] = None
+        try:
+            for page in range(pages):
+                last_page = page + 1 == pages
+                if prefetch and not last_page:
+                    next_page = asyncio.ensure_future(
+                        self._get_page(method, url, page + 1, **kwargs)
+                    )
+                yield page, page_body
+                if not last_page:
+                    page_body = await (
+                        next_page
+                        if next_page is not None
+                        else self._get_page(method, url, page + 1, **kwargs)
+                    )
+        finally:
+            # The iteration was stopped before the prefetched page was used
+            if next_page is not None:
+                next_page.cancel()
+
+    async def _get_page(
+        self, method: str, url: str, page: int, **kwargs: Any
+    ) -> Optional[Dict[str, Any]]:
+        kwargs = self._page_request(page, **kwargs)
+        try:
+            response = await self._request_wrapper(
+                method, url, idempotent=True, **kwargs
+            )
+            if response.status_code < 300:
+                return response.json()  # type: ignore[no-any-return]
+            # _request_wrapper will log the error
+            return None
+        except (httpx.HTTPError, ValueError) as e:
+            if page == 0:
+                raise
+            logger.warning(f"Could not retrieve page {page} of {url}: {e}")
+            return None
+
+    async def _renew_token(self, rejected_token: str) -> bool:
+        # Pages may be requested concurrently, so only the first request that is
+        # rejected acquires a new token
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        async with self._token_lock:
+            if self.token == rejected_token:
+                logger.info("Cached token was rejected, acquiring a new token")
+                self._uncache_token()
+                self.token = ""
+                await self.get_token()
+        return self.token not in ("", rejected_token)
+
+    async def _request_wrapper(
+        self,
+        method: str,
+        url: str,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        kwargs = self._to_vrops_request(url, **kwargs)
+        # Certificate verification is configured on the client
+        kwargs.pop("verify", None)
+        token = self.token
+        result = await self._send(method, idempotent, **kwargs)
+        if self._should_renew_token(
+            result.status_code, kwargs["url"], token
+        ) and await self._renew_token(token):
+            # Send the request again with the new token
+            kwargs = self._to_vrops_request(**kwargs)
+            kwargs.pop("verify", None)
+            result = await self._send(method, idempotent, **kwargs)
+        if result.is_success:
+            logger.info(f"{method} {kwargs['url']}: OK({result.status_code})")
+        else:
+            logger.warning(f"{method} {kwargs['url']}: ERROR({result.status_code})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(result.text)
+        return result
+
+    async def _send(
+        self, method: str, idempotent: Optional[bool], **kwargs: Any
+    ) -> httpx.Response:
+        retries = 0
+        while True:
+            try:
+                result = await self._schedule(method, **kwargs)
+            except httpx.TransportError as e:
+                delay = self.scheduler.retry_delay(
+                    method, retries, None, idempotent=idempotent
+                )
+                if delay is None:
+                    raise
+                logger.warning(
+                    f"{method} {kwargs['url']}: {e}. Retrying in {delay:.1f} s"
+                )
+            else:
+                delay = self.scheduler.retry_delay(
+                    method,
+                    retries,
+                    result.status_code,
+                    result.headers.get("Retry-After"),
+                    idempotent,
+                )
+                if delay is None:
+                    return result
+                logger.warning(
+                    f"{method} {kwargs['url']}: ERROR({result.status_code}). Retrying "
+                    f"in {delay:.1f} s"
+                )
+            retries += 1
+            await asyncio.sleep(delay)
+
+    async def _schedule(self, method: str, **kwargs: Any) -> httpx.Response:
+        # As in 'SuiteApiClient', the rate limit is waited for before taking an
+        # in-flight slot
+        await asyncio.sleep(self.scheduler.delay())
+        if self.scheduler.max_in_flight is None:
+            return await self.client.request(method, **kwargs)
+        if self._in_flight is None:
+            self._in_flight = asyncio.Semaphore(self.scheduler.max_in_flight)
+        async with self._in_flight:
+            return await self.client.request(method, **kwargs)
@@ -3,7 +3,14 @@
 from __future__ import annotations
 
 import time
+from array import array
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Set
 from typing import Union
 
 
@@ -19,6 +26,8 @@ class Metric:
         Cumulative Data Received
     """
 
+    __slots__ = ("key", "value", "timestamp")
+
     def __init__(self, key: str, value: float, timestamp: Optional[int] = None):
         """
         Creates a Metric.
@@ -53,6 +62,199 @@ class Metric:
         }
 
 
+class MetricStore:
+    """Columnar storage for the Metric data points of an Object.
+
+    Values and timestamps are stored in typed arrays, in the order they were added,
+    rather than as one :class:`Metric` instance per data point. Adding data points
+    only appends to the arrays. The first lookup by key builds an index from each
+    metric key to the positions of its data points, and later lookups take constant
+    time. Data points are usually added in chronological order, so they rarely have
+    to be sorted.
+    """
+
+    __slots__ = ("_keys", "_values", "_timestamps", "_index", "_unordered")
+
+    def __init__(self) -> None:
+        self._keys: List[str] = []
+        self._values = array("d")
+        self._timestamps = array("q")
+        # The position of the data point for keys with a single data point, or an
+        # array of positions for keys with more than one. Built on the first lookup.
+        self._index: Optional[Dict[str, Union[int, array]]] = None
+        # Keys with data points that were not added in chronological order
+        self._unordered: Set[str] = set()
+
+    def add(self, key: str, value: float, timestamp: Optional[int] = None) -> None:
+        """Adds a data point.
+
+        Args:
+            key (str): A string representing the type of metric.
+            value (float): The value of the Metric.
+            timestamp (Optional[int], optional): Time in milliseconds since the Epoch when this metric
+                                                 value was recorded. Defaults to the current time.
+        """
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        position = len(self._keys)
+        self._values.append(float(value))
+        self._timestamps.append(int(timestamp))
+        self._keys.append(key)
+        if self._index is not None:
+            self._index_position(self._index, key, position, timestamp)
+
+    def _index_position(
+        self,
+        index: Dict[str, Union[int, array]],
+        key: str,
+        position: int,
+        timestamp: int,
+    ) -> None:
+        positions = index.get(key)
+        if positions is None:
+            index[key] = position
+            return
+        if isinstance(positions, int):
+            positions = index[key] = array("q", (positions,))
+        if timestamp < self._timestamps[positions[-1]]:
+            self._unordered.add(key)
+        positions.append(position)
+
+    def add_many(
+        self,
+        keys: Sequence[str],
+        values: Sequence[float],
+        timestamp: Optional[int] = None,
+    ) -> None:
+        """Adds one data point for each key, all with the same timestamp.
+
+        Args:
+            keys (Sequence[str]): The metric keys.
+            values (Sequence[float]): The value for each key, in the same order as
+                'keys'. Can be any sequence of numbers, including an array or a NumPy
+                array.
+            timestamp (Optional[int], optional): Time in milliseconds since the Epoch when these metric
+                                                 values were recorded. Defaults to the current time.
+
+        Raises:
+            ValueError: If the number of values does not match the number of keys.
+        """
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        start = len(self._keys)
+        view = None if isinstance(values, (list, tuple)) else _double_buffer(values)
+        if view is not None:
+            # Arrays of doubles (including NumPy float64 arrays) are copied directly
+            self._values.frombytes(view)
+        else:
+            try:
+                self._values.extend(values)
+            except TypeError:
+                # Values that aren't numbers, e.g., numeric strings
+                del self._values[start:]
+                self._values.extend(map(float, values))
+        count = len(self._values) - start
+        if count != len(keys):
+            del self._values[start:]
+            raise ValueError(f"Expected {len(keys)} metric values, got {count}")
+        self._timestamps.extend(array("q", (int(timestamp),)) * count)
+        self._keys.extend(keys)
+        if self._index is not None:
+            for position, key in enumerate(keys, start):
+                self._index_position(self._index, key, position, timestamp)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[Metric]:
+        for key, value, timestamp in zip(self._keys, self._values, self._timestamps):
+            yield Metric(key, value, timestamp)
+
+    def _positions(self, key: str) -> Sequence[int]:
+        if self._index is None:
+            self._index = {}
+            for position, (k, timestamp) in enumerate(
+                zip(self._keys, self._timestamps)
+            ):
+                self._index_position(self._index, k, position, timestamp)
+        positions = self._index.get(key)
+        if positions is None:
+            return ()
+        if isinstance(positions, int):
+            return (positions,)
+        return positions
+
+    def _chronological_positions(self, key: str) -> Sequence[int]:
+        positions = self._positions(key)
+        if key in self._unordered:
+            # 'sorted' is stable, so data points with the same timestamp are kept in
+            # the order they were added
+            return sorted(positions, key=self._timestamps.__getitem__)
+        return positions
+
+    def get(self, key: str) -> List[Metric]:
+        """
+        Args:
+            key (str): Metric key of the data points to return.
+
+        Returns:
+            All data points with the given key, in the order they were added.
+        """
+        return [
+            Metric(key, self._values[i], self._timestamps[i])
+            for i in self._positions(key)
+        ]
+
+    def values(self, key: str) -> List[float]:
+        """
+        Args:
+            key (str): Metric key of the data points to return.
+
+        Returns:
+            The values of all data points with the given key, in chronological order.
+        """
+        return [self._values[i] for i in self._chronological_positions(key)]
+
+    def last_value(self, key: str) -> Optional[float]:
+        """
+        Args:
+            key (str): Metric key of the data point to return.
+
+        Returns:
+            The latest value with the given key, or None if there are no data points
+            with the given key.
+        """
+        positions = self._chronological_positions(key)
+        if not positions:
+            return None
+        return self._values[positions[-1]]
+
+    def get_json(self) -> List[dict]:
+        """
+        Get a JSON representation of the data points.
+
+        Returns:
+            List[dict]: A JSON representation of each data point, in the format
+            returned by :meth:`Metric.get_json`, in the order they were added.
+        """
+        return [
+            {"key": key, "numberValue": value, "timestamp": timestamp}
+            for key, value, timestamp in zip(self._keys, self._values, self._timestamps)
+        ]
+
+
+def _double_buffer(values: Any) -> Optional[memoryview]:
+    # Returns the values as bytes if they are a contiguous, one-dimensional buffer of
+    # native doubles, or None otherwise
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return None
+    if view.ndim != 1 or not view.c_contiguous or view.format != "d":
+        return None
+    return view.cast("B")
+
+
 class Property:
     """Class representing a Property value.
 
@@ -65,6 +267,8 @@ class Property:
         CPU Core Count
     """
 
+    __slots__ = ("key", "value", "timestamp")
+
     def __init__(
         self, key: str, value: Union[float, str], timestamp: Optional[int] = None
     ):
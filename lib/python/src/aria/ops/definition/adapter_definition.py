@@ -95,12 +95,16 @@ class AdapterDefinition(GroupType):  # type: ignore
             ],
         }
 
-    def send_results(self, output_pipe: str = sys.argv[-1]) -> None:
+    def send_results(self, output_pipe: Optional[str] = None) -> None:
         """Opens the output pipe and sends results directly back to the server
 
         This method can only be called once per server request.
         """
-        # The server always invokes methods with the output file as the last argument
+        # The server always invokes methods with the output file as the last argument.
+        # This is resolved when called rather than when defined, so that adapter
+        # processes that are reused for multiple requests write to the right pipe.
+        if output_pipe is None:
+            output_pipe = sys.argv[-1]
         write_to_pipe(output_pipe, self.to_json())
 
     def define_string_parameter(
@@ -0,0 +1,141 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+"""JSON encoding and decoding for the pipes between the adapter and the server.
+
+The codec is selected with the 'ARIA_OPS_JSON_CODEC' environment variable:
+  * 'auto' (default): 'orjson' if it is installed, otherwise 'json'
+  * 'orjson': the 'orjson' package (https://pypi.org/project/orjson/)
+  * 'json': the Python standard library 'json' module
+
+Both codecs produce valid JSON that can be read by the other, but the output is not
+byte-for-byte identical; e.g., 'orjson' does not add whitespace after separators.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+from types import ModuleType
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+CODEC_ENVIRONMENT_VARIABLE = "ARIA_OPS_JSON_CODEC"
+
+
+class JsonCodec:
+    """Encodes and decodes JSON using the Python standard library 'json' module"""
+
+    name = "json"
+    # Separators used between the items of an array or object, and between a key and
+    # its value. Used when a document is encoded in fragments.
+    item_separator = b", "
+    key_separator = b": "
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode an object as UTF-8 encoded JSON
+
+        Args:
+            obj (Any): The object to encode
+
+        Returns:
+            The JSON representation of the object
+        """
+        return json.dumps(obj).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode a JSON document
+
+        Args:
+            data (Union[bytes, str]): The JSON document
+
+        Returns:
+            The decoded object
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """Encodes and decodes JSON using the 'orjson' package.
+
+    Falls back to the 'json' module for objects that 'orjson' does not support, e.g.,
+    integers larger than 64 bits, and for documents containing 'NaN' or 'Infinity'.
+    'orjson' would encode non-finite floats as null, so objects containing them are
+    encoded with the 'json' module, which writes them as 'NaN' and 'Infinity'.
+    """
+
+    name = "orjson"
+    item_separator = b","
+    key_separator = b":"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson: ModuleType = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            data: bytes = self._orjson.dumps(obj)
+        except TypeError:
+            return super().dumps(obj)
+        # orjson encodes NaN and infinity as null, which would silently change the
+        # values. Only documents containing null need to be checked for them.
+        if b"null" in data and _has_non_finite_float(obj):
+            return super().dumps(obj)
+        return data
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._orjson.loads(data)
+        except ValueError:
+            return super().loads(data)
+
+
+def _has_non_finite_float(obj: Any) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite_float(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite_float(item) for item in obj)
+    return False
+
+
+_CODECS = {"json": JsonCodec, "orjson": OrjsonCodec}
+_codecs: Dict[str, JsonCodec] = {}
+
+
+def _create_codec(name: str) -> Optional[JsonCodec]:
+    try:
+        return _CODECS[name]()
+    except ImportError:
+        return None
+
+
+def get_codec() -> JsonCodec:
+    """Get the JSON codec selected by the 'ARIA_OPS_JSON_CODEC' environment variable
+
+    Returns:
+        The JSON codec
+    """
+    name = os.environ.get(CODEC_ENVIRONMENT_VARIABLE, "auto").strip().lower()
+    codec = _codecs.get(name)
+    if codec is None:
+        if name == "auto":
+            codec = _create_codec("orjson") or JsonCodec()
+        elif name in _CODECS:
+            codec = _create_codec(name)
+            if codec is None:
+                logger.warning(
+                    f"JSON codec '{name}' is not installed, using 'json' instead"
+                )
+                codec = JsonCodec()
+        else:
+            logger.warning(f"Unknown JSON codec '{name}', using 'json' instead")
+            codec = JsonCodec()
+        _codecs[name] = codec
+    return codec
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-import copy
+from types import MappingProxyType
 from typing import Any
+from typing import Iterable
 from typing import List
+from typing import Mapping
 from typing import Optional
+from typing import Sequence
 from typing import Set
 
 from aria.ops.data import Metric
+from aria.ops.data import MetricStore
 from aria.ops.data import Property
 from aria.ops.event import Event
 
@@ -26,12 +30,30 @@ class Key:
 
     Two Objects with the same Key are not permitted in a :class:`Result`.
 
-    Objects must be created with the full key. Keys should not change after the Object has been created.
+    Objects must be created with the full key. Keys are immutable, and can be shared between Objects and Results.
 
     All Objects with the same Adapter Kind and Object Kind must have the same set of Identifiers that have
     'is_part_of_uniqueness' set to True.
     """
 
+    __slots__ = (
+        "adapter_kind",
+        "object_kind",
+        "name",
+        "identifiers",
+        "_unique",
+        "_hash",
+        "_json",
+    )
+
+    adapter_kind: str
+    object_kind: str
+    name: str
+    identifiers: Mapping[str, Identifier]
+    _unique: tuple
+    _hash: int
+    _json: Optional[dict]
+
     def __init__(
         self,
         adapter_kind: str,
@@ -49,15 +71,50 @@ class Key:
                 the name must be unique and is used for identification. All Objects with the same adapter kind and Object
                 kind must have the same set of identifiers.
         """
-        self.adapter_kind = adapter_kind
-        self.object_kind = object_kind
-        self.name = name
         if identifiers is None:
             identifiers = []
-        self.identifiers = {identifier.key: identifier for identifier in identifiers}
+        _set = object.__setattr__
+        _set(self, "adapter_kind", adapter_kind)
+        _set(self, "object_kind", object_kind)
+        _set(self, "name", name)
+        _set(
+            self,
+            "identifiers",
+            MappingProxyType(
+                {identifier.key: identifier for identifier in identifiers}
+            ),
+        )
+        # Keys are immutable, so the tuple used for comparisons, the hash, and the
+        # JSON representation are only computed once
+        _set(self, "_unique", self.__key())
+        _set(self, "_hash", hash(self._unique))
+        _set(self, "_json", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __copy__(self) -> Key:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Key:
+        return self
+
+    def __reduce__(self) -> tuple:
+        return (
+            Key,
+            (
+                self.adapter_kind,
+                self.object_kind,
+                self.name,
+                list(self.identifiers.values()),
+            ),
+        )
 
     def __repr__(self) -> str:
-        return f"{self.adapter_kind}:{self.object_kind}:{self.identifiers}"
+        return f"{self.adapter_kind}:{self.object_kind}:{dict(self.identifiers)}"
 
     def __key(self) -> tuple:
         # Sort all identifiers by 'key' that are part of uniqueness
@@ -72,17 +129,21 @@ class Key:
         else:
             # Otherwise, if there is at least one identifier that is part of uniqueness, name is not used for
             # identification. Add each of the unique identifiers to the tuple, sorted by key
-            return (self.adapter_kind, self.object_kind) + tuple(unique_identifiers)
+            return (self.adapter_kind, self.object_kind) + tuple(
+                (id_.key, id_.value) for id_ in unique_identifiers
+            )
 
     def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
         if isinstance(other, Key):
             # TODO: raise exception if the object types are the same but identifier keys don't match?
-            return self.__key() == other.__key()
+            return self._hash == other._hash and self._unique == other._unique
         else:
             return False
 
     def __hash__(self) -> int:
-        return hash(self.__key())
+        return self._hash
 
     def get_identifier(
         self, key: str, default_value: Optional[str] = None
@@ -113,15 +174,28 @@ class Key:
         Returns:
             dict: A JSON representation of this Key.
         """
+        key_json = self._get_json()
         return {
-            "name": self.name,
-            "adapterKind": self.adapter_kind,
-            "objectKind": self.object_kind,
-            "identifiers": [
-                identifier.get_json() for identifier in self.identifiers.values()
-            ],
+            **key_json,
+            "identifiers": [dict(identifier) for identifier in key_json["identifiers"]],
         }
 
+    def _get_json(self) -> dict:
+        # The representation is computed once and shared by everything that encodes
+        # this Key, so it must not be modified
+        key_json = self._json
+        if key_json is None:
+            key_json = {
+                "name": self.name,
+                "adapterKind": self.adapter_kind,
+                "objectKind": self.object_kind,
+                "identifiers": [
+                    identifier.get_json() for identifier in self.identifiers.values()
+                ],
+            }
+            object.__setattr__(self, "_json", key_json)
+        return key_json
+
 
 class IdentifierUniquenessException(Exception):
     """Exception when two Objects of the same type have the same identifier but the `is_part_of_uniqueness` attribute
@@ -134,6 +208,14 @@ class IdentifierUniquenessException(Exception):
 class Identifier:
     """Represents a piece of data that identifies an Object."""
 
+    __slots__ = ("key", "value", "is_part_of_uniqueness", "_unique", "_hash")
+
+    key: str
+    value: str
+    is_part_of_uniqueness: bool
+    _unique: tuple
+    _hash: int
+
     def __init__(
         self, key: str, value: str, is_part_of_uniqueness: bool = True
     ) -> None:
@@ -148,9 +230,27 @@ class Identifier:
             value: The value of the identifier.
             is_part_of_uniqueness: Determines if this key/value pair is used in the identification process.
         """
-        self.key = key
-        self.value = value
-        self.is_part_of_uniqueness = is_part_of_uniqueness
+        _set = object.__setattr__
+        _set(self, "key", key)
+        _set(self, "value", value)
+        _set(self, "is_part_of_uniqueness", is_part_of_uniqueness)
+        _set(self, "_unique", self.__key())
+        _set(self, "_hash", hash(self._unique))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __copy__(self) -> Identifier:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Identifier:
+        return self
+
+    def __reduce__(self) -> tuple:
+        return Identifier, (self.key, self.value, self.is_part_of_uniqueness)
 
     def __repr__(self) -> str:
         u = "*" if self.is_part_of_uniqueness else ""
@@ -173,11 +273,11 @@ class Identifier:
                 raise IdentifierUniquenessException(
                     f"Identifier '{self.key}' has an inconsistent uniqueness attribute"
                 )
-            return self.__key() == other.__key()
+            return self._hash == other._hash and self._unique == other._unique
         return False
 
     def __hash__(self) -> int:
-        return hash(self.__key())
+        return self._hash
 
     def get_json(self) -> dict:
         """Get a JSON representation of this Identifier.
@@ -201,6 +301,16 @@ class Object:
     identified by a unique :class:`Key`.
     """
 
+    __slots__ = (
+        "_key",
+        "_metrics",
+        "_properties",
+        "_events",
+        "_parents",
+        "_children",
+        "_updated_children",
+    )
+
     def __init__(self, key: Key) -> None:
         """Create a new Object with a given Key.
 
@@ -212,7 +322,7 @@ class Object:
         """
 
         self._key: Key = key
-        self._metrics: List[Metric] = []
+        self._metrics = MetricStore()
         self._properties: List[Property] = []
         self._events: Set[Event] = set()
         self._parents: Set[Key] = set()
@@ -220,14 +330,15 @@ class Object:
         self._updated_children: bool = False
 
     def get_key(self) -> Key:
-        """Get a copy of the Object's Key.
+        """Get the Object's Key.
 
-        An object's Key cannot change after it has been created.
+        An object's Key cannot change after it has been created. Keys are immutable,
+        so the Object's Key is returned rather than a copy.
 
         Returns:
-            A copy of the object's key.
+            The object's key.
         """
-        return copy.deepcopy(self._key)
+        return self._key
 
     def adapter_type(self) -> str:
         """Get the adapter type of this object
@@ -268,7 +379,7 @@ class Object:
         Args:
             metric (Metric): A Metric data point to add to this Object.
         """
-        self._metrics.append(metric)
+        self._metrics.add(metric.key, metric.value, metric.timestamp)
 
     def add_metrics(self, metrics: List[Metric]) -> None:
         """Adds a list of Metric data points to this Object.
@@ -279,12 +390,37 @@ class Object:
         for metric in metrics:
             self.add_metric(metric)
 
-    def with_metric(self, *args: Any, **kwargs: Any) -> None:
+    def with_metric(
+        self, key: str, value: float, timestamp: Optional[int] = None
+    ) -> None:
         """Method that handles creating a :class:`Metric` data point, and adding to this Object.
 
         The signature matches :class:`Metric.__init__`.
         """
-        self.add_metric(Metric(*args, **kwargs))
+        self._metrics.add(key, value, timestamp)
+
+    def with_metrics(
+        self,
+        keys: Sequence[str],
+        values: Sequence[float],
+        timestamp: Optional[int] = None,
+    ) -> None:
+        """Method that adds one :class:`Metric` data point for each key to this Object, all with the same timestamp.
+
+        This is equivalent to calling :meth:`with_metric` for each key and value, but
+        is considerably faster when adding many metrics.
+
+        Args:
+            keys (Sequence[str]): The metric keys.
+            values (Sequence[float]): The value for each key, in the same order as 'keys'. Can be any sequence of
+                numbers, including an array or a NumPy array.
+            timestamp (Optional[int], optional): Time in milliseconds since the Epoch when these metric values were
+                recorded. Defaults to the current time.
+
+        Raises:
+            ValueError: If the number of values does not match the number of keys.
+        """
+        self._metrics.add_many(keys, values, timestamp)
 
     def get_metric(self, key: str) -> List[Metric]:
         """
@@ -295,7 +431,7 @@ class Object:
         Returns:
             All metrics matching the given key.
         """
-        return list(filter(lambda metric: metric.key == key, self._metrics))
+        return self._metrics.get(key)
 
     def get_metric_values(self, key: str) -> List[float]:
         """
@@ -305,13 +441,7 @@ class Object:
 
         Returns (List[float]): A list of the metric values in chronological order.
         """
-        # find matching metrics
-        metrics = self.get_metric(key)
-
-        # sort metrics by timestamp from oldest  to newest
-        metrics.sort(key=lambda metric: metric.timestamp)  # type: ignore
-
-        return [m.value for m in metrics]
+        return self._metrics.values(key)
 
     def get_last_metric_value(self, key: str) -> Optional[float]:
         """
@@ -322,12 +452,7 @@ class Object:
         Returns:
             The latest value of the metric or None if no metric exists with the given key.
         """
-        metrics = self.get_metric_values(key)
-
-        if not metrics:
-            return None
-        else:
-            return metrics[-1]
+        return self._metrics.last_value(key)
 
     def add_property(self, property_: Property) -> None:
         """Method that adds a single Property value to this Object
@@ -498,6 +623,13 @@ class Object:
         """
         return bool(self._metrics) or bool(self._properties) or bool(self._events)
 
+    def _clear_content(self) -> None:
+        # Releases metrics, properties and events once they have been sent. The key
+        # and relationships are kept.
+        self._metrics = MetricStore()
+        self._properties = []
+        self._events = set()
+
     def get_json(self) -> dict:
         """Get a JSON representation of this Object
 
@@ -506,9 +638,17 @@ class Object:
         Returns:
              A JSON representation of this Object
         """
+        return self._get_json(self._properties)
+
+    def _get_json(
+        self, properties: Iterable[Property], shared_key: bool = False
+    ) -> dict:
+        # JSON representation that only includes the given properties. If
+        # 'shared_key' is set, the representation of the key is shared with the Key,
+        # so it must be encoded without being modified.
         return {
-            "key": self._key.get_json(),
-            "metrics": [metric.get_json() for metric in self._metrics],
-            "properties": [prop.get_json() for prop in self._properties],
+            "key": self._key._get_json() if shared_key else self._key.get_json(),
+            "metrics": self._metrics.get_json(),
+            "properties": [prop.get_json() for prop in properties],
             "events": [event.get_json() for event in self._events],
         }
@@ -2,13 +2,24 @@
 #  SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
-import json
 import logging
+from typing import Any
+from typing import IO
+from typing import Iterable
 from typing import Optional
 from typing import Union
 
+from aria.ops.json_codec import get_codec
+
 logger = logging.getLogger(__name__)
 
+# Size of the write buffer used when streaming results to the output pipe
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# First record of an object stream. The server uses this to distinguish an object
+# stream from a result that was written as a single JSON document.
+OBJECT_STREAM_HEADER = {"stream": "aria.ops.objects", "version": 1}
+
 
 def read_from_pipe(input_pipe: str) -> Optional[Union[dict, list]]:
     """Reads data from the input pipe.
@@ -21,30 +32,155 @@ def read_from_pipe(input_pipe: str) -> Optional[Union[dict, list]]:
     """
     logger.debug(f"Input Pipe: {input_pipe}")
     try:
-        with open(input_pipe, "r") as input_file:
+        with open(input_pipe, "rb") as input_file:
             logger.debug(f"Opened {input_file.name}")
-            return json.load(input_file)  # type: ignore[no-any-return]
+            return get_codec().loads(input_file.read())  # type: ignore[no-any-return]
     except Exception as e:
         logger.error("Error when reading from Input Pipe.")
         logger.debug(e)
         return None
 
 
-def write_to_pipe(output_pipe: str, result: Optional[Union[dict, list]]) -> None:
+def write_to_pipe(output_pipe: str, result: Optional[Union[dict, list]]) -> bool:
     """Writes data to the output pipe.
 
     Args:
         output_pipe (str): The path to the output pipe.
         result (Optional[Union[dict, list]]): The data to write to the output pipe.
+
+    Returns:
+        bool: True if the data was written, False if there was an error.
     """
-    logger.debug(repr(result))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(repr(result))
     logger.debug(f"Output Pipe: {output_pipe}")
     try:
-        with open(output_pipe, "w") as output_file:
+        with open(output_pipe, "wb") as output_file:
             logger.debug(f"Opened {output_pipe}")
-            json.dump(result, output_file)
+            output_file.write(get_codec().dumps(result))
             logger.debug(f"Closing {output_pipe}")
     except Exception as e:
         logger.error("Error when writing to Output Pipe.")
         logger.debug(e)
+        return False
     logger.debug("Finished writing results to Output Pipe.")
+    return True
+
+
+def write_json_to_pipe(output_pipe: str, fragments: Iterable[bytes]) -> bool:
+    """Writes pre-encoded JSON to the output pipe.
+
+    The fragments are written as they are produced through a buffered writer, so the
+    complete JSON document is never held in memory.
+
+    Args:
+        output_pipe (str): The path to the output pipe.
+        fragments (Iterable[bytes]): Fragments of a UTF-8 encoded JSON document, in order.
+
+    Returns:
+        bool: True if the document was written, False if there was an error.
+    """
+    logger.debug(f"Output Pipe: {output_pipe}")
+    try:
+        with open(output_pipe, "wb", buffering=WRITE_BUFFER_SIZE) as output_file:
+            logger.debug(f"Opened {output_pipe}")
+            output_file.writelines(fragments)
+            logger.debug(f"Closing {output_pipe}")
+    except Exception as e:
+        logger.error("Error when writing to Output Pipe.")
+        logger.debug(e)
+        return False
+    logger.debug("Finished writing results to Output Pipe.")
+    return True
+
+
+class ObjectStreamWriter:
+    """Writes a collect result to the output pipe incrementally.
+
+    The stream consists of newline-delimited JSON records. The first record is
+    :data:`OBJECT_STREAM_HEADER`, followed by any number of `{"object": ...}`,
+    `{"relationship": ...}` and `{"errorMessage": ...}` records, in any order, and
+    terminated by an `{"end": true}` record. The server assembles the records into a
+    single collect result. A stream without the `end` record is incomplete, and is
+    treated as if the adapter did not return a result.
+    """
+
+    def __init__(self, output_pipe: str) -> None:
+        """Opens the output pipe and writes the stream header.
+
+        Args:
+            output_pipe (str): The path to the output pipe.
+        """
+        self._output_file: Optional[IO[bytes]] = None
+        self._failed = False
+        self._codec = get_codec()
+        logger.debug(f"Output Pipe: {output_pipe}")
+        try:
+            self._output_file = open(output_pipe, "wb", buffering=WRITE_BUFFER_SIZE)
+            logger.debug(f"Opened {output_pipe}")
+        except Exception as e:
+            logger.error("Error when opening Output Pipe.")
+            logger.debug(e)
+            self._failed = True
+        self._write(OBJECT_STREAM_HEADER)
+
+    def _write(self, record: Any) -> None:
+        if self._output_file is None:
+            return
+        try:
+            self._output_file.write(self._codec.dumps(record))
+            self._output_file.write(b"\n")
+        except Exception as e:
+            # Once a write fails the stream is incomplete; drop the remaining records
+            logger.error("Error when writing to Output Pipe.")
+            logger.debug(e)
+            self._failed = True
+            self._close()
+
+    def write_object(self, obj: dict) -> None:
+        """Writes the JSON representation of an object to the stream.
+
+        Args:
+            obj (dict): The JSON representation of an object.
+        """
+        self._write({"object": obj})
+
+    def write_relationship(self, relationship: dict) -> None:
+        """Writes the JSON representation of a relationship to the stream.
+
+        Args:
+            relationship (dict): The JSON representation of a relationship.
+        """
+        self._write({"relationship": relationship})
+
+    def write_error(self, error_message: str) -> None:
+        """Writes an error to the stream. The server discards all objects and
+        relationships in a stream that contains an error.
+
+        Args:
+            error_message (str): The error message.
+        """
+        self._write({"errorMessage": error_message})
+
+    def close(self) -> bool:
+        """Terminates the stream and closes the output pipe.
+
+        Returns:
+            bool: True if the complete stream was written, False if the output pipe
+                could not be opened or a write failed.
+        """
+        self._write({"end": True})
+        self._close()
+        logger.debug("Finished writing results to Output Pipe.")
+        return not self._failed
+
+    def _close(self) -> None:
+        if self._output_file is None:
+            return
+        try:
+            self._output_file.close()
+        except Exception as e:
+            logger.error("Error when writing to Output Pipe.")
+            logger.debug(e)
+            self._failed = True
+        self._output_file = None
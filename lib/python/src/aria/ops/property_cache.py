@@ -0,0 +1,196 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import hashlib
+import itertools
+import logging
+import os
+import sys
+import tempfile
+from array import array
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import TYPE_CHECKING
+
+from aria.ops.data import Property
+from aria.ops.object import Key
+from aria.ops.state import get_instance_data_directory
+
+if TYPE_CHECKING:
+    from aria.ops.adapter_instance import AdapterInstance
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FULL_REFRESH_INTERVAL = 12
+
+# Identifies the file format. Followed by the hashes of the sent property values, as
+# little-endian 64-bit integers.
+_MAGIC = b"ARIAPC\x00\x02"
+
+
+def _hash(data: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(
+            data.encode("utf-8", errors="surrogatepass"), digest_size=8
+        ).digest(),
+        "little",
+    )
+
+
+class PropertyCache:
+    """Remembers the property values sent in previous collections, so that a
+    :class:`CollectResult` only sends properties whose value has changed.
+
+    Properties change infrequently, and only their current value is important, so
+    most property values in a collection are the same as the value sent in the
+    previous collection. The cache stores a 64-bit hash of each (object key,
+    property key, value) that was sent in a file, which is read when the cache is
+    created, and replaced when :meth:`commit` is called after the results have been
+    sent. A property is only sent if the hash of its current value is not in the
+    cache.
+
+    Every 'full_refresh_interval' collections, and whenever the cache file is
+    missing or unreadable, all properties are sent. This bounds how long a value
+    can be missing from VMware Aria Operations, e.g., if the results of a
+    collection were not received, or if VMware Aria Operations lost the value.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        collection_number: Optional[int] = None,
+        full_refresh_interval: int = DEFAULT_FULL_REFRESH_INTERVAL,
+    ) -> None:
+        """Initializes a PropertyCache
+
+        Args:
+            path (str): Path to the file the cache is stored in. Each adapter
+                instance must use a different file.
+            collection_number (Optional[int]): The current collection number, see
+                :meth:`AdapterInstance.get_collection_number`. If None, all
+                properties are sent. Defaults to None.
+            full_refresh_interval (int): Send all properties every this many
+                collections. Defaults to 12.
+
+        Raises:
+            ValueError: If 'full_refresh_interval' is less than 1.
+        """
+        if full_refresh_interval < 1:
+            raise ValueError("'full_refresh_interval' must be at least 1")
+        self.path = path
+        self.full_refresh = (
+            collection_number is None or collection_number % full_refresh_interval == 0
+        )
+        # Hashes sent in the previous collection
+        self._previous: Set[int] = set()
+        if not self.full_refresh:
+            self.full_refresh = not self._load()
+        # Hashes of the current collection, by object. An object can be filtered
+        # more than once, e.g., by 'get_json' and then 'send_results'.
+        self._hashes: Dict[tuple, List[int]] = {}
+
+    @classmethod
+    def for_adapter_instance(
+        cls,
+        adapter_instance: AdapterInstance,
+        full_refresh_interval: int = DEFAULT_FULL_REFRESH_INTERVAL,
+        directory: Optional[str] = None,
+    ) -> PropertyCache:
+        """Create the property cache of an adapter instance
+
+        Args:
+            adapter_instance (AdapterInstance): The adapter instance being collected
+            full_refresh_interval (int): Send all properties every this many
+                collections. Defaults to 12.
+            directory (Optional[str]): The directory to store the cache file in.
+                Defaults to :func:`aria.ops.state.get_instance_data_directory`.
+
+        Returns:
+            The property cache for the current collection of the adapter instance
+        """
+        directory = get_instance_data_directory(directory)
+        instance_hash = _hash(repr(adapter_instance.get_key()._unique))
+        return cls(
+            os.path.join(directory, f"aria-ops-properties-{instance_hash:016x}.cache"),
+            adapter_instance.get_collection_number(),
+            full_refresh_interval,
+        )
+
+    def _load(self) -> bool:
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"Could not read property cache '{self.path}': {e}")
+            return False
+        if not data.startswith(_MAGIC) or (len(data) - len(_MAGIC)) % 8:
+            logger.warning(f"Ignoring invalid property cache '{self.path}'")
+            return False
+        hashes = array("Q", data[len(_MAGIC) :])
+        if sys.byteorder == "big":
+            hashes.byteswap()
+        self._previous = set(hashes)
+        return True
+
+    def filter(self, key: Key, properties: Iterable[Property]) -> List[Property]:
+        """Get the properties of an object that have to be sent
+
+        Args:
+            key (Key): The key of the object
+            properties (Iterable[Property]): The properties of the object
+
+        Returns:
+            The properties whose value differs from the value sent in the previous
+            collection, or all properties if this is a full refresh
+        """
+        prefix = repr(key._unique)
+        # Only the last value of each property key is remembered
+        latest: Dict[str, int] = {}
+        changed = []
+        for property_ in properties:
+            value = property_.value
+            if isinstance(value, str):
+                value_hash = _hash(f"{prefix}\x00{property_.key}\x00s{value}")
+            else:
+                value_hash = _hash(f"{prefix}\x00{property_.key}\x00n{float(value)!r}")
+            latest[property_.key] = value_hash
+            if self.full_refresh or value_hash not in self._previous:
+                changed.append(property_)
+        self._hashes[key._unique] = list(latest.values())
+        return changed
+
+    def commit(self) -> None:
+        """Store the property values of the current collection
+
+        This should only be called once the results have been sent. Objects and
+        properties that were not part of the current collection are removed from
+        the cache.
+        """
+        hashes = array("Q", itertools.chain.from_iterable(self._hashes.values()))
+        if sys.byteorder == "big":
+            hashes.byteswap()
+
+        temporary_path = None
+        try:
+            descriptor, temporary_path = tempfile.mkstemp(
+                suffix=".tmp", dir=os.path.dirname(os.path.abspath(self.path))
+            )
+            with os.fdopen(descriptor, "wb") as f:
+                f.write(_MAGIC)
+                hashes.tofile(f)
+            os.replace(temporary_path, self.path)
+        except OSError as e:
+            # The previous file is kept. Values that changed in this collection are
+            # not in it, so they will be sent again in the next collection.
+            logger.warning(f"Could not write property cache '{self.path}': {e}")
+            if temporary_path is not None:
+                try:
+                    os.unlink(temporary_path)
+                except OSError:
+                    pass
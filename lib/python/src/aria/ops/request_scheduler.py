@@ -0,0 +1,191 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import contextlib
+import datetime
+import email.utils
+import random
+import threading
+import time
+from typing import ContextManager
+from typing import Optional
+
+DEFAULT_MAX_RETRIES = 3
+
+# Base of the exponential backoff between retries, in seconds
+DEFAULT_BACKOFF = 1.0
+
+# Requests are not retried if the Suite API asks to wait longer than this, in seconds
+DEFAULT_MAX_DELAY = 60.0
+
+# Responses that mean the Suite API did not process the request, so it can be
+# retried whatever its method
+REJECTED_STATUS_CODES = frozenset({429})
+
+# Responses to retry for idempotent requests
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RequestScheduler:
+    """Schedules and retries the requests of a Suite API client.
+
+    Under load, the Suite API rejects requests with '429 Too Many Requests' or
+    '503 Service Unavailable'. The scheduler retries those requests, so that a
+    collection does not fail or lose pages of data:
+
+    * Requests that were rejected with 429, or with 503 and a 'Retry-After' header,
+      are retried after the time given by 'Retry-After'. All requests sent through
+      the scheduler wait until then, so that other requests do not hammer the
+      Suite API in the meantime.
+    * Idempotent requests (GET, PUT, DELETE, and the page requests of paged
+      requests) are also retried after a 502, 503 or 504 response or a connection
+      error, with jittered exponential backoff.
+
+    Optionally, the scheduler limits the rate of requests with a token bucket, and
+    the number of requests in flight at the same time. A scheduler can be shared by
+    several clients, which then share these limits, except that each
+    AsyncSuiteApiClient limits the requests in flight of its own tasks.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: int = 1,
+        max_in_flight: Optional[int] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> None:
+        """Initializes a RequestScheduler
+
+        Args:
+            rate (Optional[float]): The maximum average number of requests per
+                second. Defaults to None, no limit.
+            burst (int): The number of requests that can be sent at once before
+                'rate' applies. Defaults to 1, requests are spaced evenly.
+            max_in_flight (Optional[int]): The maximum number of requests waiting
+                for a response at the same time. Defaults to None, no limit.
+            max_retries (int): The maximum number of times a request is retried.
+                Defaults to 3.
+            backoff (float): The maximum delay before the first retry, in seconds.
+                The maximum delay doubles with each retry. Defaults to 1 second.
+            max_delay (float): The maximum delay before a retry, in seconds. If the
+                Suite API asks to wait longer, the request is not retried. Defaults
+                to 60 seconds.
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        # Monotonic time before which no request is sent, after a 'Retry-After'
+        self._resume = 0.0
+        self._in_flight = (
+            threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        )
+
+    def delay(self) -> float:
+        """Reserve the sending of a request
+
+        Returns:
+            The number of seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._resume - now)
+            if self.rate is None:
+                return delay
+            # Requests reserve a token even if none are left, and wait until the
+            # bucket has refilled to cover their reservation
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens < 0:
+                delay = max(delay, -self._tokens / self.rate)
+            return delay
+
+    def in_flight(self) -> ContextManager:
+        """Get a context manager that holds one of the 'max_in_flight' slots while a
+        request is sent from a thread
+
+        Returns:
+            The context manager
+        """
+        if self._in_flight is None:
+            return contextlib.nullcontext()
+        return self._in_flight
+
+    def retry_delay(
+        self,
+        method: str,
+        retries: int,
+        status_code: Optional[int],
+        retry_after: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Optional[float]:
+        """Decide whether to retry a failed request
+
+        Args:
+            method (str): The HTTP method of the request
+            retries (int): The number of times the request has been retried
+            status_code (Optional[int]): The status code of the response, or None
+                if no response was received
+            retry_after (Optional[str]): The 'Retry-After' header of the response
+            idempotent (Optional[bool]): Whether the request can be sent more than
+                once. Defaults to None, decided by the method.
+
+        Returns:
+            The number of seconds to wait before retrying the request, or None if
+            the request should not be retried
+        """
+        if retries >= self.max_retries:
+            return None
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        delay = _retry_after_seconds(retry_after)
+        rejected = status_code in REJECTED_STATUS_CODES or (
+            status_code == 503 and delay is not None
+        )
+        if not rejected and not (
+            idempotent and (status_code is None or status_code in RETRY_STATUS_CODES)
+        ):
+            return None
+        if delay is None:
+            # Full jitter, so that clients that failed at the same time do not retry
+            # at the same time
+            return random.uniform(  # nosec: not used for security
+                0, min(self.max_delay, self.backoff * 2**retries)
+            )
+        if delay > self.max_delay:
+            return None
+        with self._lock:
+            self._resume = max(self._resume, time.monotonic() + delay)
+        return delay
+
+
+def _retry_after_seconds(retry_after: Optional[str]) -> Optional[float]:
+    # 'Retry-After' is either a number of seconds or an HTTP date
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    return max(
+        0.0, (date - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+    )
@@ -0,0 +1,216 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import sys
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from aria.ops.object import Identifier
+from aria.ops.object import Key
+from aria.ops.object import Object
+
+
+class ResourceIndex:
+    """An index of existing resources, for matching the entities of a target to the
+    Objects of resources that already exist in VMware Aria Operations.
+
+    Resources can be looked up by the value of one of the indexed identifiers, by
+    name, and by resource kind, in constant time. For example, to match VMs
+    collected by another adapter by their instance UUID:
+
+        vms = suite_api_client.index_resources(
+            {"adapterKind": ["VMWARE"], "resourceKind": ["VirtualMachine"]},
+            identifier_keys=["VMEntityInstanceUUID"],
+        )
+        for virtual_machine in vcenter_vms:
+            vm = vms.get("VMEntityInstanceUUID", virtual_machine.instance_uuid)
+
+    The index only stores the Key of each resource, with the strings shared between
+    resources stored once, and creates the Object of a resource when it is first
+    looked up. Looking up the same resource again returns the same Object, so it
+    can be added to a Result after it has been modified.
+    """
+
+    def __init__(self, identifier_keys: Iterable[str] = ()) -> None:
+        """Initializes an empty ResourceIndex
+
+        Args:
+            identifier_keys (Iterable[str]): The keys of the identifiers that
+                resources can be looked up by. Defaults to none.
+        """
+        self.identifier_keys = tuple(identifier_keys)
+        self._keys_by_identifier: Dict[str, Dict[str, Key]] = {
+            identifier_key: {} for identifier_key in self.identifier_keys
+        }
+        self._keys_by_name: Dict[str, List[Key]] = {}
+        self._keys_by_kind: Dict[str, List[Key]] = {}
+        # The Object of each resource, or None until the resource is first looked up
+        self._objects: Dict[Key, Optional[Object]] = {}
+
+    @classmethod
+    def from_resources(
+        cls, resources: Iterable[Dict[str, Any]], identifier_keys: Iterable[str] = ()
+    ) -> ResourceIndex:
+        """Create an index of resources returned by the Suite API
+
+        Args:
+            resources (Iterable[Dict[str, Any]]): The json of the resources, e.g.,
+                the 'resourceList' of a resource query. Can be an iterator over the
+                pages of a query, see :meth:`SuiteApiClient.iter_paged_post`.
+            identifier_keys (Iterable[str]): The keys of the identifiers that
+                resources can be looked up by. Defaults to none.
+
+        Returns:
+            The index of the resources
+        """
+        index = cls(identifier_keys)
+        for resource in resources:
+            index.add_resource(resource)
+        return index
+
+    @classmethod
+    def from_objects(
+        cls, objects: Iterable[Object], identifier_keys: Iterable[str] = ()
+    ) -> ResourceIndex:
+        """Create an index of Objects, e.g., the result of 'query_for_resources'
+
+        Args:
+            objects (Iterable[Object]): The Objects to index. Lookups return these
+                Objects.
+            identifier_keys (Iterable[str]): The keys of the identifiers that
+                resources can be looked up by. Defaults to none.
+
+        Returns:
+            The index of the Objects
+        """
+        index = cls(identifier_keys)
+        for obj in objects:
+            key = obj.get_key()
+            if key not in index:
+                index.add(key)
+                index._objects[key] = obj
+        return index
+
+    def add_resource(self, resource: Dict[str, Any]) -> Key:
+        """Add a resource returned by the Suite API to the index
+
+        Args:
+            resource (Dict[str, Any]): The json of the resource. Only its
+                'resourceKey' is used.
+
+        Returns:
+            The Key of the resource
+        """
+        key = _key_from_json(resource["resourceKey"])
+        self.add(key)
+        return key
+
+    def add(self, key: Key) -> None:
+        """Add a resource to the index. If a resource with the same Key is already in
+        the index, it is not added again.
+
+        Args:
+            key (Key): The Key of the resource
+        """
+        if key in self._objects:
+            return
+        self._objects[key] = None
+        for identifier_key, keys in self._keys_by_identifier.items():
+            identifier = key.identifiers.get(identifier_key)
+            if identifier is not None:
+                keys[identifier.value] = key
+        self._keys_by_name.setdefault(key.name, []).append(key)
+        self._keys_by_kind.setdefault(key.object_kind, []).append(key)
+
+    def get(self, identifier_key: str, value: str) -> Optional[Object]:
+        """Get a resource by the value of one of its identifiers
+
+        If several resources have the same value for the identifier, the resource
+        that was added last is returned.
+
+        Args:
+            identifier_key (str): The key of the identifier. Must be one of the
+                'identifier_keys' of the index.
+            value (str): The value of the identifier
+
+        Returns:
+            The Object of the resource, or None if there is no resource with the
+            value
+
+        Raises:
+            ValueError: If the identifier is not indexed
+        """
+        keys = self._keys_by_identifier.get(identifier_key)
+        if keys is None:
+            raise ValueError(
+                f"Identifier '{identifier_key}' is not indexed. Indexed identifiers: "
+                f"{list(self.identifier_keys)}"
+            )
+        key = keys.get(value)
+        if key is None:
+            return None
+        return self._get_object(key)
+
+    def get_by_name(self, name: str) -> List[Object]:
+        """Get all resources with a name
+
+        Args:
+            name (str): The name of the resources
+
+        Returns:
+            The Objects of the resources with the name
+        """
+        return [self._get_object(key) for key in self._keys_by_name.get(name, [])]
+
+    def get_by_kind(self, resource_kind: str) -> List[Object]:
+        """Get all resources of a resource kind
+
+        Args:
+            resource_kind (str): The resource kind of the resources
+
+        Returns:
+            The Objects of the resources of the resource kind
+        """
+        return [
+            self._get_object(key) for key in self._keys_by_kind.get(resource_kind, [])
+        ]
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __iter__(self) -> Iterator[Object]:
+        for key in self._objects:
+            yield self._get_object(key)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._objects
+
+    def _get_object(self, key: Key) -> Object:
+        obj = self._objects[key]
+        if obj is None:
+            obj = self._objects[key] = Object(key)
+        return obj
+
+
+def _key_from_json(json_object_key: Dict[str, Any]) -> Key:
+    # The kinds and identifier keys are repeated in every resource, so they are
+    # interned to store each once
+    intern = sys.intern
+    return Key(
+        intern(json_object_key["adapterKindKey"]),
+        intern(json_object_key["resourceKindKey"]),
+        json_object_key["name"],
+        [
+            Identifier(
+                intern(identifier["identifierType"]["name"]),
+                identifier["value"],
+                identifier["identifierType"]["isPartOfUniqueness"],
+            )
+            for identifier in json_object_key["resourceIdentifiers"]
+        ],
+    )
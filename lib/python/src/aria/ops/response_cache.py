@@ -0,0 +1,172 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Any
+from typing import List
+from typing import Optional
+
+from aria.ops.json_codec import get_codec
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESPONSE_CACHE_FILE = "aria-ops-suite-api-responses.db"
+
+DEFAULT_MAX_SIZE = 16 * 1024 * 1024
+
+
+class ResponseCache:
+    """A cache of Suite API responses that persists between collections.
+
+    Some Suite API lookups return the same result on almost every collection, e.g.,
+    the id of the adapter instance that collects a resource. Each collection runs
+    in a new process, so caching them in memory does not help. A SuiteApiClient
+    with a ResponseCache can store the decoded response of such lookups for a time
+    given with each call, using its 'cached_get', 'cached_paged_get' and
+    'cached_paged_post' methods, or the 'cache_ttl' argument of
+    'query_for_resources'.
+
+    The cache is an sqlite database. When the cached responses exceed the size
+    limit, the least recently used responses are evicted. Only successful responses
+    are cached.
+
+    For example, to look up the adapters at most once an hour:
+        adapter_instance.suite_api_client.response_cache = ResponseCache()
+        with adapter_instance.suite_api_client as suite_api_client:
+            adapters = suite_api_client.cached_get("api/adapters", ttl=3600)
+    """
+
+    def __init__(
+        self, path: Optional[str] = None, max_size: int = DEFAULT_MAX_SIZE
+    ) -> None:
+        """Initializes a ResponseCache
+
+        Args:
+            path (Optional[str]): Path to the database file. It is created if it
+                does not exist. Defaults to 'aria-ops-suite-api-responses.db' in the
+                system's temporary directory.
+            max_size (int): The maximum total size of the cached responses, in
+                bytes of JSON. Defaults to 16 MiB.
+        """
+        if path is None:
+            path = os.path.join(tempfile.gettempdir(), DEFAULT_RESPONSE_CACHE_FILE)
+        self.path = path
+        self.max_size = max_size
+
+    @staticmethod
+    def key(*request: Any) -> str:
+        """Create a cache key for a request
+
+        Args:
+            request (Any): JSON-serializable values that identify the request, e.g.,
+                the method, URL, parameters and body
+
+        Returns:
+            The cache key
+        """
+        return hashlib.blake2b(
+            json.dumps(request, sort_keys=True, default=str).encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached response
+
+        Args:
+            key (str): The cache key of the request
+
+        Returns:
+            The decoded response, or None if the response is not cached or has
+            expired
+        """
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    row = connection.execute(
+                        "SELECT value FROM responses WHERE key = ? AND expires > ?",
+                        (key, time.time()),
+                    ).fetchone()
+                    if row is None:
+                        return None
+                    connection.execute(
+                        "UPDATE responses SET last_used = ? WHERE key = ?",
+                        (time.time(), key),
+                    )
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            logger.warning(
+                f"Could not read Suite API response cache '{self.path}': {e}"
+            )
+            return None
+        return get_codec().loads(row[0])
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        """Add a response to the cache, and evict the least recently used responses
+        if the cache exceeds its size limit
+
+        Args:
+            key (str): The cache key of the request
+            value (Any): The decoded response. Must be JSON-serializable.
+            ttl (float): The number of seconds the response stays in the cache
+        """
+        encoded = get_codec().dumps(value)
+        if len(encoded) > self.max_size:
+            logger.debug(f"Response of {len(encoded)} bytes is too large to cache")
+            return
+        now = time.time()
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO responses (key, value, expires, "
+                        "last_used) VALUES (?, ?, ?, ?)",
+                        (key, encoded, now + ttl, now),
+                    )
+                    self._evict(connection, now)
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            logger.warning(
+                f"Could not write Suite API response cache '{self.path}': {e}"
+            )
+
+    def clear(self) -> None:
+        """Remove all responses from the cache"""
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM responses")
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB, "
+            "expires REAL, last_used REAL)"
+        )
+        return connection
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute("DELETE FROM responses WHERE expires <= ?", (now,))
+        size = 0
+        evicted: List[tuple] = []
+        for key, value_size in connection.execute(
+            "SELECT key, length(value) FROM responses ORDER BY last_used DESC"
+        ):
+            size += value_size
+            if size > self.max_size:
+                evicted.append((key,))
+        if evicted:
+            logger.debug(f"Evicting {len(evicted)} responses from the response cache")
+            connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
@@ -1,17 +1,31 @@
 #  Copyright 2022 VMware, Inc.
 #  SPDX-License-Identifier: Apache-2.0
 import sys
+import time
 from enum import auto
+from typing import Iterable
+from typing import Iterator
 from typing import List
+from typing import Mapping
 from typing import NewType
 from typing import Optional
+from typing import Sequence
+from typing import Set
 
 from aenum import Enum
+from aria.ops.data import Property
 from aria.ops.definition.adapter_definition import AdapterDefinition
+from aria.ops.json_codec import get_codec
+from aria.ops.json_codec import JsonCodec
 from aria.ops.object import Identifier
 from aria.ops.object import Key
 from aria.ops.object import Object
+from aria.ops.pipe_utils import ObjectStreamWriter
+from aria.ops.pipe_utils import write_json_to_pipe
 from aria.ops.pipe_utils import write_to_pipe
+from aria.ops.property_cache import PropertyCache
+from aria.ops.state import commit_all
+from aria.ops.state import rollback_all
 
 
 class ObjectKeyAlreadyExistsException(Exception):
@@ -63,15 +77,17 @@ class TestResult:
         else:
             return {"errorMessage": self._error_message}
 
-    def send_results(self, output_pipe: str = sys.argv[-1]) -> None:
+    def send_results(self, output_pipe: Optional[str] = None) -> None:
         """Opens the output pipe and sends results directly back to the server
 
         This method can only be called once per collection.
 
         Args:
-            output_pipe (str): The path to the input pipe. Defaults to sys.argv[-1]
+            output_pipe (Optional[str]): The path to the output pipe. Defaults to sys.argv[-1]
         """
         # The server always invokes methods with the output file as the last argument
+        if output_pipe is None:
+            output_pipe = sys.argv[-1]
         write_to_pipe(output_pipe, self.get_json())
 
 
@@ -111,15 +127,17 @@ class EndpointResult:
         """
         return {"endpointUrls": self.endpoints}
 
-    def send_results(self, output_pipe: str = sys.argv[-1]) -> None:
+    def send_results(self, output_pipe: Optional[str] = None) -> None:
         """Opens the output pipe and sends results directly back to the server
 
         This method can only be called once per collection.
 
         Args:
-            output_pipe (str): The path to the input pipe. Defaults to sys.argv[-1]
+            output_pipe (Optional[str]): The path to the output pipe. Defaults to sys.argv[-1]
         """
         # The server always invokes methods with the output file as the last argument
+        if output_pipe is None:
+            output_pipe = sys.argv[-1]
         write_to_pipe(output_pipe, self.get_json())
 
 
@@ -167,6 +185,8 @@ class CollectResult:
         self,
         obj_list: Optional[list[Object]] = None,
         target_definition: AdapterDefinition = None,
+        stream: bool = False,
+        property_cache: Optional[PropertyCache] = None,
     ) -> None:
         """Initializes a Result
 
@@ -174,13 +194,37 @@ class CollectResult:
         Each object has a key containing one or more identifiers plus the object type
         and adapter type. Keys must be unique across objects in a Result.
 
+        If 'stream' is set, objects are sent to the server as soon as they are marked
+        complete (see :meth:`complete`), rather than when :meth:`send_results` is
+        called. This bounds the memory used by large collections, and overlaps sending
+        results with collecting them. Streaming requires a version of the base
+        adapter image that supports object streams.
+
+        If 'property_cache' is set, only properties whose value changed since the
+        previous collection are sent, except for periodic full refreshes. See
+        :class:`PropertyCache`. For example:
+
+            result = CollectResult(
+                property_cache=PropertyCache.for_adapter_instance(adapter_instance)
+            )
+
         Args:
             obj_list (Optional[List[Object]]): an optional list of objects to send to Aria Operations. Objects can be
                 added later using add_object. Defaults to None
             target_definition (AdapterDefinition): an optional description of the returned objects, used for validation
                 purposes. Defaults to None.
+            stream (bool): Send objects to the server as they are completed. Defaults
+                to False.
+            property_cache (Optional[PropertyCache]): Only send properties that
+                changed since the previous collection. Defaults to None.
         """
         self.objects: dict[Key, Object] = {}
+        # Secondary indexes, updated as objects are added to the Result
+        self._objects_by_type: dict[tuple[str, str], List[Object]] = {}
+        self._objects_by_kind: dict[str, List[Object]] = {}
+        self._objects_by_identifier: Optional[dict[tuple[str, str], List[Object]]] = (
+            None
+        )
         if type(obj_list) is list:
             self.add_objects(obj_list)
         self.definition: AdapterDefinition = target_definition
@@ -189,6 +233,10 @@ class CollectResult:
             self.adapter_type = self.definition.key
         self._error_message: Optional[str] = None
         self.update_relationships: RelationshipUpdateMode = RelationshipUpdateModes.AUTO
+        self._stream = stream
+        self._stream_writer: Optional[ObjectStreamWriter] = None
+        self._streamed: Set[Key] = set()
+        self._property_cache = property_cache
 
     def _object_is_external(self, obj: Object) -> bool:
         return bool(self.adapter_type) and not obj.adapter_type() == self.adapter_type
@@ -223,8 +271,31 @@ class CollectResult:
         Returns:
              The object with the given key
         """
-        obj = Object(Key(adapter_kind, object_kind, name, identifiers))
-        return self.objects.setdefault(obj.get_key(), obj)
+        key = Key(adapter_kind, object_kind, name, identifiers)
+        obj = self.objects.get(key)
+        if obj is None:
+            # The new object's key is shared by the Result, and by any relationships
+            # to the object, so each distinct key is only stored once
+            obj = Object(key)
+            self.objects[key] = obj
+            self._index_object(obj)
+        return obj
+
+    def _index_object(self, obj: Object) -> None:
+        key = obj.get_key()
+        self._objects_by_type.setdefault(
+            (key.adapter_kind, key.object_kind), []
+        ).append(obj)
+        self._objects_by_kind.setdefault(key.object_kind, []).append(obj)
+        if self._objects_by_identifier is not None:
+            self._index_identifiers(self._objects_by_identifier, obj)
+
+    @staticmethod
+    def _index_identifiers(
+        index: dict[tuple[str, str], List[Object]], obj: Object
+    ) -> None:
+        for identifier in obj.get_key().identifiers.values():
+            index.setdefault((identifier.key, identifier.value), []).append(obj)
 
     def get_object(self, obj_key: Key) -> Optional[Object]:
         """Get and return the object corresponding to the given key, if it exists
@@ -243,19 +314,45 @@ class CollectResult:
         """Returns all objects with the given type. If adapter_type is present,
         the objects must also be from the given adapter type.
 
+        The Result keeps an index of its objects by type, so the cost of this method
+        is proportional to the number of objects returned.
+
         Args:
             object_type (str): The object type to return
             adapter_type (Optional[str]): The adapter type of the objects to return. Defaults to None
 
         Returns:
-             A list of objects matching the object type and adapter type
+             A list of objects matching the object type and adapter type, in the order
+             they were added to the Result
         """
-        return [
-            obj
-            for obj in self.objects.values()
-            if obj.adapter_type() == object_type
-            and (adapter_type is None or adapter_type == obj.adapter_type())
-        ]
+        if adapter_type is None:
+            return list(self._objects_by_kind.get(object_type, []))
+        return list(self._objects_by_type.get((adapter_type, object_type), []))
+
+    def get_objects_by_identifier(
+        self, identifier_key: str, identifier_value: str
+    ) -> List[Object]:
+        """Returns all objects with an identifier with the given key and value.
+
+        The index used by this method is built on its first call, and is then
+        updated as objects are added to the Result, so subsequent calls take constant
+        time.
+
+        Args:
+            identifier_key (str): The key of the identifier
+            identifier_value (str): The value of the identifier
+
+        Returns:
+             A list of objects with a matching identifier, in the order they were
+             added to the Result
+        """
+        if self._objects_by_identifier is None:
+            self._objects_by_identifier = {}
+            for obj in self.objects.values():
+                self._index_identifiers(self._objects_by_identifier, obj)
+        return list(
+            self._objects_by_identifier.get((identifier_key, identifier_value), [])
+        )
 
     def add_object(self, obj: Object) -> Object:
         """Adds the given object to the Result and returns it.
@@ -274,7 +371,12 @@ class CollectResult:
             ObjectKeyAlreadyExistsException: If a different object with the same key
                 already exists in the Result.
         """
-        o = self.objects.setdefault(obj.get_key(), obj)
+        key = obj.get_key()
+        o = self.objects.get(key)
+        if o is None:
+            self.objects[key] = obj
+            self._index_object(obj)
+            return obj
         if o is obj:
             return o
         raise ObjectKeyAlreadyExistsException(
@@ -301,6 +403,78 @@ class CollectResult:
         for obj in obj_list:
             self.add_object(obj)
 
+    def complete(self, obj: Object) -> None:
+        """Mark an object as complete.
+
+        If the result was created with 'stream' set, the object's metrics, properties
+        and events are sent to the server immediately, and then released. The object
+        remains in the Result, and relationships to it can still be added. Any
+        metrics, properties or events added to the object afterwards are sent when
+        :meth:`send_results` is called. If 'stream' is not set, this method has no
+        effect.
+
+        Args:
+            obj (Object): The completed object
+        """
+        if not self._stream or self._error_message is not None:
+            return
+        if self._object_is_external(obj) and not obj.has_content():
+            return
+        self._get_stream_writer().write_object(self._object_json(obj, shared_keys=True))
+        obj._clear_content()
+        self._streamed.add(obj.get_key())
+
+    def _get_stream_writer(
+        self, output_pipe: Optional[str] = None
+    ) -> ObjectStreamWriter:
+        if self._stream_writer is None:
+            # The server always invokes methods with the output file as the last
+            # argument
+            if output_pipe is None:
+                output_pipe = sys.argv[-1]
+            self._stream_writer = ObjectStreamWriter(output_pipe)
+        return self._stream_writer
+
+    def with_metric_columns(
+        self,
+        objects: Sequence[Object],
+        columns: Mapping[str, Sequence[float]],
+        timestamp: Optional[int] = None,
+    ) -> None:
+        """Add metrics to many objects from table-shaped data.
+
+        Each column contains the values of one metric key, with one value per
+        object, in the same order as 'objects'. For example, the rows of a query
+        result can be added with one call, where each row corresponds to an object
+        and each column to a metric. All values are added with the same timestamp.
+
+        This is equivalent to calling :meth:`Object.with_metric` for each object and
+        column, but is considerably faster.
+
+        Args:
+            objects (Sequence[Object]): The objects to add metrics to
+            columns (Mapping[str, Sequence[float]]): A mapping from metric key to the
+                values of that metric for each object. Values can be any sequence of
+                numbers, including an array or a NumPy array.
+            timestamp (Optional[int]): Time in milliseconds since the Epoch when the
+                metric values were recorded. Defaults to the current time.
+
+        Raises:
+            ValueError: If the length of a column does not match the number of
+                objects.
+        """
+        for key, column in columns.items():
+            if len(column) != len(objects):
+                raise ValueError(
+                    f"Metric '{key}' has {len(column)} values for {len(objects)} objects"
+                )
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        keys = list(columns)
+        # Transpose the columns into one row of values per object
+        for obj, row in zip(objects, zip(*columns.values())):
+            obj.with_metrics(keys, row, timestamp)
+
     def with_error(self, error_message: str) -> None:
         """Set the Adapter Instance to an error state with the provided message.
 
@@ -326,54 +500,141 @@ class CollectResult:
         """
         if self._error_message is None:
             result = {
-                "result": [
-                    obj.get_json()
-                    for obj in self.objects.values()
-                    if not self._object_is_external(obj) or obj.has_content()
-                ],
+                "result": [self._object_json(obj) for obj in self._objects_to_send()],
                 "relationships": [],
                 "nonExistingObjects": [],
             }
-            if (
-                self.update_relationships == RelationshipUpdateModes.ALL
-                or self.update_relationships == RelationshipUpdateModes.PER_OBJECT
-                or (
-                    self.update_relationships == RelationshipUpdateModes.AUTO
-                    and any([obj._updated_children for obj in self.objects.values()])
-                )
-            ):
+            if self._sends_relationships():
                 result.update(
                     {
-                        "relationships": [
-                            {
-                                "parent": obj.get_key().get_json(),
-                                "children": [
-                                    child_key.get_json()
-                                    for child_key in obj.get_children()
-                                ],
-                            }
-                            for obj in self.objects.values()
-                            if (
-                                self.update_relationships
-                                == RelationshipUpdateModes.PER_OBJECT
-                                and obj._updated_children
-                            )
-                            or not self.update_relationships
-                            == RelationshipUpdateModes.PER_OBJECT
-                        ],
+                        "relationships": list(self._relationships_to_send()),
                     }
                 )
             return result
         else:
             return {"errorMessage": self._error_message}
 
-    def send_results(self, output_pipe: str = sys.argv[-1]) -> None:
+    def iter_json(self) -> Iterator[str]:
+        """Get a JSON representation of this Result as a sequence of string fragments
+
+        The concatenated fragments are identical to `json.dumps(self.get_json())`, but
+        only the JSON representation of a single object or relationship is held in
+        memory at a time.
+
+        Returns:
+            An iterator over fragments of the JSON representation of this Result
+        """
+        for fragment in self._encode(JsonCodec()):
+            yield fragment.decode("utf-8")
+
+    def _encode(self, codec: JsonCodec) -> Iterator[bytes]:
+        # Encodes this result in fragments, using the separators of the codec
+        if self._error_message is not None:
+            yield codec.dumps({"errorMessage": self._error_message})
+            return
+        key_separator = codec.key_separator
+        item_separator = codec.item_separator
+        yield b'{"result"' + key_separator + b"["
+        yield from _join_encoded(
+            codec,
+            (
+                self._object_json(obj, shared_keys=True)
+                for obj in self._objects_to_send()
+            ),
+        )
+        yield b"]" + item_separator + b'"relationships"' + key_separator + b"["
+        if self._sends_relationships():
+            yield from _join_encoded(
+                codec, self._relationships_to_send(shared_keys=True)
+            )
+        yield b"]" + item_separator + b'"nonExistingObjects"' + key_separator + b"[]}"
+
+    def _object_json(self, obj: Object, shared_keys: bool = False) -> dict:
+        # 'shared_keys' avoids copying the representation of keys that are encoded
+        # right away, see 'Object._get_json'
+        properties: Iterable[Property] = obj._properties
+        if self._property_cache is not None:
+            properties = self._property_cache.filter(obj.get_key(), properties)
+        return obj._get_json(properties, shared_keys)
+
+    def _objects_to_send(self) -> Iterator[Object]:
+        return (
+            obj
+            for obj in self.objects.values()
+            if not self._object_is_external(obj) or obj.has_content()
+        )
+
+    def _sends_relationships(self) -> bool:
+        return (
+            self.update_relationships == RelationshipUpdateModes.ALL
+            or self.update_relationships == RelationshipUpdateModes.PER_OBJECT
+            or (
+                self.update_relationships == RelationshipUpdateModes.AUTO
+                and any(obj._updated_children for obj in self.objects.values())
+            )
+        )
+
+    def _relationships_to_send(self, shared_keys: bool = False) -> Iterator[dict]:
+        def key_json(key: Key) -> dict:
+            return key._get_json() if shared_keys else key.get_json()
+
+        return (
+            {
+                "parent": key_json(obj.get_key()),
+                "children": [key_json(child_key) for child_key in obj.get_children()],
+            }
+            for obj in self.objects.values()
+            if (
+                self.update_relationships == RelationshipUpdateModes.PER_OBJECT
+                and obj._updated_children
+            )
+            or not self.update_relationships == RelationshipUpdateModes.PER_OBJECT
+        )
+
+    def send_results(self, output_pipe: Optional[str] = None) -> None:
         """Opens the output pipe and sends results directly back to the server
 
         This method can only be called once per collection.
 
         Args:
-            output_pipe (str): The path to the input pipe. Defaults to sys.argv[-1]
+            output_pipe (Optional[str]): The path to the output pipe. Defaults to sys.argv[-1]
         """
+        if self._stream:
+            self._send_stream(output_pipe)
+            return
         # The server always invokes methods with the output file as the last argument
-        write_to_pipe(output_pipe, self.get_json())
+        if output_pipe is None:
+            output_pipe = sys.argv[-1]
+        self._commit(write_json_to_pipe(output_pipe, self._encode(get_codec())))
+
+    def _send_stream(self, output_pipe: Optional[str]) -> None:
+        writer = self._get_stream_writer(output_pipe)
+        if self._error_message is not None:
+            writer.write_error(self._error_message)
+        else:
+            for obj in self._objects_to_send():
+                if obj.get_key() not in self._streamed or obj.has_content():
+                    writer.write_object(self._object_json(obj, shared_keys=True))
+            if self._sends_relationships():
+                for relationship in self._relationships_to_send(shared_keys=True):
+                    writer.write_relationship(relationship)
+        self._commit(writer.close())
+
+    def _commit(self, sent: bool) -> None:
+        # Properties and adapter state are only persisted once the results have
+        # been written to the output pipe in full. Otherwise the changes to the
+        # adapter state are discarded, so that a process that handles several
+        # collections does not commit them with the next collection.
+        if not sent or self._error_message is not None:
+            rollback_all()
+            return
+        if self._property_cache is not None:
+            self._property_cache.commit()
+        commit_all()
+
+
+def _join_encoded(codec: JsonCodec, items: Iterable[dict]) -> Iterator[bytes]:
+    for i, item in enumerate(items):
+        if i:
+            yield codec.item_separator
+        yield codec.dumps(item)
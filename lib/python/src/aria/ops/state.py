@@ -0,0 +1,190 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import MutableMapping
+from typing import Optional
+
+from aria.ops.object import Key
+
+logger = logging.getLogger(__name__)
+
+# Directory that per-adapter-instance data (state stores and property caches) is
+# persisted in
+DEFAULT_STATE_DIRECTORY = os.path.join(os.sep, "var", "log")
+
+# Stores with changes that are committed when a CollectResult is sent. Adapters
+# usually do not keep a reference to their AdapterInstance (and its store) until the
+# result is sent, e.g., 'collect(AdapterInstance.from_input()).send_results()', so
+# the stores are kept alive here until they are committed or rolled back.
+_uncommitted: Dict[int, StateStore] = {}
+
+
+class StateStore(MutableMapping[str, Any]):
+    """A persistent key-value store for data that an adapter instance needs to
+    remember between collections, e.g., cursors, the last-seen event id, or
+    previous counter values.
+
+    The store behaves like a dictionary with string keys and JSON-serializable
+    values. Values are stored when they are assigned, so modifying a value after it
+    has been assigned requires assigning it again. Changes are not persisted until
+    the store is committed, which happens automatically when a
+    :class:`CollectResult` without an error has been written to the output pipe, or
+    by calling :meth:`commit`. If the collection fails, the results cannot be
+    written, or the adapter exits before sending its results, the store keeps the
+    values of the last successful collection.
+
+    The store is an sqlite database, so a commit is atomic even if the adapter
+    process crashes while committing.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initializes a StateStore
+
+        Args:
+            path (str): Path to the database file. It is created if it does not
+                exist.
+        """
+        self.path = path
+        self._values: Optional[Dict[str, Any]] = None
+        # Encoded values that have been changed since the last commit. Deleted keys
+        # map to None.
+        self._changes: Dict[str, Optional[str]] = {}
+
+    @classmethod
+    def for_adapter_instance(
+        cls, key: Key, directory: Optional[str] = None
+    ) -> StateStore:
+        """Get the state store of an adapter instance
+
+        Args:
+            key (Key): The key of the adapter instance
+            directory (Optional[str]): The directory to store the database in.
+                Defaults to :func:`get_instance_data_directory`.
+
+        Returns:
+            The state store of the adapter instance
+        """
+        directory = get_instance_data_directory(directory)
+        instance_hash = hashlib.blake2b(
+            repr(key._unique).encode("utf-8"), digest_size=8
+        ).hexdigest()
+        return cls(os.path.join(directory, f"aria-ops-state-{instance_hash}.db"))
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        return connection
+
+    def _load(self) -> Dict[str, Any]:
+        if self._values is None:
+            connection = self._connect()
+            try:
+                self._values = {
+                    key: json.loads(value)
+                    for key, value in connection.execute("SELECT key, value FROM state")
+                }
+            finally:
+                connection.close()
+        return self._values
+
+    def __getitem__(self, key: str) -> Any:
+        return self._load()[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        encoded = json.dumps(value)
+        self._load()[key] = json.loads(encoded)
+        self._changes[key] = encoded
+        _uncommitted[id(self)] = self
+
+    def __delitem__(self, key: str) -> None:
+        del self._load()[key]
+        self._changes[key] = None
+        _uncommitted[id(self)] = self
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def commit(self) -> None:
+        """Persist all changes made since the last commit, in a single transaction"""
+        if not self._changes:
+            _uncommitted.pop(id(self), None)
+            return
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                    [
+                        (key, value)
+                        for key, value in self._changes.items()
+                        if value is not None
+                    ],
+                )
+                connection.executemany(
+                    "DELETE FROM state WHERE key = ?",
+                    [(key,) for key, value in self._changes.items() if value is None],
+                )
+        finally:
+            connection.close()
+        self._changes = {}
+        _uncommitted.pop(id(self), None)
+
+    def rollback(self) -> None:
+        """Discard all changes made since the last commit"""
+        _uncommitted.pop(id(self), None)
+        self._changes = {}
+        self._values = None
+
+
+def get_instance_data_directory(directory: Optional[str] = None) -> str:
+    """Get the directory to persist the data of an adapter instance in, e.g., its
+    :class:`StateStore` and property cache
+
+    Args:
+        directory (Optional[str]): The directory to use instead of the default
+
+    Returns:
+        'directory' if it is given. Otherwise '/var/log', or the system's temporary
+        directory if '/var/log' is not writable.
+    """
+    if directory is not None:
+        return directory
+    if os.access(DEFAULT_STATE_DIRECTORY, os.W_OK):
+        return DEFAULT_STATE_DIRECTORY
+    directory = tempfile.gettempdir()
+    logger.warning(
+        f"Cannot write to '{DEFAULT_STATE_DIRECTORY}', adapter instance data is "
+        f"stored in '{directory}'"
+    )
+    return directory
+
+
+def commit_all() -> None:
+    """Commit all state stores that have uncommitted changes"""
+    for store in list(_uncommitted.values()):
+        try:
+            store.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Could not commit adapter state '{store.path}': {e}")
+            store.rollback()
+
+
+def rollback_all() -> None:
+    """Discard the changes of all state stores that have uncommitted changes"""
+    for store in list(_uncommitted.values()):
+        store.rollback()
@@ -2,14 +2,20 @@
 #  SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
-import json
 import logging
 import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from types import TracebackType
 from typing import Any
 from typing import Callable
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Type
 
 import requests
@@ -17,12 +23,20 @@ import urllib3
 from aria.ops.object import Identifier
 from aria.ops.object import Key
 from aria.ops.object import Object
+from aria.ops.request_scheduler import RequestScheduler
+from aria.ops.resource_index import ResourceIndex
+from aria.ops.response_cache import ResponseCache
+from aria.ops.token_cache import TokenCache
 from requests import Response
+from requests.adapters import HTTPAdapter
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE = 10
+DEFAULT_PAGE_CONCURRENCY = 4
+
 
 class SuiteApiConnectionParameters:
     def __init__(
@@ -45,15 +59,183 @@ class SuiteApiConnectionParameters:
         self.auth_source = auth_source
 
 
-class SuiteApiClient:
+class BaseSuiteApiClient:
+    """Authentication, request and paging logic shared by :class:`SuiteApiClient`
+    and :class:`AsyncSuiteApiClient`"""
+
+    def __init__(
+        self,
+        connection_params: SuiteApiConnectionParameters,
+        page_concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+        token_cache: Optional[TokenCache] = None,
+        response_cache: Optional[ResponseCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        self.credential = connection_params
+        self.token = ""
+        self.page_concurrency = max(1, page_concurrency)
+        self.token_cache = token_cache
+        self.response_cache = response_cache
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+
+    def _token_request(self) -> dict:
+        return {
+            "username": self.credential.username,
+            "password": self.credential.password,
+            "authSource": self.credential.auth_source,
+        }
+
+    def _cached_token(self) -> str:
+        if self.token_cache is None:
+            return ""
+        token = self.token_cache.get(
+            self.credential.host, self.credential.username, self.credential.auth_source
+        )
+        if token is None:
+            return ""
+        logger.debug("Using cached token " + token)
+        return token
+
+    def _cache_token(self, token_response: Dict[str, Any]) -> None:
+        if self.token_cache is not None:
+            # 'validity' is the time the token expires, in milliseconds since the epoch
+            validity = token_response.get("validity")
+            self.token_cache.put(
+                self.credential.host,
+                self.credential.username,
+                self.credential.auth_source,
+                self.token,
+                validity / 1000 if validity else None,
+            )
+
+    def _uncache_token(self) -> None:
+        if self.token_cache is not None:
+            self.token_cache.remove(
+                self.credential.host,
+                self.credential.username,
+                self.credential.auth_source,
+            )
+
+    def _response_cache_key(self, method: str, url: str, **kwargs: Any) -> str:
+        return ResponseCache.key(
+            self.credential.username,
+            method,
+            self._to_vrops_request(url)["url"],
+            {name: value for name, value in kwargs.items() if name != "headers"},
+        )
+
+    def _cached_response(self, key: str) -> Optional[Any]:
+        if self.response_cache is None:
+            return None
+        return self.response_cache.get(key)
+
+    def _cache_response(self, key: str, response: Any, ttl: float) -> None:
+        if self.response_cache is not None:
+            self.response_cache.put(key, response, ttl)
+
+    def _should_renew_token(self, status_code: int, url: str, token: str) -> bool:
+        # A cached token may have been released or invalidated since it was cached.
+        # Tokens that were just acquired are not renewed, as a new token would be
+        # rejected as well.
+        return (
+            status_code == 401
+            and self.token_cache is not None
+            and token != ""
+            and "auth/token/" not in url
+        )
+
+    def _add_paging(self, **kwargs: Any) -> dict:
+        kwargs.setdefault("params", {})
+        kwargs["params"].setdefault("page", 0)
+        kwargs["params"].setdefault("pageSize", 1000)
+
+        if "page" in kwargs:
+            kwargs["params"]["page"] = kwargs.pop("page")
+        if "pageSize" in kwargs:
+            kwargs["params"]["pageSize"] = kwargs.pop("pageSize")
+
+        return kwargs
+
+    def _page_request(self, page: int, **kwargs: Any) -> dict:
+        # Requests for different pages may be sent concurrently, so each gets its
+        # own copy of the parameters and headers
+        kwargs["params"] = dict(kwargs["params"], page=page)
+        kwargs["headers"] = dict(kwargs.get("headers", {}))
+        return kwargs
+
+    @staticmethod
+    def _page_count(page_0_body: Dict[str, Any], **kwargs: Any) -> int:
+        total_objects = int(
+            page_0_body.get("pageInfo", {"totalCount": 1}).get("totalCount", 1)
+        )
+        return max(1, math.ceil(total_objects / int(kwargs["params"]["pageSize"])))
+
+    @staticmethod
+    def _log_failed_pages(url: str, failed_pages: List[int], pages: int) -> None:
+        if failed_pages:
+            logger.error(
+                f"Could not retrieve {len(failed_pages)} of {pages} pages of {url}: "
+                f"{failed_pages}"
+            )
+
+    @staticmethod
+    def _resource_queries(query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if "name" in query and "regex" in query:
+            # This is behavior in the suite api itself, we're just warning about it
+            # here to avoid confusion.
+            logger.warning(
+                "'name' and 'regex' are mutually exclusive in resource "
+                "queries. Ignoring the 'regex' key in favor of 'name' "
+                "key."
+            )
+        # The 'name' key takes an array but only looks up the first element.
+        # Fix that limitation here by sending a query for each name.
+        if "name" in query and len(query["name"]) > 1:
+            return [dict(query, name=[name]) for name in query["name"]]
+        return [query]
+
+    def _to_vrops_request(self, url: str, **kwargs: Any) -> dict:
+        kwargs.setdefault("url", url)
+        kwargs.setdefault("headers", {})
+        if self.token:
+            kwargs["headers"]["Authorization"] = "vRealizeOpsToken " + self.token
+        kwargs["headers"].setdefault("Accept", "application/json")
+        kwargs.setdefault("verify", False)
+
+        url = kwargs["url"]
+        if "internal/" in url:
+            kwargs["headers"]["X-vRealizeOps-API-use-unsupported"] = "true"
+            logger.info(f"Using unsupported API: {url}")
+        if url.startswith("http"):
+            return kwargs
+
+        if url.startswith("/"):
+            url = url[1:]
+        if url.startswith("suite-api/"):
+            url = url[10:]
+        elif url.startswith("api") or url.startswith("internal"):
+            kwargs["url"] = self.credential.host + url
+        else:
+            kwargs["url"] = self.credential.host + "api/" + url
+        return kwargs
+
+
+class SuiteApiClient(BaseSuiteApiClient):
     """Class for simplifying calls to the SuiteAPI
 
     Automatically handles:
     * Token based authentication
     * Required headers
     * Releasing tokens (when used in a 'with' statement)
-    * Paging (when using 'paged_get' or 'paged_post')
+    * Paging (when using 'paged_get' or 'paged_post', or iterating over the results
+      page by page with 'iter_paged_get' or 'iter_paged_post')
     * Logging requests
+    * Reusing connections between requests
+    * Retrying requests that the Suite API rejects under load, and optionally
+      limiting the request rate (see 'RequestScheduler')
+    * Reusing tokens between collections (when given a 'TokenCache')
+    * Reusing responses between collections (when given a 'ResponseCache', and
+      using 'cached_get', 'cached_paged_get' or 'cached_paged_post')
 
     This class is intended to be used in a with statement:
     with VROpsSuiteAPIClient() as suiteApiClient:
@@ -61,14 +243,51 @@ class SuiteApiClient:
         ...
     """
 
-    def __init__(self, connection_params: SuiteApiConnectionParameters):
+    def __init__(
+        self,
+        connection_params: SuiteApiConnectionParameters,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        page_concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+        token_cache: Optional[TokenCache] = None,
+        response_cache: Optional[ResponseCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
         """Initializes a SuiteAPI client.
 
+        Requests are sent using a session that keeps connections to the Suite API
+        alive, so consecutive requests do not have to open a new TCP and TLS
+        connection. The connections are closed when exiting the 'with' context, or
+        when 'close' is called.
+
         Args:
              connection_params (SuiteApiConnectionParameters): Connection parameters for the Suite API.
+             pool_size (int): The maximum number of connections kept alive for reuse.
+                Defaults to 10.
+             page_concurrency (int): The maximum number of pages of a paged request
+                that are fetched at the same time. Defaults to 4.
+             token_cache (Optional[TokenCache]): A cache to reuse tokens from. When
+                set, the token is kept in the cache rather than released when
+                exiting the 'with' context. Defaults to None, a new token is
+                acquired and released by each client.
+             response_cache (Optional[ResponseCache]): A cache for the responses of
+                the 'cached_' methods. Defaults to None, responses are not cached.
+             scheduler (Optional[RequestScheduler]): Schedules and retries the
+                requests of the client. Defaults to None, a 'RequestScheduler' that
+                retries requests rejected by the Suite API and does not limit the
+                request rate.
         """
-        self.credential = connection_params
-        self.token = ""
+        super().__init__(
+            connection_params,
+            page_concurrency,
+            token_cache,
+            response_cache,
+            scheduler,
+        )
+        self._token_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def __enter__(self) -> SuiteApiClient:
         """Acquire a token upon entering the 'with' context
@@ -85,35 +304,47 @@ class SuiteApiClient:
         exception_value: Optional[BaseException],
         traceback: Optional[TracebackType],
     ) -> None:
-        """Release the token upon exiting the 'with' context
+        """Release the token and close all connections upon exiting the 'with'
+        context. If the client has a token cache, the token is kept for reuse
+        instead of released.
 
         Args:
             exception_type (Optional[Type[BaseException]]): Unused
             exception_value (Optional[BaseException]): Unused
             traceback (Optional[TracebackType]): Unused
         """
-        self.release_token()
+        try:
+            if self.token_cache is None:
+                self.release_token()
+            else:
+                self.token = ""
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Close all connections to the Suite API"""
+        self.session.close()
 
     def get_token(self) -> str:
         """Get the authentication token
 
-        Gets the current authentication token. If no current token exists, acquires an authentication token first.
+        Gets the current authentication token. If no current token exists, acquires an authentication token first,
+        or reuses a token from the token cache.
 
         Returns:
              The authentication token
         """
+        if self.token == "":
+            self.token = self._cached_token()
         if self.token == "":
             with self.post(
-                "/api/auth/token/acquire",
-                json={
-                    "username": self.credential.username,
-                    "password": self.credential.password,
-                    "authSource": self.credential.auth_source,
-                },
+                "/api/auth/token/acquire", json=self._token_request()
             ) as token_response:
                 if token_response.ok:
-                    self.token = token_response.json()["token"]
+                    token_response_body = token_response.json()
+                    self.token = token_response_body["token"]
                     logger.debug("Acquired token " + self.token)
+                    self._cache_token(token_response_body)
                 else:
                     logger.warning(
                         f"Could not acquire SuiteAPI token: {token_response}"
@@ -122,9 +353,11 @@ class SuiteApiClient:
         return self.token
 
     def release_token(self) -> None:
-        """Release the authentication token, if it exists"""
+        """Release the authentication token, if it exists, and remove it from the
+        token cache"""
 
         if self.token != "":
+            self._uncache_token()
             self.post("auth/token/release").close()
             self.token = ""
 
@@ -140,7 +373,7 @@ class SuiteApiClient:
         Returns:
             The API response
         """
-        return self._request_wrapper(requests.get, url, **kwargs)
+        return self._request_wrapper(self.session.get, url, **kwargs)
 
     def paged_get(self, url: str, key: str, **kwargs: Any) -> dict:
         """Send a GET request to the SuiteAPI that gets a paged response
@@ -153,7 +386,73 @@ class SuiteApiClient:
         Returns:
              The API response
         """
-        return self._paged_request(requests.get, url, key, **kwargs)
+        return self._paged_request(self.session.get, url, key, **kwargs)
+
+    def cached_get(self, url: str, ttl: float, **kwargs: Any) -> Optional[Any]:
+        """Send a GET request to the SuiteAPI, or get its response from the response
+        cache. The decoded response is cached for 'ttl' seconds if the request
+        succeeds. Without a response cache, the request is always sent.
+
+        Args:
+            url (str): URL to send GET request to
+            ttl (float): The number of seconds to cache the response for
+            kwargs (Any): Additional keyword arguments to pass to request
+
+        Returns:
+            The decoded json of the API response, or None if the request failed
+        """
+        cache_key = self._response_cache_key("GET", url, **kwargs)
+        cached_response = self._cached_response(cache_key)
+        if cached_response is not None:
+            return cached_response
+        with self.get(url, **kwargs) as response:
+            if not response.ok:
+                # _request_wrapper will log the error
+                return None
+            body = response.json()
+        self._cache_response(cache_key, body, ttl)
+        return body
+
+    def cached_paged_get(self, url: str, key: str, ttl: float, **kwargs: Any) -> dict:
+        """Send a GET request to the SuiteAPI that gets a paged response, or get the
+        combined response from the response cache. See 'cached_get'. Responses with
+        failed pages are not cached.
+
+        Args:
+            url (str): URL to send GET request to
+            key (str): Json key that contains the paged data
+            ttl (float): The number of seconds to cache the response for
+            kwargs (Any): Additional keyword arguments to pass to request
+
+        Returns:
+             The API response
+        """
+        cache_key = self._response_cache_key("GET", url, key=key, **kwargs)
+        cached_response = self._cached_response(cache_key)
+        if cached_response is not None:
+            return cached_response  # type: ignore[no-any-return]
+        result = self.paged_get(url, key, **kwargs)
+        if not result["failedPages"]:
+            self._cache_response(cache_key, result, ttl)
+        return result
+
+    def iter_paged_get(
+        self, url: str, key: str, prefetch: bool = True, **kwargs: Any
+    ) -> Iterator[Any]:
+        """Send a GET request to the SuiteAPI that gets a paged response, and iterate
+        over the paged data one page at a time. See 'iter_paged_post'.
+
+        Args:
+            url (str): URL to send GET request to
+            key (str): Json key that contains the paged data
+            prefetch (bool): Request the next page while the items of the current
+                page are processed. Defaults to True.
+            kwargs (Any): Additional keyword arguments to pass to request
+
+        Returns:
+             An iterator over the items of the paged data
+        """
+        return self._iter_paged_request(self.session.get, url, key, prefetch, **kwargs)
 
     def post(self, url: str, **kwargs: Any) -> Response:
         """Send a POST request to the SuiteAPI
@@ -169,7 +468,7 @@ class SuiteApiClient:
         """
         kwargs.setdefault("headers", {})
         kwargs["headers"].setdefault("Content-Type", "application/json")
-        return self._request_wrapper(requests.post, url, **kwargs)
+        return self._request_wrapper(self.session.post, url, **kwargs)
 
     def paged_post(self, url: str, key: str, **kwargs: Any) -> dict:
         """Send a POST request to the SuiteAPI that gets a paged response.
@@ -184,7 +483,57 @@ class SuiteApiClient:
         """
         kwargs.setdefault("headers", {})
         kwargs["headers"].setdefault("Content-Type", "application/json")
-        return self._paged_request(requests.post, url, key, **kwargs)
+        return self._paged_request(self.session.post, url, key, **kwargs)
+
+    def cached_paged_post(self, url: str, key: str, ttl: float, **kwargs: Any) -> dict:
+        """Send a POST request to the SuiteAPI that gets a paged response, e.g., a
+        query, or get the combined response from the response cache. See
+        'cached_get'. Responses with failed pages are not cached.
+
+        Args:
+            url (str): URL to send POST request to
+            key (str): Json key that contains the paged data
+            ttl (float): The number of seconds to cache the response for
+            kwargs (Any): Additional keyword arguments to pass to request
+
+        Returns:
+             The API response
+        """
+        cache_key = self._response_cache_key("POST", url, key=key, **kwargs)
+        cached_response = self._cached_response(cache_key)
+        if cached_response is not None:
+            return cached_response  # type: ignore[no-any-return]
+        result = self.paged_post(url, key, **kwargs)
+        if not result["failedPages"]:
+            self._cache_response(cache_key, result, ttl)
+        return result
+
+    def iter_paged_post(
+        self, url: str, key: str, prefetch: bool = True, **kwargs: Any
+    ) -> Iterator[Any]:
+        """Send a POST request to the SuiteAPI that gets a paged response, and iterate
+        over the paged data one page at a time.
+
+        Unlike 'paged_post', the pages are not combined into a single list. At most
+        the current page and the next page are held in memory, so very large
+        results can be processed in bounded memory. Pages that cannot be retrieved
+        are logged and skipped. Pages are only requested as the iterator is
+        consumed; the iterator should be consumed or closed before the client is
+        closed.
+
+        Args:
+            url (str): URL to send POST request to
+            key (str): Json key that contains the paged data
+            prefetch (bool): Request the next page while the items of the current
+                page are processed. Defaults to True.
+            kwargs (Any): Additional keyword arguments to pass to request
+
+        Returns:
+             An iterator over the items of the paged data
+        """
+        kwargs.setdefault("headers", {})
+        kwargs["headers"].setdefault("Content-Type", "application/json")
+        return self._iter_paged_request(self.session.post, url, key, prefetch, **kwargs)
 
     def put(self, url: str, **kwargs: Any) -> Response:
         """Send a PUT request to the SuiteAPI
@@ -198,7 +547,7 @@ class SuiteApiClient:
         Returns:
              The API response
         """
-        return self._request_wrapper(requests.put, url, **kwargs)
+        return self._request_wrapper(self.session.put, url, **kwargs)
 
     def patch(self, url: str, **kwargs: Any) -> Response:
         """Send a PATCH request to the SuiteAPI
@@ -212,7 +561,7 @@ class SuiteApiClient:
         Returns:
             The API response
         """
-        return self._request_wrapper(requests.patch, url, **kwargs)
+        return self._request_wrapper(self.session.patch, url, **kwargs)
 
     def delete(self, url: str, **kwargs: Any) -> Response:
         """Send a DELETE request to the SuiteAPI
@@ -226,23 +575,13 @@ class SuiteApiClient:
         Returns:
              The API response
         """
-        return self._request_wrapper(requests.delete, url, **kwargs)
-
-    def _add_paging(self, **kwargs: Any) -> dict:
-        kwargs.setdefault("params", {})
-        kwargs["params"].setdefault("page", 0)
-        kwargs["params"].setdefault("pageSize", 1000)
-
-        if "page" in kwargs:
-            kwargs["params"]["page"] = kwargs.pop("page")
-        if "pageSize" in kwargs:
-            kwargs["params"]["pageSize"] = kwargs.pop("pageSize")
-
-        return kwargs
+        return self._request_wrapper(self.session.delete, url, **kwargs)
 
     # Implementations for common endpoints:
 
-    def query_for_resources(self, query: Dict[str, Any]) -> list[Object]:
+    def query_for_resources(
+        self, query: Dict[str, Any], cache_ttl: Optional[float] = None
+    ) -> list[Object]:
         """Query for resources using the Suite API, and convert the
         responses to SDK Objects.
 
@@ -254,45 +593,108 @@ class SuiteApiClient:
         Args:
             query (Dict[str, Any]): json of the resourceQuery, as defined in the SuiteAPI docs:
                 https://[[aria-ops-hostname]]/suite-api/doc/swagger-ui.html#/Resources/getMatchingResourcesUsingPOST
+            cache_ttl (Optional[float]): The number of seconds to cache the query
+                results for in the response cache. Defaults to None, the results are
+                not cached.
 
         Returns:
              list of sdk Objects representing each of the returned objects.
         """
         try:
             results = []
-            if "name" in query and "regex" in query:
-                # This is behavior in the suite api itself, we're just warning about it
-                # here to avoid confusion.
-                logger.warning(
-                    "'name' and 'regex' are mutually exclusive in resource "
-                    "queries. Ignoring the 'regex' key in favor of 'name' "
-                    "key."
-                )
-            # The 'name' key takes an array but only looks up the first element.
-            # Fix that limitation here.
-            if "name" in query and len(query["name"]) > 1:
-                json_body = query.copy()
-                # TODO: Improve concurrancy when we add async support
-                #  to suite_api_client
-                for name in query["name"]:
-                    json_body.update({"name": [name]})
+            # See AsyncSuiteApiClient for sending the queries for multiple names
+            # concurrently
+            for resource_query in self._resource_queries(query):
+                if cache_ttl is None:
                     response = self.paged_post(
-                        "/api/resources/query", "resourceList", json=json_body
+                        "/api/resources/query", "resourceList", json=resource_query
                     )
-                    results.extend(response.get("resourceList", []))
-            else:
-                response = self.paged_post(
-                    "/api/resources/query",
-                    "resourceList",
-                    json=query,
-                )
-                results = response.get("resourceList", [])
+                else:
+                    response = self.cached_paged_post(
+                        "/api/resources/query",
+                        "resourceList",
+                        cache_ttl,
+                        json=resource_query,
+                    )
+                results.extend(response.get("resourceList", []))
             return [key_to_object(obj["resourceKey"]) for obj in results]
         except Exception as e:
             logger.error(e)
             logger.exception(e)
             return []
 
+    def iter_resources(
+        self, query: Dict[str, Any], prefetch: bool = True
+    ) -> Iterator[Object]:
+        """Query for resources using the Suite API, and convert the responses to
+        SDK Objects one page at a time.
+
+        Like 'query_for_resources', but the Objects are created as the iterator is
+        consumed, so that each page of resources can be processed and discarded
+        before the next is converted. See 'iter_paged_post'.
+
+        Args:
+            query (Dict[str, Any]): json of the resourceQuery, as defined in the SuiteAPI docs:
+                https://[[aria-ops-hostname]]/suite-api/doc/swagger-ui.html#/Resources/getMatchingResourcesUsingPOST
+            prefetch (bool): Request the next page while the current page is
+                processed. Defaults to True.
+
+        Returns:
+             iterator of sdk Objects representing each of the returned objects.
+        """
+        try:
+            for resource_query in self._resource_queries(query):
+                for obj in self.iter_paged_post(
+                    "/api/resources/query",
+                    "resourceList",
+                    prefetch,
+                    json=resource_query,
+                ):
+                    yield key_to_object(obj["resourceKey"])
+        except Exception as e:
+            logger.error(e)
+            logger.exception(e)
+
+    def index_resources(
+        self,
+        query: Dict[str, Any],
+        identifier_keys: Iterable[str] = (),
+        prefetch: bool = True,
+    ) -> ResourceIndex:
+        """Query for resources using the Suite API, and index them for looking up by
+        identifier, name and resource kind.
+
+        The index is built from the pages of the query as they are received, without
+        keeping the json of the resources or creating their Objects. See
+        :class:`ResourceIndex`.
+
+        Args:
+            query (Dict[str, Any]): json of the resourceQuery, as defined in the SuiteAPI docs:
+                https://[[aria-ops-hostname]]/suite-api/doc/swagger-ui.html#/Resources/getMatchingResourcesUsingPOST
+            identifier_keys (Iterable[str]): The keys of the identifiers that
+                resources can be looked up by. Defaults to none.
+            prefetch (bool): Request the next page while the current page is
+                indexed. Defaults to True.
+
+        Returns:
+             The index of the returned resources.
+        """
+        index = ResourceIndex(identifier_keys)
+        try:
+            for resource_query in self._resource_queries(query):
+                for resource in self.iter_paged_post(
+                    "/api/resources/query",
+                    "resourceList",
+                    prefetch,
+                    json=resource_query,
+                ):
+                    index.add_resource(resource)
+            return index
+        except Exception as e:
+            logger.error(e)
+            logger.exception(e)
+            return ResourceIndex(index.identifier_keys)
+
     def _paged_request(
         self, request_func: Callable, url: str, key: str, **kwargs: Any
     ) -> dict:
@@ -300,9 +702,13 @@ class SuiteApiClient:
         array at key 'key'. The array from the responses will be combined into a single array and returned in a map of
         the form:
         {
-           "{key}": [aggregated data]
+           "{key}": [aggregated data],
+           "failedPages": [page numbers of pages that could not be retrieved]
         }
 
+        Once the first page has been received, the remaining pages are requested
+        concurrently (see 'page_concurrency'). The data is combined in page order.
+
         Args:
             url(str): URL to send request to
             key (str): Json key that contains the paged data
@@ -312,34 +718,113 @@ class SuiteApiClient:
              The API response
         """
         kwargs = self._add_paging(**kwargs)
-        with self._request_wrapper(request_func, url, **kwargs) as page_0:
-            if page_0.status_code < 300:
-                page_0_body = json.loads(page_0.text)
+        page_0_body = self._get_page(request_func, url, 0, **kwargs)
+        if page_0_body is None:
+            return {key: [], "failedPages": [0]}
+        remaining_pages = range(1, self._page_count(page_0_body, **kwargs))
+        objects = page_0_body.get(key, [])
+        failed_pages = []
+        if remaining_pages:
+            with ThreadPoolExecutor(
+                max_workers=min(self.page_concurrency, len(remaining_pages))
+            ) as executor:
+                # 'map' returns the pages in order
+                page_bodies = executor.map(
+                    lambda page: self._get_page(request_func, url, page, **kwargs),
+                    remaining_pages,
+                )
+                for page, page_n_body in zip(remaining_pages, page_bodies):
+                    if page_n_body is None:
+                        failed_pages.append(page)
+                    else:
+                        objects.extend(page_n_body.get(key, []))
+        self._log_failed_pages(url, failed_pages, len(remaining_pages) + 1)
+        return {key: objects, "failedPages": failed_pages}
+
+    def _iter_paged_request(
+        self,
+        request_func: Callable,
+        url: str,
+        key: str,
+        prefetch: bool,
+        **kwargs: Any,
+    ) -> Iterator[Any]:
+        failed_pages = []
+        pages = 0
+        for page, page_body in self._iter_pages(request_func, url, prefetch, **kwargs):
+            pages += 1
+            if page_body is None:
+                failed_pages.append(page)
             else:
+                yield from page_body.get(key, [])
+        self._log_failed_pages(url, failed_pages, pages)
+
+    def _iter_pages(
+        self, request_func: Callable, url: str, prefetch: bool, **kwargs: Any
+    ) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+        kwargs = self._add_paging(**kwargs)
+
+        def get_page(page: int) -> Optional[Dict[str, Any]]:
+            return self._get_page(request_func, url, page, **kwargs)
+
+        page_body = get_page(0)
+        pages = 1 if page_body is None else self._page_count(page_body, **kwargs)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for page in range(pages):
+                last_page = page + 1 == pages
+                if prefetch and not last_page:
+                    next_page = executor.submit(get_page, page + 1)
+                yield page, page_body
+                if not last_page:
+                    page_body = next_page.result() if prefetch else get_page(page + 1)
+
+    def _get_page(
+        self, request_func: Callable, url: str, page: int, **kwargs: Any
+    ) -> Optional[Dict[str, Any]]:
+        kwargs = self._page_request(page, **kwargs)
+        try:
+            with self._request_wrapper(
+                request_func, url, idempotent=True, **kwargs
+            ) as response:
+                if response.status_code < 300:
+                    return response.json()  # type: ignore[no-any-return]
                 # _request_wrapper will log the error
-                # TODO: How should we communicate to caller that
-                #       request(s) have failed?
-                return {key: []}
-        total_objects = int(
-            page_0_body.get("pageInfo", {"totalCount": 1}).get("totalCount", 1)
-        )
-        page_size = kwargs["params"]["pageSize"]
-        remaining_pages = math.ceil(total_objects / page_size) - 1
-        objects = page_0_body.get(key, [])
-        while remaining_pages > 0:
-            kwargs = self._add_paging(page=remaining_pages, **kwargs)
-            with self._request_wrapper(request_func, url, **kwargs) as page_n:
-                if page_n.status_code < 300:
-                    page_n_body = json.loads(page_n.text)
-            objects.extend(page_n_body.get(key, []))
-            remaining_pages -= 1
-        return {key: objects}
+                return None
+        except (requests.RequestException, ValueError) as e:
+            if page == 0:
+                raise
+            logger.warning(f"Could not retrieve page {page} of {url}: {e}")
+            return None
+
+    def _renew_token(self, rejected_token: str) -> bool:
+        # Pages may be requested concurrently, so only the first request that is
+        # rejected acquires a new token
+        with self._token_lock:
+            if self.token == rejected_token:
+                logger.info("Cached token was rejected, acquiring a new token")
+                self._uncache_token()
+                self.token = ""
+                self.get_token()
+        return self.token not in ("", rejected_token)
 
     def _request_wrapper(
-        self, request_func: Callable[..., Response], url: str, **kwargs: Any
+        self,
+        request_func: Callable[..., Response],
+        url: str,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
     ) -> Response:
         kwargs = self._to_vrops_request(url, **kwargs)
-        result = request_func(**kwargs)
+        token = self.token
+        result = self._send(request_func, idempotent, **kwargs)
+        if self._should_renew_token(
+            result.status_code, kwargs["url"], token
+        ) and self._renew_token(token):
+            result.close()
+            # Send the request again with the new token
+            result = self._send(
+                request_func, idempotent, **self._to_vrops_request(**kwargs)
+            )
         if result.ok:
             logger.info(
                 f"{request_func.__name__} {kwargs['url']}: OK({result.status_code})"
@@ -351,30 +836,48 @@ class SuiteApiClient:
         logger.debug(result.text)
         return result
 
-    def _to_vrops_request(self, url: str, **kwargs: Any) -> dict:
-        kwargs.setdefault("url", url)
-        kwargs.setdefault("headers", {})
-        if self.token:
-            kwargs["headers"]["Authorization"] = "vRealizeOpsToken " + self.token
-        kwargs["headers"].setdefault("Accept", "application/json")
-        kwargs.setdefault("verify", False)
-
-        url = kwargs["url"]
-        if "internal/" in url:
-            kwargs["headers"]["X-vRealizeOps-API-use-unsupported"] = "true"
-            logger.info(f"Using unsupported API: {url}")
-        if url.startswith("http"):
-            return kwargs
-
-        if url.startswith("/"):
-            url = url[1:]
-        if url.startswith("suite-api/"):
-            url = url[10:]
-        elif url.startswith("api") or url.startswith("internal"):
-            kwargs["url"] = self.credential.host + url
-        else:
-            kwargs["url"] = self.credential.host + "api/" + url
-        return kwargs
+    def _send(
+        self,
+        request_func: Callable[..., Response],
+        idempotent: Optional[bool],
+        **kwargs: Any,
+    ) -> Response:
+        method = request_func.__name__.upper()
+        retries = 0
+        while True:
+            try:
+                # The rate limit is waited for before taking an in-flight slot, so
+                # that waiting requests do not hold slots that other requests
+                # could send with
+                time.sleep(self.scheduler.delay())
+                with self.scheduler.in_flight():
+                    result = request_func(**kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = self.scheduler.retry_delay(
+                    method, retries, None, idempotent=idempotent
+                )
+                if delay is None:
+                    raise
+                logger.warning(
+                    f"{method} {kwargs['url']}: {e}. Retrying in {delay:.1f} s"
+                )
+            else:
+                delay = self.scheduler.retry_delay(
+                    method,
+                    retries,
+                    result.status_code,
+                    result.headers.get("Retry-After"),
+                    idempotent,
+                )
+                if delay is None:
+                    return result
+                logger.warning(
+                    f"{method} {kwargs['url']}: ERROR({result.status_code}). Retrying "
+                    f"in {delay:.1f} s"
+                )
+                result.close()
+            retries += 1
+            time.sleep(delay)
 
 
 # Helper methods:
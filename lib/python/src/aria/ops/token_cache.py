@@ -0,0 +1,166 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_CACHE_FILE = "aria-ops-suite-api-tokens.json"
+
+# Tokens are renewed when they expire within this many seconds, so that a token
+# does not expire during a collection
+DEFAULT_RENEWAL_MARGIN = 600
+
+# The lifetime assumed for tokens if the Suite API does not report their validity
+DEFAULT_TOKEN_LIFETIME = 1800
+
+
+class TokenCache:
+    """A cache of Suite API tokens that persists between collections.
+
+    Each collection runs in a new process, so by default every collection acquires
+    a new Suite API token and releases it when it finishes. When a SuiteApiClient
+    is given a TokenCache, it reuses an unexpired token from the cache instead, and
+    does not release the token when it exits, so that the next collection can reuse
+    it. Tokens are renewed ahead of their expiry, and re-acquired if the Suite API
+    rejects them.
+
+    Tokens are stored by host, user and authentication source, in a file that is
+    only readable by the current user. It is stored in the system's temporary
+    directory by default, rather than with the logs, to keep tokens out of support
+    bundles.
+
+    To reuse the tokens of an adapter instance's Suite API client, set its token
+    cache before using it:
+        adapter_instance.suite_api_client.token_cache = TokenCache()
+        with adapter_instance.suite_api_client as suite_api_client:
+            ...
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        renewal_margin: float = DEFAULT_RENEWAL_MARGIN,
+    ) -> None:
+        """Initializes a TokenCache
+
+        Args:
+            path (Optional[str]): Path to the cache file. It is created if it does
+                not exist. Defaults to 'aria-ops-suite-api-tokens.json' in the
+                system's temporary directory.
+            renewal_margin (float): Cached tokens that expire within this many
+                seconds are not used. Defaults to 10 minutes.
+        """
+        if path is None:
+            path = os.path.join(tempfile.gettempdir(), DEFAULT_TOKEN_CACHE_FILE)
+        self.path = path
+        self.renewal_margin = renewal_margin
+
+    def get(self, host: str, username: str, auth_source: str) -> Optional[str]:
+        """Get a cached token
+
+        Args:
+            host (str): The Suite API host the token is for
+            username (str): The user the token is for
+            auth_source (str): The authentication source of the user
+
+        Returns:
+            The cached token, or None if there is no token that is valid for longer
+            than the renewal margin
+        """
+        entry = self._load().get(_cache_key(host, username, auth_source))
+        if entry is None:
+            return None
+        if entry["validity"] - self.renewal_margin <= time.time():
+            logger.debug(f"Cached Suite API token for {username}@{host} is expiring")
+            return None
+        return str(entry["token"])
+
+    def put(
+        self,
+        host: str,
+        username: str,
+        auth_source: str,
+        token: str,
+        validity: Optional[float] = None,
+    ) -> None:
+        """Add a token to the cache, replacing any existing token for the host and
+        user
+
+        Args:
+            host (str): The Suite API host the token is for
+            username (str): The user the token is for
+            auth_source (str): The authentication source of the user
+            token (str): The token
+            validity (Optional[float]): The time the token expires, in seconds since
+                the epoch. Defaults to 30 minutes from now.
+        """
+        if validity is None:
+            validity = time.time() + DEFAULT_TOKEN_LIFETIME
+        tokens = self._load()
+        tokens[_cache_key(host, username, auth_source)] = {
+            "token": token,
+            "validity": validity,
+        }
+        self._store(tokens)
+
+    def remove(self, host: str, username: str, auth_source: str) -> None:
+        """Remove the token for the host and user from the cache, if there is one
+
+        Args:
+            host (str): The Suite API host the token is for
+            username (str): The user the token is for
+            auth_source (str): The authentication source of the user
+        """
+        tokens = self._load()
+        if tokens.pop(_cache_key(host, username, auth_source), None) is not None:
+            self._store(tokens)
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r") as cache_file:
+                tokens = json.load(cache_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read Suite API token cache '{self.path}': {e}")
+            return {}
+        # Drop expired tokens, so that the file does not grow
+        now = time.time()
+        return {
+            key: entry
+            for key, entry in tokens.items()
+            if isinstance(entry, dict) and entry.get("validity", 0) > now
+        }
+
+    def _store(self, tokens: Dict[str, Any]) -> None:
+        # Write to a new temporary file that is only accessible by the current user
+        # (mkstemp never opens an existing file), then replace the cache, so that
+        # other processes never read a partial file
+        temporary_path = None
+        try:
+            descriptor, temporary_path = tempfile.mkstemp(
+                suffix=".tmp", dir=os.path.dirname(os.path.abspath(self.path))
+            )
+            with os.fdopen(descriptor, "w") as cache_file:
+                json.dump(tokens, cache_file)
+            os.replace(temporary_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write Suite API token cache '{self.path}': {e}")
+            if temporary_path is not None:
+                try:
+                    os.unlink(temporary_path)
+                except OSError:
+                    pass
+
+
+def _cache_key(host: str, username: str, auth_source: str) -> str:
+    return f"{auth_source}/{username}@{host}"
@@ -0,0 +1,153 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+import pytest
+
+
+class FakeSuiteApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "FakeSuiteApi"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def send_json(
+        self, body: Any, status: int = 200, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        self.handle_request(None)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length)) if length else None
+        self.handle_request(body)
+
+    def handle_request(self, body: Any) -> None:
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        authorization = self.headers.get("Authorization", "")
+        token = authorization[len("vRealizeOpsToken ") :]
+        with self.server.lock:
+            self.server.requests.append((self.command, url.path, params, body))
+            error = None
+            if self.server.errors and "/auth/token/" not in url.path:
+                error = self.server.errors.pop(0)
+            if error is not None:
+                self.send_json({"message": "error"}, *error)
+                return
+            if url.path.endswith("/api/auth/token/acquire"):
+                self.server.tokens.add("token")
+            elif authorization and token not in self.server.tokens:
+                self.send_json({"message": "unauthorized"}, 401)
+                return
+            elif url.path.endswith("/api/auth/token/release"):
+                self.server.tokens.discard(token)
+        if url.path.endswith("/api/auth/token/acquire"):
+            self.send_json(
+                {"token": "token", "validity": int((time.time() + 1800) * 1000)}
+            )
+        elif url.path.endswith("/api/auth/token/release"):
+            self.send_json({})
+        elif url.path.endswith("/api/resources/query") or url.path.endswith(
+            "/api/resources"
+        ):
+            page = int(params.get("page", 0))
+            page_size = int(params.get("pageSize", 1000))
+            if page in self.server.failing_pages:
+                self.send_json({"message": "error"}, 500)
+                return
+            start = page * page_size
+            end = min(start + page_size, len(self.server.resources))
+            self.send_json(
+                {
+                    "pageInfo": {
+                        "totalCount": len(self.server.resources),
+                        "page": page,
+                        "pageSize": page_size,
+                    },
+                    "resourceList": self.server.resources[start:end],
+                }
+            )
+        else:
+            self.send_json({"message": "not found"}, 404)
+
+
+class FakeSuiteApi(ThreadingHTTPServer):
+    """A minimal Suite API, serving token acquisition and release and a paged
+    resource query. Requests with a token that has not been acquired, or has been
+    released, are rejected."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FakeSuiteApiHandler)
+        self.host = f"http://127.0.0.1:{self.server_address[1]}"
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests: List[tuple] = []
+        self.tokens: Set[str] = set()
+        self.failing_pages: List[int] = []
+        # Status codes and headers of error responses to send to the next requests,
+        # other than token requests
+        self.errors: List[Tuple[int, Dict[str, str]]] = []
+        self.resources: List[Dict[str, Any]] = [resource(i) for i in range(25)]
+
+
+def resource(i: int) -> Dict[str, Any]:
+    return {
+        "identifier": f"id-{i}",
+        "resourceKey": {
+            "name": f"resource-{i}",
+            "adapterKindKey": "Adapter",
+            "resourceKindKey": "Resource",
+            "resourceIdentifiers": [
+                {
+                    "identifierType": {"name": "id", "isPartOfUniqueness": True},
+                    "value": str(i),
+                }
+            ],
+        },
+    }
+
+
+@pytest.fixture
+def suite_api() -> Iterator[FakeSuiteApi]:
+    server = FakeSuiteApi()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
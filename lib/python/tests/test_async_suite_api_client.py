@@ -0,0 +1,190 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import asyncio
+
+import pytest
+from aria.ops.adapter_instance import AdapterInstance
+from aria.ops.request_scheduler import RequestScheduler
+from aria.ops.response_cache import ResponseCache
+from aria.ops.suite_api_client import SuiteApiConnectionParameters
+from aria.ops.token_cache import TokenCache
+
+httpx = pytest.importorskip("httpx")
+
+from aria.ops.async_suite_api_client import AsyncSuiteApiClient  # noqa: E402
+
+
+def client(suite_api, **kwargs) -> AsyncSuiteApiClient:
+    return AsyncSuiteApiClient(
+        SuiteApiConnectionParameters(suite_api.host, "user", "password"), **kwargs
+    )
+
+
+def test_token(suite_api) -> None:
+    async def run() -> AsyncSuiteApiClient:
+        async with client(suite_api) as suite_api_client:
+            assert suite_api_client.token == "token"
+            response = await suite_api_client.get("/api/resources")
+            assert response.status_code == 200
+        return suite_api_client
+
+    assert asyncio.run(run()).token == ""
+    assert [request[1] for request in suite_api.requests] == [
+        "/suite-api/api/auth/token/acquire",
+        "/suite-api/api/resources",
+        "/suite-api/api/auth/token/release",
+    ]
+
+
+def test_paged_request(suite_api) -> None:
+    suite_api.failing_pages = [3]
+
+    async def run() -> dict:
+        async with client(suite_api, page_concurrency=2) as suite_api_client:
+            return await suite_api_client.paged_post(
+                "/api/resources/query", "resourceList", json={}, pageSize=4
+            )
+
+    result = asyncio.run(run())
+    assert result == {
+        "resourceList": suite_api.resources[0:12] + suite_api.resources[16:25],
+        "failedPages": [3],
+    }
+
+
+def test_query_for_resources_by_name(suite_api) -> None:
+    async def run() -> list:
+        async with client(suite_api) as suite_api_client:
+            return await suite_api_client.query_for_resources(
+                {"name": ["a", "b", "c"], "regex": ["ignored"]}
+            )
+
+    objects = asyncio.run(run())
+    # The fake Suite API ignores the query, so each name returns all resources
+    assert len(objects) == 75
+    queries = [
+        request[3]
+        for request in suite_api.requests
+        if request[1].endswith("/api/resources/query")
+    ]
+    assert sorted(query["name"][0] for query in queries) == ["a", "b", "c"]
+
+
+def test_adapter_instance() -> None:
+    adapter_instance = AdapterInstance(
+        {
+            "cluster_connection_info": {
+                "user_name": "user",
+                "password": "password",
+                "host_name": "localhost",
+            }
+        }
+    )
+    async_client = adapter_instance.get_async_suite_api_client()
+    assert isinstance(async_client, AsyncSuiteApiClient)
+    assert async_client.credential is adapter_instance.suite_api_client.credential
+    asyncio.run(async_client.close())
+    assert AdapterInstance({}).get_async_suite_api_client() is None
+
+
+def test_iter_paged_post(suite_api) -> None:
+    suite_api.failing_pages = [3]
+
+    async def run() -> list:
+        async with client(suite_api) as suite_api_client:
+            return [
+                resource
+                async for resource in suite_api_client.iter_paged_post(
+                    "/api/resources/query", "resourceList", json={}, pageSize=4
+                )
+            ]
+
+    resources = asyncio.run(run())
+    assert resources == suite_api.resources[0:12] + suite_api.resources[16:25]
+
+
+def test_iter_resources_stops_early(suite_api) -> None:
+    async def run() -> list:
+        names = []
+        async with client(suite_api) as suite_api_client:
+            async for obj in suite_api_client.iter_resources({}, prefetch=False):
+                names.append(obj.get_key().name)
+                if len(names) == 3:
+                    break
+        return names
+
+    assert asyncio.run(run()) == ["resource-0", "resource-1", "resource-2"]
+    assert [
+        request[2]["page"]
+        for request in suite_api.requests
+        if request[1].endswith("/api/resources/query")
+    ] == ["0"]
+
+
+def test_rejected_cached_token_is_renewed(suite_api, tmp_path) -> None:
+    token_cache = TokenCache(str(tmp_path / "tokens.json"))
+    async_client = client(suite_api, token_cache=token_cache)
+    token_cache.put(async_client.credential.host, "user", "LOCAL", "stale")
+
+    async def run() -> list:
+        async with async_client as suite_api_client:
+            assert suite_api_client.token == "stale"
+            return await suite_api_client.query_for_resources({"name": ["a", "b"]})
+
+    assert len(asyncio.run(run())) == 50
+    assert async_client.token == ""
+    assert [
+        request[1] for request in suite_api.requests if "/auth/token/" in request[1]
+    ] == ["/suite-api/api/auth/token/acquire"]
+
+
+def test_cached_query_for_resources(suite_api, tmp_path) -> None:
+    response_cache = ResponseCache(str(tmp_path / "responses.db"))
+
+    async def run() -> list:
+        async with client(suite_api, response_cache=response_cache) as suite_api_client:
+            return await suite_api_client.query_for_resources(
+                {"name": ["a", "b"]}, cache_ttl=60
+            )
+
+    assert len(asyncio.run(run())) == 50
+    assert len(asyncio.run(run())) == 50
+    assert (
+        sum(1 for request in suite_api.requests if "/api/resources" in request[1]) == 2
+    )
+
+
+def test_rejected_requests_are_retried(suite_api) -> None:
+    suite_api.errors = [(429, {"Retry-After": "0"}), (503, {})]
+    scheduler = RequestScheduler(backoff=0.01, max_in_flight=2)
+
+    async def run() -> dict:
+        async with client(suite_api, scheduler=scheduler) as suite_api_client:
+            return await suite_api_client.paged_post(
+                "/api/resources/query", "resourceList", json={}, pageSize=5
+            )
+
+    result = asyncio.run(run())
+    assert result == {"resourceList": suite_api.resources, "failedPages": []}
+
+
+def test_rate_limit_is_waited_for_without_an_in_flight_slot(suite_api) -> None:
+    scheduler = RequestScheduler(max_in_flight=1)
+    held = []
+
+    async def run() -> None:
+        async with client(suite_api, scheduler=scheduler) as suite_api_client:
+            delay = scheduler.delay
+
+            def checking_delay() -> float:
+                semaphore = suite_api_client._in_flight
+                held.append(semaphore is not None and semaphore.locked())
+                return delay()
+
+            scheduler.delay = checking_delay  # type: ignore[method-assign]
+            for _ in range(3):
+                response = await suite_api_client.get("/api/resources")
+                assert response.status_code == 200
+
+    asyncio.run(run())
+    assert len(held) >= 3 and not any(held)
@@ -1,11 +1,18 @@
 #  Copyright 2023 VMware, Inc.
 #  SPDX-License-Identifier: Apache-2.0
 import copy
+import json
+import sys
+from array import array
 from typing import Any
 from typing import Dict
 
+import pytest
 from aria.ops.definition.adapter_definition import AdapterDefinition
 from aria.ops.event import Criticality
+from aria.ops.object import Identifier
+from aria.ops.object import Key
+from aria.ops.object import Object
 from aria.ops.result import CollectResult
 from aria.ops.result import RelationshipUpdateModes
 
@@ -359,3 +366,166 @@ def test_get_json_2_objects_relationships_per_object2() -> None:
         },
     ]
     assert result.get_json() == expected_result
+
+
+def populated_result(
+    update_relationships: RelationshipUpdateModes, stream: bool = False
+) -> CollectResult:
+    result = CollectResult(
+        target_definition=AdapterDefinition("Adapter"), stream=stream
+    )
+    result.update_relationships = update_relationships
+    obj1 = result.object(
+        "Adapter", "Object", "Name1", [Identifier("id", "1"), Identifier("ü", "ß")]
+    )
+    obj1.with_metric("metric", 1, 1000)
+    obj1.with_metric("metric", 0.1 + 0.2, 2000)
+    obj1.with_property("property", 1, 1000)
+    obj1.with_property("name", 'Ω "quoted"\n', 1000)
+    obj1.with_event("event message", Criticality.WARNING)
+    obj2 = result.object("Adapter", "Object", "Name2")
+    obj1.add_child(obj2)
+    # External objects are only sent if they have content
+    result.object("OtherAdapter", "Object", "External1")
+    external = result.object("OtherAdapter", "Object", "External2")
+    external.with_property("property", "value", 1000)
+    obj2.add_parent(external)
+    return result
+
+
+def test_iter_json_matches_get_json() -> None:
+    for mode in [
+        RelationshipUpdateModes.ALL,
+        RelationshipUpdateModes.NONE,
+        RelationshipUpdateModes.AUTO,
+        RelationshipUpdateModes.PER_OBJECT,
+    ]:
+        result = populated_result(mode)
+        assert "".join(result.iter_json()) == json.dumps(result.get_json())
+
+
+def test_iter_json_empty_result() -> None:
+    result = CollectResult()
+    assert "".join(result.iter_json()) == json.dumps(result.get_json())
+
+
+def test_iter_json_error() -> None:
+    result = CollectResult()
+    result.object("Adapter", "Object", "Name")
+    result.with_error("Error")
+    assert "".join(result.iter_json()) == json.dumps(result.get_json())
+
+
+def test_send_results_streams_identical_output(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("ARIA_OPS_JSON_CODEC", "json")
+    output_pipe = tmp_path / "output_pipe"
+    result = populated_result(RelationshipUpdateModes.AUTO)
+    result.send_results(str(output_pipe))
+    with open(output_pipe, "rb") as f:
+        assert f.read() == json.dumps(result.get_json()).encode("utf-8")
+
+
+def test_send_results_orjson(tmp_path, monkeypatch) -> None:
+    pytest.importorskip("orjson")
+    monkeypatch.setenv("ARIA_OPS_JSON_CODEC", "orjson")
+    output_pipe = tmp_path / "output_pipe"
+    result = populated_result(RelationshipUpdateModes.AUTO)
+    result.send_results(str(output_pipe))
+    assert json.loads(output_pipe.read_bytes()) == result.get_json()
+
+
+def read_stream(path) -> list:
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_stream_sends_completed_objects(tmp_path, monkeypatch) -> None:
+    output_pipe = tmp_path / "output_pipe"
+    monkeypatch.setattr(sys, "argv", ["adapter.py", "collect", "in", str(output_pipe)])
+    expected = populated_result(RelationshipUpdateModes.AUTO).get_json()
+
+    result = populated_result(RelationshipUpdateModes.AUTO, stream=True)
+    obj1 = result.object(
+        "Adapter", "Object", "Name1", [Identifier("id", "1"), Identifier("ü", "ß")]
+    )
+    result.complete(obj1)
+    # Content is released once the object has been sent
+    assert not obj1.has_content()
+    assert read_stream(output_pipe) == []  # Still buffered
+
+    result.send_results()
+    records = read_stream(output_pipe)
+    assert records[0] == {"stream": "aria.ops.objects", "version": 1}
+    assert records[-1] == {"end": True}
+    assert [r["object"] for r in records if "object" in r] == expected["result"]
+    assert [r["relationship"] for r in records if "relationship" in r] == expected[
+        "relationships"
+    ]
+
+
+def test_stream_error(tmp_path, monkeypatch) -> None:
+    output_pipe = tmp_path / "output_pipe"
+    monkeypatch.setattr(sys, "argv", ["adapter.py", "collect", "in", str(output_pipe)])
+    result = CollectResult(stream=True)
+    result.complete(result.object("Adapter", "Object", "Name"))
+    result.with_error("Error")
+    result.send_results()
+    assert read_stream(output_pipe)[-2:] == [{"errorMessage": "Error"}, {"end": True}]
+
+
+def test_complete_without_stream() -> None:
+    result = CollectResult()
+    obj = result.object("Adapter", "Object", "Name")
+    obj.with_metric("metric", 1, 1000)
+    result.complete(obj)
+    assert obj.has_content()
+
+
+def test_with_metric_columns() -> None:
+    result = CollectResult()
+    objects = [result.object("Adapter", "Object", f"Name{i}") for i in range(3)]
+    result.with_metric_columns(
+        objects, {"a": [1, 2, 3], "b": array("d", [4, 5, 6])}, 1000
+    )
+
+    expected = CollectResult()
+    for i, values in enumerate([(1, 4), (2, 5), (3, 6)]):
+        obj = expected.object("Adapter", "Object", f"Name{i}")
+        obj.with_metric("a", values[0], 1000)
+        obj.with_metric("b", values[1], 1000)
+    assert result.get_json() == expected.get_json()
+
+
+def test_with_metric_columns_length_mismatch() -> None:
+    result = CollectResult()
+    objects = [result.object("Adapter", "Object", f"Name{i}") for i in range(3)]
+    with pytest.raises(ValueError):
+        result.with_metric_columns(objects, {"a": [1, 2, 3], "b": [4, 5]})
+    assert not any(obj.has_content() for obj in objects)
+
+
+def test_get_objects_by_type() -> None:
+    result = CollectResult()
+    obj1 = result.object("Adapter", "Object", "Name1")
+    other = result.object("Adapter", "Other", "Name2")
+    obj2 = result.add_object(Object(Key("Adapter2", "Object", "Name3")))
+    obj3 = result.object("Adapter", "Object", "Name4")
+    result.add_object(obj1)
+
+    assert result.get_objects_by_type("Object") == [obj1, obj2, obj3]
+    assert result.get_objects_by_type("Object", "Adapter") == [obj1, obj3]
+    assert result.get_objects_by_type("Object", "Adapter2") == [obj2]
+    assert result.get_objects_by_type("Other") == [other]
+    assert result.get_objects_by_type("Adapter") == []
+
+
+def test_get_objects_by_identifier() -> None:
+    result = CollectResult()
+    obj1 = result.object("Adapter", "Object", "Name1", [Identifier("id", "1")])
+    obj2 = result.object("Adapter", "Other", "Name2", [Identifier("id", "1")])
+    assert result.get_objects_by_identifier("id", "1") == [obj1, obj2]
+
+    # Objects added after the first lookup are also indexed
+    obj3 = result.object("Adapter", "Object", "Name3", [Identifier("id", "2")])
+    assert result.get_objects_by_identifier("id", "2") == [obj3]
+    assert result.get_objects_by_identifier("id", "3") == []
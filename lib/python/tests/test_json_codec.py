@@ -0,0 +1,64 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import json
+
+import pytest
+from aria.ops.json_codec import get_codec
+from aria.ops.json_codec import JsonCodec
+from aria.ops.json_codec import OrjsonCodec
+
+
+def test_default_codec(monkeypatch) -> None:
+    monkeypatch.delenv("ARIA_OPS_JSON_CODEC", raising=False)
+    try:
+        import orjson  # noqa: F401
+
+        assert get_codec().name == "orjson"
+    except ImportError:
+        assert get_codec().name == "json"
+
+
+def test_select_codec(monkeypatch) -> None:
+    monkeypatch.setenv("ARIA_OPS_JSON_CODEC", "json")
+    assert get_codec().name == "json"
+
+
+def test_unknown_codec(monkeypatch) -> None:
+    monkeypatch.setenv("ARIA_OPS_JSON_CODEC", "unknown")
+    assert get_codec().name == "json"
+
+
+def test_json_codec() -> None:
+    codec = JsonCodec()
+    document = {"key": "välue", "values": [1, 2.5, None, True]}
+    assert codec.dumps(document) == json.dumps(document).encode("utf-8")
+    assert codec.loads(codec.dumps(document)) == document
+
+
+def test_orjson_codec() -> None:
+    pytest.importorskip("orjson")
+    codec = OrjsonCodec()
+    document = {"key": "välue", "values": [1, 2.5, None, True]}
+    assert json.loads(codec.dumps(document)) == document
+    assert codec.loads(json.dumps(document)) == document
+
+
+def test_orjson_codec_fallback() -> None:
+    pytest.importorskip("orjson")
+    codec = OrjsonCodec()
+    # Not supported by orjson
+    assert codec.loads(codec.dumps({"big": 2**70, 1: "int key"})) == {
+        "big": 2**70,
+        "1": "int key",
+    }
+    assert codec.loads(b'{"value": NaN}')["value"] != 0
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_orjson_codec_non_finite_floats(value) -> None:
+    pytest.importorskip("orjson")
+    codec = OrjsonCodec()
+    document = {"metrics": [{"key": "m", "numberValue": value, "other": None}]}
+    # Encoded as the 'json' module does, not as null
+    assert codec.dumps(document) == JsonCodec().dumps(document)
+    assert codec.loads(codec.dumps(document))["metrics"][0]["numberValue"] is not None
@@ -0,0 +1,108 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+from array import array
+
+import pytest
+from aria.ops.data import Metric
+from aria.ops.data import Property
+from aria.ops.object import Identifier
+from aria.ops.object import Key
+from aria.ops.object import Object
+
+
+def new_object() -> Object:
+    return Object(Key("Adapter", "Object", "Name"))
+
+
+def test_get_metric() -> None:
+    obj = new_object()
+    obj.with_metric("a", 1, 2000)
+    obj.with_metric("b", 2, 1000)
+    obj.add_metric(Metric("a", 3, 1000))
+    assert [(m.key, m.value, m.timestamp) for m in obj.get_metric("a")] == [
+        ("a", 1.0, 2000),
+        ("a", 3.0, 1000),
+    ]
+    assert obj.get_metric("c") == []
+
+
+def test_get_metric_values_chronological() -> None:
+    obj = new_object()
+    obj.with_metric("a", 1, 2000)
+    obj.with_metric("a", 2, 1000)
+    obj.with_metric("a", 3, 3000)
+    obj.with_metric("a", 4, 1000)
+    assert obj.get_metric_values("a") == [2.0, 4.0, 1.0, 3.0]
+    assert obj.get_last_metric_value("a") == 3.0
+    assert obj.get_metric_values("b") == []
+    assert obj.get_last_metric_value("b") is None
+
+
+def test_get_last_metric_value_same_timestamp() -> None:
+    obj = new_object()
+    obj.with_metric("a", 1, 1000)
+    obj.with_metric("a", 2, 1000)
+    assert obj.get_last_metric_value("a") == 2.0
+
+
+def test_metrics_get_json() -> None:
+    obj = new_object()
+    obj.with_metric("a", 1, 1000)
+    obj.with_metric("b", 2.5, 1000)
+    obj.with_metric("a", 3, 2000)
+    assert obj.get_json()["metrics"] == [
+        {"key": "a", "numberValue": 1.0, "timestamp": 1000},
+        {"key": "b", "numberValue": 2.5, "timestamp": 1000},
+        {"key": "a", "numberValue": 3.0, "timestamp": 2000},
+    ]
+    assert obj.has_content()
+
+
+def test_with_metrics() -> None:
+    obj = new_object()
+    obj.with_metric("a", 1, 500)
+    obj.with_metrics(["a", "b"], [2, 3.5], 1000)
+    obj.with_metrics(["b"], array("d", [4]), 2000)
+    obj.with_metrics(["c"], ["5"], 2000)
+    assert obj.get_metric_values("a") == [1.0, 2.0]
+    assert obj.get_metric_values("b") == [3.5, 4.0]
+    assert obj.get_last_metric_value("c") == 5.0
+    assert obj.get_json()["metrics"] == [
+        {"key": "a", "numberValue": 1.0, "timestamp": 500},
+        {"key": "a", "numberValue": 2.0, "timestamp": 1000},
+        {"key": "b", "numberValue": 3.5, "timestamp": 1000},
+        {"key": "b", "numberValue": 4.0, "timestamp": 2000},
+        {"key": "c", "numberValue": 5.0, "timestamp": 2000},
+    ]
+
+
+def test_with_metrics_length_mismatch() -> None:
+    obj = new_object()
+    with pytest.raises(ValueError):
+        obj.with_metrics(["a", "b"], [1.0])
+    assert not obj.has_content()
+
+
+def test_metric_lookup_between_adds() -> None:
+    obj = new_object()
+    obj.with_metric("a", 1, 1000)
+    assert obj.get_last_metric_value("a") == 1.0
+    obj.with_metric("a", 2, 500)
+    obj.with_metrics(["a", "b"], [3, 4], 2000)
+    assert obj.get_metric_values("a") == [2.0, 1.0, 3.0]
+    assert obj.get_last_metric_value("b") == 4.0
+
+
+def test_compact_instances() -> None:
+    # Collections can contain millions of these; they should not have a '__dict__'
+    obj = new_object()
+    obj.with_metric("a", 1)
+    for instance in [
+        obj,
+        obj.get_key(),
+        Identifier("id", "1"),
+        Metric("a", 1),
+        Property("p", "value"),
+        obj._metrics,
+    ]:
+        assert not hasattr(instance, "__dict__")
@@ -1,7 +1,12 @@
 #  Copyright 2023 VMware, Inc.
 #  SPDX-License-Identifier: Apache-2.0
+import copy
+import pickle
+
+import pytest
 from aria.ops.object import Identifier
 from aria.ops.object import Key
+from aria.ops.result import CollectResult
 
 
 def test_get_identifier() -> None:
@@ -44,3 +49,71 @@ def test_get_empty_identifier_with_default() -> None:
     identifier2 = Identifier("key2", "value2")
     key = Key("adapter_kind", "object_kind", "name", [identifier1, identifier2])
     assert key.get_identifier("key1", "default") == "default"
+
+
+def test_key_equality_ignores_identifier_order() -> None:
+    key1 = Key(
+        "adapter_kind",
+        "object_kind",
+        "name1",
+        [Identifier("a", "1"), Identifier("b", "2")],
+    )
+    key2 = Key(
+        "adapter_kind",
+        "object_kind",
+        "name2",
+        [Identifier("b", "2"), Identifier("a", "1")],
+    )
+    assert key1 == key2
+    assert hash(key1) == hash(key2)
+
+
+def test_key_equality_ignores_non_unique_identifiers() -> None:
+    key1 = Key("adapter_kind", "object_kind", "name", [Identifier("a", "1", False)])
+    key2 = Key("adapter_kind", "object_kind", "name", [Identifier("a", "2", False)])
+    key3 = Key("adapter_kind", "object_kind", "other", [Identifier("a", "1", False)])
+    assert key1 == key2
+    assert key1 != key3
+
+
+def test_key_is_immutable() -> None:
+    key = Key("adapter_kind", "object_kind", "name", [Identifier("a", "1")])
+    with pytest.raises(AttributeError):
+        key.name = "other"  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        key.identifiers["b"] = Identifier("b", "2")  # type: ignore[index]
+    with pytest.raises(AttributeError):
+        key.identifiers["a"].value = "2"  # type: ignore[misc]
+
+
+def test_key_copies_are_shared() -> None:
+    key = Key("adapter_kind", "object_kind", "name", [Identifier("a", "1")])
+    assert copy.deepcopy(key) is key
+    assert pickle.loads(pickle.dumps(key)) == key
+    assert pickle.loads(pickle.dumps(key)).get_json() == key.get_json()
+
+
+def test_result_shares_keys() -> None:
+    result = CollectResult()
+    obj = result.object("adapter_kind", "object_kind", "name", [Identifier("a", "1")])
+    assert (
+        result.object("adapter_kind", "object_kind", "name", [Identifier("a", "1")])
+        is obj
+    )
+    parent = result.object("adapter_kind", "object_kind", "parent")
+    parent.add_child(obj)
+    assert next(iter(parent.get_children())) is obj.get_key()
+    assert next(iter(result.objects)) is obj.get_key()
+
+
+def test_key_json_can_be_modified() -> None:
+    key = Key("adapter_kind", "object_kind", "name", [Identifier("a", "1")])
+    result = CollectResult()
+    result.object("adapter_kind", "object_kind", "name", [Identifier("a", "1")])
+    key_json = key.get_json()
+    key_json["name"] = "other"
+    key_json["identifiers"][0]["value"] = "2"
+    result.get_json()["result"][0]["key"]["name"] = "other"
+    assert key.get_json()["name"] == "name"
+    assert key.get_json()["identifiers"][0]["value"] == "1"
+    assert '"name": "name"' in "".join(result.iter_json())
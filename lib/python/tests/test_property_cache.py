@@ -0,0 +1,191 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import json
+import os
+import sys
+from typing import List
+from typing import Optional
+
+import pytest
+from aria.ops.adapter_instance import AdapterInstance
+from aria.ops.object import Identifier
+from aria.ops.property_cache import PropertyCache
+from aria.ops.result import CollectResult
+
+
+def collect(
+    path: str,
+    collection_number: Optional[int],
+    values: dict,
+    full_refresh_interval: int = 10,
+    send: bool = True,
+) -> List[dict]:
+    result = CollectResult(
+        property_cache=PropertyCache(path, collection_number, full_refresh_interval)
+    )
+    for name, properties in values.items():
+        obj = result.object("Adapter", "Object", name, [Identifier("id", name)])
+        obj.with_metric("metric", 1.0, 1000)
+        for key, value in properties.items():
+            obj.with_property(key, value, 1000)
+    if send:
+        result.send_results(path + ".output")
+        with open(path + ".output") as f:
+            return [obj["properties"] for obj in json.load(f)["result"]]
+    return [obj["properties"] for obj in result.get_json()["result"]]
+
+
+def keys(properties: List[dict]) -> List[str]:
+    return [property_["key"] for property_ in properties]
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "properties.cache")
+
+
+def test_unchanged_properties_are_not_sent(path) -> None:
+    values = {"a": {"ip": "10.0.0.1", "cores": 4}, "b": {"ip": "10.0.0.2"}}
+    first = collect(path, 1, values)
+    assert [keys(p) for p in first] == [["ip", "cores"], ["ip"]]
+    assert collect(path, 2, values) == [[], []]
+
+
+def test_changed_properties_are_sent(path) -> None:
+    collect(path, 1, {"a": {"ip": "10.0.0.1", "cores": 4}})
+    second = collect(path, 2, {"a": {"ip": "10.0.0.1", "cores": 8}})
+    assert second == [[{"key": "cores", "numberValue": 8.0, "timestamp": 1000}]]
+    # A property whose value changed back is sent again
+    third = collect(path, 3, {"a": {"ip": "10.0.0.1", "cores": 4}})
+    assert keys(third[0]) == ["cores"]
+    # String and number values with the same representation are distinct
+    fourth = collect(path, 4, {"a": {"ip": "10.0.0.1", "cores": "4.0"}})
+    assert keys(fourth[0]) == ["cores"]
+
+
+def test_new_objects_are_sent(path) -> None:
+    collect(path, 1, {"a": {"ip": "10.0.0.1"}})
+    second = collect(path, 2, {"a": {"ip": "10.0.0.1"}, "b": {"ip": "10.0.0.1"}})
+    assert second == [[], [{"key": "ip", "stringValue": "10.0.0.1", "timestamp": 1000}]]
+
+
+def test_full_refresh(path) -> None:
+    values = {"a": {"ip": "10.0.0.1"}}
+    collect(path, 1, values, full_refresh_interval=3)
+    assert collect(path, 2, values, full_refresh_interval=3) == [[]]
+    assert keys(collect(path, 3, values, full_refresh_interval=3)[0]) == ["ip"]
+    assert collect(path, 4, values, full_refresh_interval=3) == [[]]
+    # Without a collection number, every collection is a full refresh
+    assert keys(collect(path, None, values)[0]) == ["ip"]
+
+
+def test_cache_is_only_committed_when_sent(path) -> None:
+    values = {"a": {"ip": "10.0.0.1"}}
+    collect(path, 1, values)
+    # Not sent, so the changed value is not remembered
+    assert keys(collect(path, 2, {"a": {"ip": "10.0.0.2"}}, send=False)[0]) == ["ip"]
+    assert collect(path, 3, values) == [[]]
+
+    result = CollectResult(property_cache=PropertyCache(path, 4))
+    result.object("Adapter", "Object", "a").with_property("ip", "10.0.0.2")
+    result.with_error("error")
+    result.send_results(path + ".output")
+    assert collect(path, 5, values) == [[]]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_cache_is_not_committed_when_send_fails(path, tmp_path, stream) -> None:
+    collect(path, 1, {"a": {"ip": "10.0.0.1"}})
+    result = CollectResult(stream=stream, property_cache=PropertyCache(path, 2))
+    result.object("Adapter", "Object", "a", [Identifier("id", "a")]).with_property(
+        "ip", "10.0.0.2"
+    )
+    # The output pipe cannot be opened, so the changed value was never delivered
+    result.send_results(str(tmp_path / "missing" / "output"))
+    assert keys(collect(path, 3, {"a": {"ip": "10.0.0.2"}})[0]) == ["ip"]
+
+
+def test_hashes_are_recorded_once_per_object(path) -> None:
+    result = CollectResult(property_cache=PropertyCache(path, 1))
+    obj = result.object("Adapter", "Object", "a", [Identifier("id", "a")])
+    obj.with_property("ip", "10.0.0.1")
+    obj.with_property("cores", 4)
+    assert keys(result.get_json()["result"][0]["properties"]) == ["ip", "cores"]
+    result.send_results(path + ".output")
+    assert os.path.getsize(path) == len(b"ARIAPC\x00\x02") + 2 * 8
+    assert collect(path, 2, {"a": {"ip": "10.0.0.1", "cores": 4}}) == [[]]
+
+
+def test_invalid_cache_file(path) -> None:
+    values = {"a": {"ip": "10.0.0.1"}}
+    collect(path, 1, values)
+    with open(path, "ab") as f:
+        f.write(b"\x00")
+    assert keys(collect(path, 2, values)[0]) == ["ip"]
+    # The cache is replaced with a valid file
+    assert collect(path, 3, values) == [[]]
+
+
+def test_stream(path, monkeypatch) -> None:
+    monkeypatch.setattr(sys, "argv", ["adapter.py", "collect", "in", path + ".output"])
+    values = {"a": {"ip": "10.0.0.1"}, "b": {"ip": "10.0.0.2"}}
+    collect(path, 1, values)
+    result = CollectResult(stream=True, property_cache=PropertyCache(path, 2))
+    a = result.object("Adapter", "Object", "a", [Identifier("id", "a")])
+    a.with_property("ip", "10.0.0.1")
+    result.complete(a)
+    b = result.object("Adapter", "Object", "b", [Identifier("id", "b")])
+    b.with_property("ip", "10.0.0.3")
+    result.send_results()
+    with open(path + ".output") as f:
+        records = [json.loads(line) for line in f]
+    properties = [r["object"]["properties"] for r in records if "object" in r]
+    assert [keys(p) for p in properties] == [[], ["ip"]]
+    assert collect(path, 3, {"a": {"ip": "10.0.0.1"}, "b": {"ip": "10.0.0.3"}}) == [
+        [],
+        [],
+    ]
+
+
+def test_for_adapter_instance(tmp_path, monkeypatch) -> None:
+    def adapter_instance(name: str, collection_number: int) -> AdapterInstance:
+        return AdapterInstance(
+            {
+                "adapter_key": {
+                    "adapter_kind": "Adapter",
+                    "object_kind": "Instance",
+                    "name": name,
+                    "identifiers": [],
+                },
+                "collection_number": collection_number,
+            }
+        )
+
+    first = PropertyCache.for_adapter_instance(
+        adapter_instance("a", 0), directory=str(tmp_path)
+    )
+    assert first.full_refresh
+    assert first.path.startswith(str(tmp_path))
+    assert (
+        PropertyCache.for_adapter_instance(
+            adapter_instance("a", 1), directory=str(tmp_path)
+        ).path
+        == first.path
+    )
+    assert (
+        PropertyCache.for_adapter_instance(
+            adapter_instance("b", 1), directory=str(tmp_path)
+        ).path
+        != first.path
+    )
+    # Stored with the adapter instance's state by default
+    monkeypatch.setattr("aria.ops.state.DEFAULT_STATE_DIRECTORY", str(tmp_path))
+    instance = adapter_instance("a", 1)
+    assert os.path.dirname(
+        PropertyCache.for_adapter_instance(instance).path
+    ) == os.path.dirname(instance.state.path)
+
+
+def test_invalid_full_refresh_interval(path) -> None:
+    with pytest.raises(ValueError):
+        PropertyCache(path, 1, 0)
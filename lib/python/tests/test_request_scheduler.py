@@ -0,0 +1,112 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import email.utils
+import time
+
+import pytest
+from aria.ops.request_scheduler import RequestScheduler
+from aria.ops.suite_api_client import SuiteApiClient
+from aria.ops.suite_api_client import SuiteApiConnectionParameters
+
+
+def client(suite_api, **kwargs) -> SuiteApiClient:
+    return SuiteApiClient(
+        SuiteApiConnectionParameters(suite_api.host, "user", "password"),
+        scheduler=RequestScheduler(backoff=0.01, **kwargs),
+    )
+
+
+def test_rate_limit() -> None:
+    scheduler = RequestScheduler(rate=10, burst=2)
+    delays = [scheduler.delay() for _ in range(4)]
+    assert delays[:2] == [0, 0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_no_rate_limit() -> None:
+    scheduler = RequestScheduler()
+    assert all(scheduler.delay() == 0 for _ in range(100))
+
+
+@pytest.mark.parametrize(
+    "method,status_code,retry_after,retried",
+    [
+        ("POST", 429, None, True),
+        ("POST", 503, "1", True),
+        ("POST", 503, None, False),
+        ("POST", None, None, False),
+        ("GET", 503, None, True),
+        ("GET", 504, None, True),
+        ("GET", None, None, True),
+        ("GET", 500, None, False),
+        ("GET", 404, None, False),
+        ("GET", 200, None, False),
+        ("GET", 429, "120", False),
+    ],
+)
+def test_retry_policy(method, status_code, retry_after, retried) -> None:
+    scheduler = RequestScheduler()
+    delay = scheduler.retry_delay(method, 0, status_code, retry_after)
+    assert (delay is not None) == retried
+
+
+def test_backoff() -> None:
+    scheduler = RequestScheduler(max_retries=5, backoff=1, max_delay=4)
+    for retries, maximum in enumerate([1, 2, 4, 4, 4]):
+        delay = scheduler.retry_delay("GET", retries, 503)
+        assert delay is not None and 0 <= delay <= maximum
+    assert scheduler.retry_delay("GET", 5, 503) is None
+    assert scheduler.retry_delay("POST", 0, 503, idempotent=True) is not None
+
+
+def test_retry_after_pauses_requests() -> None:
+    scheduler = RequestScheduler()
+    assert scheduler.retry_delay("POST", 0, 429, "2") == 2
+    assert scheduler.delay() == pytest.approx(2, abs=0.05)
+    date = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert scheduler.retry_delay("GET", 0, 503, date) == pytest.approx(30, abs=1.5)
+
+
+def test_rejected_requests_are_retried(suite_api) -> None:
+    suite_api.errors = [(429, {"Retry-After": "0"}), (503, {})]
+    with client(suite_api) as suite_api_client:
+        with suite_api_client.get("/api/resources") as response:
+            assert response.ok
+        suite_api.errors = [(503, {})]
+        with suite_api_client.post("/api/resources/query", json={}) as response:
+            assert response.status_code == 503
+        suite_api.errors = [(429, {})] * 4
+        with suite_api_client.get("/api/resources") as response:
+            assert response.status_code == 429
+    # Three GETs, one POST and three retries
+    assert sum(1 for request in suite_api.requests if "/resources" in request[1]) == 8
+
+
+def test_failed_pages_are_retried(suite_api) -> None:
+    with client(suite_api, max_in_flight=2) as suite_api_client:
+        suite_api.errors = [(502, {}), (503, {}), (504, {})]
+        result = suite_api_client.paged_post(
+            "/api/resources/query", "resourceList", json={}, pageSize=5
+        )
+    assert result == {"resourceList": suite_api.resources, "failedPages": []}
+
+
+def test_rate_limit_is_waited_for_without_an_in_flight_slot(suite_api) -> None:
+    held = []
+    with client(suite_api, max_in_flight=1) as suite_api_client:
+        scheduler = suite_api_client.scheduler
+        delay = scheduler.delay
+
+        def checking_delay() -> float:
+            slot = scheduler.in_flight()
+            acquired = slot.acquire(blocking=False)
+            if acquired:
+                slot.release()
+            held.append(not acquired)
+            return delay()
+
+        scheduler.delay = checking_delay  # type: ignore[method-assign]
+        with suite_api_client.get("/api/resources") as response:
+            assert response.ok
+    assert held and not any(held)
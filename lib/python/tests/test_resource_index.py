@@ -0,0 +1,99 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import pytest
+from aria.ops.object import Identifier
+from aria.ops.object import Key
+from aria.ops.object import Object
+from aria.ops.resource_index import ResourceIndex
+from aria.ops.suite_api_client import SuiteApiClient
+from aria.ops.suite_api_client import SuiteApiConnectionParameters
+
+
+def resource(kind: str, name: str, uuid: str) -> dict:
+    return {
+        "identifier": f"id-{uuid}",
+        "resourceKey": {
+            "name": name,
+            "adapterKindKey": "VMWARE",
+            "resourceKindKey": kind,
+            "resourceIdentifiers": [
+                {
+                    "identifierType": {"name": "uuid", "isPartOfUniqueness": True},
+                    "value": uuid,
+                },
+                {
+                    "identifierType": {"name": "path", "isPartOfUniqueness": False},
+                    "value": f"/{name}",
+                },
+            ],
+        },
+    }
+
+
+RESOURCES = [
+    resource("VirtualMachine", "vm-1", "1"),
+    resource("VirtualMachine", "vm-2", "2"),
+    resource("HostSystem", "host", "3"),
+    resource("HostSystem", "vm-1", "4"),
+]
+
+
+def test_lookups() -> None:
+    index = ResourceIndex.from_resources(RESOURCES, identifier_keys=["uuid", "path"])
+    assert len(index) == 4
+    vm = index.get("uuid", "2")
+    assert vm is not None
+    assert vm.get_key().name == "vm-2"
+    assert vm.get_key().identifiers["path"].value == "/vm-2"
+    assert index.get("path", "/host") is index.get("uuid", "3")
+    assert index.get("uuid", "5") is None
+    assert [obj.get_key().object_kind for obj in index.get_by_name("vm-1")] == [
+        "VirtualMachine",
+        "HostSystem",
+    ]
+    assert [obj.get_key().name for obj in index.get_by_kind("HostSystem")] == [
+        "host",
+        "vm-1",
+    ]
+    assert index.get_by_kind("Datastore") == []
+    # Each resource has a single Object
+    assert set(map(id, index)) == set(
+        map(id, index.get_by_kind("VirtualMachine") + index.get_by_kind("HostSystem"))
+    )
+
+
+def test_unindexed_identifier() -> None:
+    index = ResourceIndex.from_resources(RESOURCES, identifier_keys=["uuid"])
+    with pytest.raises(ValueError):
+        index.get("path", "/host")
+
+
+def test_duplicate_resources() -> None:
+    index = ResourceIndex.from_resources(RESOURCES + RESOURCES, ["uuid"])
+    assert len(index) == 4
+    assert len(index.get_by_name("vm-1")) == 2
+
+
+def test_from_objects() -> None:
+    objects = [
+        Object(Key("Adapter", "Kind", f"object-{i}", [Identifier("id", str(i))]))
+        for i in range(3)
+    ]
+    index = ResourceIndex.from_objects(objects, ["id"])
+    assert index.get("id", "1") is objects[1]
+    assert objects[2].get_key() in index
+    assert list(index) == objects
+
+
+def test_index_resources(suite_api) -> None:
+    with SuiteApiClient(
+        SuiteApiConnectionParameters(suite_api.host, "user", "password")
+    ) as suite_api_client:
+        index = suite_api_client.index_resources(
+            {"adapterKind": ["Adapter"]}, identifier_keys=["id"]
+        )
+    assert len(index) == 25
+    obj = index.get("id", "7")
+    assert obj is not None
+    assert obj.get_key().name == "resource-7"
+    assert index.get_by_name("resource-7") == [obj]
@@ -0,0 +1,97 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import time
+
+from aria.ops.response_cache import ResponseCache
+from aria.ops.suite_api_client import SuiteApiClient
+from aria.ops.suite_api_client import SuiteApiConnectionParameters
+
+
+def client(suite_api, response_cache: ResponseCache) -> SuiteApiClient:
+    return SuiteApiClient(
+        SuiteApiConnectionParameters(suite_api.host, "user", "password"),
+        response_cache=response_cache,
+    )
+
+
+def resource_requests(suite_api) -> int:
+    return sum(1 for request in suite_api.requests if "/api/resources" in request[1])
+
+
+def test_put_and_get(tmp_path) -> None:
+    path = str(tmp_path / "responses.db")
+    ResponseCache(path).put("key", {"value": [1, "2"]}, ttl=60)
+    response_cache = ResponseCache(path)
+    assert response_cache.get("key") == {"value": [1, "2"]}
+    assert response_cache.get("other") is None
+
+
+def test_expired_responses_are_not_returned(tmp_path) -> None:
+    response_cache = ResponseCache(str(tmp_path / "responses.db"))
+    response_cache.put("key", "value", ttl=0.01)
+    time.sleep(0.02)
+    assert response_cache.get("key") is None
+
+
+def test_least_recently_used_responses_are_evicted(tmp_path) -> None:
+    # Each response is 5 bytes of JSON
+    response_cache = ResponseCache(str(tmp_path / "responses.db"), max_size=15)
+    for key in ["a", "b", "c"]:
+        response_cache.put(key, key * 3, ttl=60)
+        time.sleep(0.01)
+    assert response_cache.get("a") == "aaa"
+    time.sleep(0.01)
+    response_cache.put("d", "ddd", ttl=60)
+    assert response_cache.get("b") is None
+    assert [response_cache.get(key) for key in ["a", "c", "d"]] == [
+        "aaa",
+        "ccc",
+        "ddd",
+    ]
+    # Responses larger than the cache are not stored
+    response_cache.put("e", "e" * 20, ttl=60)
+    assert response_cache.get("e") is None
+    assert response_cache.get("d") == "ddd"
+
+
+def test_key() -> None:
+    assert ResponseCache.key("GET", "url", {"a": 1, "b": 2}) == ResponseCache.key(
+        "GET", "url", {"b": 2, "a": 1}
+    )
+    assert ResponseCache.key("GET", "url") != ResponseCache.key("POST", "url")
+
+
+def test_cached_requests(suite_api, tmp_path) -> None:
+    response_cache = ResponseCache(str(tmp_path / "responses.db"))
+    for _ in range(2):
+        with client(suite_api, response_cache) as suite_api_client:
+            resources = suite_api_client.cached_get("/api/resources", ttl=60)
+            paged = suite_api_client.cached_paged_get(
+                "/api/resources", "resourceList", 60, pageSize=10
+            )
+            objects = suite_api_client.query_for_resources(
+                {"adapterKind": ["Adapter"]}, cache_ttl=60
+            )
+        assert resources["resourceList"] == suite_api.resources
+        assert paged == {"resourceList": suite_api.resources, "failedPages": []}
+        assert len(objects) == 25
+        # A GET, three pages and a query
+        assert resource_requests(suite_api) == 5
+
+    with client(suite_api, response_cache) as suite_api_client:
+        suite_api_client.query_for_resources({"adapterKind": ["Other"]}, cache_ttl=60)
+        suite_api_client.query_for_resources({"adapterKind": ["Adapter"]})
+    assert resource_requests(suite_api) == 7
+
+
+def test_failed_requests_are_not_cached(suite_api, tmp_path) -> None:
+    suite_api.failing_pages = [1]
+    response_cache = ResponseCache(str(tmp_path / "responses.db"))
+    with client(suite_api, response_cache) as suite_api_client:
+        for _ in range(2):
+            assert suite_api_client.cached_get("/api/missing", ttl=60) is None
+            result = suite_api_client.cached_paged_post(
+                "/api/resources/query", "resourceList", 60, json={}, pageSize=10
+            )
+            assert result["failedPages"] == [1]
+    assert len(suite_api.requests) == 2 + 2 * (1 + 3)
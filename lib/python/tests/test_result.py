@@ -1,5 +1,8 @@
 #  Copyright 2022 VMware, Inc.
 #  SPDX-License-Identifier: Apache-2.0
+import json
+import sys
+
 from aria.ops import result
 
 
@@ -16,3 +19,14 @@ def test_error_test_result() -> None:
     tr.with_error(error_message)
     assert "errorMessage" in tr.get_json()
     assert tr.get_json()["errorMessage"] == error_message
+
+
+def test_send_results_resolves_output_pipe_when_called(tmp_path, monkeypatch) -> None:
+    # Adapter processes can be reused for multiple requests, so the default output
+    # pipe must be read from sys.argv when 'send_results' is called.
+    output_pipe = tmp_path / "output_pipe"
+    monkeypatch.setattr(sys, "argv", ["adapter.py", "test", "input", str(output_pipe)])
+    tr = result.TestResult()
+    tr.with_error("Test Error Message")
+    tr.send_results()
+    assert json.loads(output_pipe.read_text()) == {"errorMessage": "Test Error Message"}
@@ -0,0 +1,172 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import gc
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+from aria.ops.adapter_instance import AdapterInstance
+from aria.ops.object import Key
+from aria.ops.result import CollectResult
+from aria.ops.state import get_instance_data_directory
+from aria.ops.state import StateStore
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "state.db")
+
+
+def test_values_are_persisted_on_commit(path) -> None:
+    state = StateStore(path)
+    assert len(state) == 0
+    state["cursor"] = 10
+    state["seen"] = ["a", "b"]
+    state["event"] = {"id": "e1", "time": 1000}
+    assert StateStore(path).get("cursor") is None
+
+    state.commit()
+    restored = StateStore(path)
+    assert dict(restored) == {
+        "cursor": 10,
+        "seen": ["a", "b"],
+        "event": {"id": "e1", "time": 1000},
+    }
+
+    del restored["seen"]
+    restored["cursor"] = 20
+    restored.commit()
+    assert dict(StateStore(path)) == {"cursor": 20, "event": {"id": "e1", "time": 1000}}
+
+
+def test_values_are_copied_when_assigned(path) -> None:
+    state = StateStore(path)
+    seen = ["a"]
+    state["seen"] = seen
+    seen.append("b")
+    assert state["seen"] == ["a"]
+
+
+def test_values_must_be_json_serializable(path) -> None:
+    state = StateStore(path)
+    with pytest.raises(TypeError):
+        state["value"] = object()
+    assert "value" not in state
+
+
+def test_rollback(path) -> None:
+    state = StateStore(path)
+    state["cursor"] = 10
+    state.commit()
+    state["cursor"] = 20
+    state.rollback()
+    assert state["cursor"] == 10
+
+
+def test_commit_when_results_are_sent(path, tmp_path) -> None:
+    state = StateStore(path)
+    state["cursor"] = 10
+    CollectResult().send_results(str(tmp_path / "output"))
+    assert StateStore(path)["cursor"] == 10
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_no_commit_when_results_are_not_sent(path, tmp_path, stream) -> None:
+    state = StateStore(path)
+    state["cursor"] = 10
+    # The output pipe cannot be opened
+    CollectResult(stream=stream).send_results(str(tmp_path / "missing" / "output"))
+    assert "cursor" not in StateStore(path)
+    # The changes are discarded, rather than committed with the next collection
+    assert "cursor" not in state
+    CollectResult(stream=stream).send_results(str(tmp_path / "output"))
+    assert "cursor" not in StateStore(path)
+
+
+def test_template_pattern(tmp_path, monkeypatch) -> None:
+    # As the adapter templates, which keep no reference to the AdapterInstance
+    monkeypatch.setattr("aria.ops.state.DEFAULT_STATE_DIRECTORY", str(tmp_path))
+    input_pipe = tmp_path / "input"
+    input_pipe.write_text(
+        json.dumps(
+            {
+                "adapter_key": {
+                    "adapter_kind": "Adapter",
+                    "object_kind": "Instance",
+                    "name": "a",
+                    "identifiers": [],
+                },
+                "collection_number": 1,
+            }
+        )
+    )
+    monkeypatch.setattr(
+        sys, "argv", ["adapter.py", "collect", str(input_pipe), str(tmp_path / "out")]
+    )
+
+    def collect(adapter_instance: AdapterInstance) -> CollectResult:
+        adapter_instance.state["cursor"] = adapter_instance.state.get("cursor", 0) + 1
+        return CollectResult()
+
+    for _ in range(3):
+        collect(AdapterInstance.from_input()).send_results()
+        gc.collect()
+    assert (
+        StateStore.for_adapter_instance(Key("Adapter", "Instance", "a"))["cursor"] == 3
+    )
+
+
+def test_changes_are_discarded_when_collection_fails(path, tmp_path) -> None:
+    state = StateStore(path)
+    state["cursor"] = 10
+    result = CollectResult()
+    result.with_error("error")
+    result.send_results(str(tmp_path / "output"))
+    assert "cursor" not in StateStore(path)
+    assert "cursor" not in state
+    # Not committed with the next collection
+    CollectResult().send_results(str(tmp_path / "output"))
+    assert "cursor" not in StateStore(path)
+
+
+def test_adapter_instance_state(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("aria.ops.state.DEFAULT_STATE_DIRECTORY", str(tmp_path))
+
+    def adapter_instance(name: str) -> AdapterInstance:
+        return AdapterInstance(
+            {
+                "adapter_key": {
+                    "adapter_kind": "Adapter",
+                    "object_kind": "Instance",
+                    "name": name,
+                    "identifiers": [],
+                },
+                "collection_number": 1,
+            }
+        )
+
+    instance = adapter_instance("a")
+    assert instance.state is instance.state
+    assert instance.state.path.startswith(str(tmp_path))
+    instance.state["cursor"] = 10
+    instance.state.commit()
+    assert adapter_instance("a").state["cursor"] == 10
+    assert "cursor" not in adapter_instance("b").state
+    assert (
+        StateStore.for_adapter_instance(
+            Key("Adapter", "Instance", "a"), str(tmp_path)
+        ).path
+        == instance.state.path
+    )
+
+
+def test_instance_data_directory(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("aria.ops.state.DEFAULT_STATE_DIRECTORY", str(tmp_path))
+    assert get_instance_data_directory() == str(tmp_path)
+    assert get_instance_data_directory("/data") == "/data"
+    # Falls back to the temporary directory if the default is not writable
+    missing = os.path.join(str(tmp_path), "missing")
+    monkeypatch.setattr("aria.ops.state.DEFAULT_STATE_DIRECTORY", missing)
+    assert get_instance_data_directory() == tempfile.gettempdir()
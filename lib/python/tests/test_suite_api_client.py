@@ -0,0 +1,137 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+from aria.ops.suite_api_client import SuiteApiClient
+from aria.ops.suite_api_client import SuiteApiConnectionParameters
+
+
+def client(suite_api, **kwargs) -> SuiteApiClient:
+    return SuiteApiClient(
+        SuiteApiConnectionParameters(suite_api.host, "user", "password"), **kwargs
+    )
+
+
+def test_token(suite_api) -> None:
+    with client(suite_api) as suite_api_client:
+        assert suite_api_client.token == "token"
+    assert suite_api_client.token == ""
+    assert [request[1] for request in suite_api.requests] == [
+        "/suite-api/api/auth/token/acquire",
+        "/suite-api/api/auth/token/release",
+    ]
+
+
+def test_connections_are_reused(suite_api) -> None:
+    with client(suite_api, page_concurrency=1) as suite_api_client:
+        result = suite_api_client.paged_post(
+            "/api/resources/query", "resourceList", json={}, pageSize=5
+        )
+        with suite_api_client.get("/api/resources") as response:
+            assert response.ok
+    assert len(result["resourceList"]) == 25
+    # Token acquisition, five pages, a GET and token release
+    assert len(suite_api.requests) == 8
+    assert suite_api.connections == 1
+
+
+def test_connections_are_closed_on_exit(suite_api) -> None:
+    with client(suite_api) as suite_api_client:
+        pass
+    # A new connection is opened after the pool is closed
+    suite_api_client.get("/api/resources").close()
+    assert suite_api.connections == 2
+
+
+def test_pages_are_combined_in_order(suite_api) -> None:
+    with client(suite_api, page_concurrency=3) as suite_api_client:
+        result = suite_api_client.paged_post(
+            "/api/resources/query", "resourceList", json={"name": ["a"]}, pageSize=4
+        )
+    assert result == {"resourceList": suite_api.resources, "failedPages": []}
+    pages = [
+        request[2]
+        for request in suite_api.requests
+        if request[1].endswith("/api/resources/query")
+    ]
+    assert sorted(int(params["page"]) for params in pages) == list(range(7))
+    assert all(params["pageSize"] == "4" for params in pages)
+    # Concurrent pages share the connection pool
+    assert suite_api.connections <= 3
+
+
+def test_failed_pages_are_reported(suite_api) -> None:
+    suite_api.failing_pages = [2, 4]
+    with client(suite_api) as suite_api_client:
+        result = suite_api_client.paged_get(
+            "/api/resources", "resourceList", pageSize=5
+        )
+    assert result["failedPages"] == [2, 4]
+    assert result["resourceList"] == (
+        suite_api.resources[0:10] + suite_api.resources[15:20]
+    )
+
+
+def test_failed_first_page(suite_api) -> None:
+    suite_api.failing_pages = [0]
+    with client(suite_api) as suite_api_client:
+        result = suite_api_client.paged_get("/api/resources", "resourceList")
+    assert result == {"resourceList": [], "failedPages": [0]}
+
+
+def test_query_for_resources(suite_api) -> None:
+    with client(suite_api) as suite_api_client:
+        objects = suite_api_client.query_for_resources({"adapterKind": ["Adapter"]})
+    assert [obj.get_key().name for obj in objects] == [
+        f"resource-{i}" for i in range(25)
+    ]
+
+
+def page_requests(suite_api) -> list:
+    return [
+        int(request[2]["page"])
+        for request in suite_api.requests
+        if request[1].endswith("/api/resources/query")
+    ]
+
+
+def test_iter_paged_post(suite_api) -> None:
+    suite_api.failing_pages = [3]
+    with client(suite_api) as suite_api_client:
+        resources = list(
+            suite_api_client.iter_paged_post(
+                "/api/resources/query", "resourceList", json={}, pageSize=4
+            )
+        )
+    assert resources == suite_api.resources[0:12] + suite_api.resources[16:25]
+    assert page_requests(suite_api) == list(range(7))
+
+
+def test_iter_paged_get_is_lazy(suite_api) -> None:
+    with client(suite_api) as suite_api_client:
+        resources = suite_api_client.iter_paged_get(
+            "/api/resources", "resourceList", prefetch=False, pageSize=4
+        )
+        assert [next(resources) for _ in range(5)] == suite_api.resources[0:5]
+        resources.close()
+    assert sorted(
+        int(request[2]["page"])
+        for request in suite_api.requests
+        if request[1].endswith("/api/resources")
+    ) == [0, 1]
+
+
+def test_iter_paged_post_prefetches_next_page(suite_api) -> None:
+    with client(suite_api) as suite_api_client:
+        resources = suite_api_client.iter_paged_post(
+            "/api/resources/query", "resourceList", json={}, pageSize=4
+        )
+        assert next(resources) == suite_api.resources[0]
+        resources.close()
+    assert page_requests(suite_api) == [0, 1]
+
+
+def test_iter_resources(suite_api) -> None:
+    with client(suite_api) as suite_api_client:
+        objects = suite_api_client.iter_resources({"name": ["a", "b"]})
+        assert [obj.get_key().name for obj in objects] == [
+            f"resource-{i}" for i in range(25)
+        ] * 2
@@ -0,0 +1,107 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import os
+import stat
+import time
+
+from aria.ops.suite_api_client import SuiteApiClient
+from aria.ops.suite_api_client import SuiteApiConnectionParameters
+from aria.ops.token_cache import TokenCache
+
+
+def client(suite_api, token_cache: TokenCache, **kwargs) -> SuiteApiClient:
+    return SuiteApiClient(
+        SuiteApiConnectionParameters(suite_api.host, "user", "password"),
+        token_cache=token_cache,
+        **kwargs,
+    )
+
+
+def token_requests(suite_api) -> list:
+    return [
+        request[1].rsplit("/", 1)[1]
+        for request in suite_api.requests
+        if "/auth/token/" in request[1]
+    ]
+
+
+def test_put_and_get(tmp_path) -> None:
+    path = str(tmp_path / "tokens.json")
+    TokenCache(path).put("host", "user", "LOCAL", "token", time.time() + 3600)
+    token_cache = TokenCache(path)
+    assert token_cache.get("host", "user", "LOCAL") == "token"
+    assert token_cache.get("host", "other", "LOCAL") is None
+    assert token_cache.get("other", "user", "LOCAL") is None
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_temporary_file_is_not_predictable(tmp_path) -> None:
+    path = str(tmp_path / "tokens.json")
+    other = tmp_path / "other"
+    other.write_text("unchanged")
+    # A link at the temporary path that was used before must not be followed
+    os.symlink(other, f"{path}.{os.getpid()}.tmp")
+    TokenCache(path).put("host", "user", "LOCAL", "token", time.time() + 3600)
+    assert other.read_text() == "unchanged"
+    assert TokenCache(path).get("host", "user", "LOCAL") == "token"
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        ["other", "tokens.json", f"tokens.json.{os.getpid()}.tmp"]
+    )
+
+
+def test_expiring_tokens_are_not_used(tmp_path) -> None:
+    token_cache = TokenCache(str(tmp_path / "tokens.json"), renewal_margin=600)
+    token_cache.put("host", "expiring", "LOCAL", "token", time.time() + 300)
+    token_cache.put("host", "expired", "LOCAL", "token", time.time() - 1)
+    assert token_cache.get("host", "expiring", "LOCAL") is None
+    assert token_cache.get("host", "expired", "LOCAL") is None
+    # Expired tokens are dropped from the file
+    assert len(token_cache._load()) == 1
+
+
+def test_remove(tmp_path) -> None:
+    token_cache = TokenCache(str(tmp_path / "tokens.json"))
+    token_cache.put("host", "user", "LOCAL", "token")
+    token_cache.remove("host", "user", "LOCAL")
+    assert token_cache.get("host", "user", "LOCAL") is None
+
+
+def test_unreadable_cache(tmp_path) -> None:
+    path = tmp_path / "tokens.json"
+    path.write_text("{")
+    token_cache = TokenCache(str(path))
+    assert token_cache.get("host", "user", "LOCAL") is None
+    token_cache.put("host", "user", "LOCAL", "token")
+    assert token_cache.get("host", "user", "LOCAL") == "token"
+
+
+def test_token_is_reused_between_clients(suite_api, tmp_path) -> None:
+    token_cache = TokenCache(str(tmp_path / "tokens.json"))
+    for _ in range(3):
+        with client(suite_api, token_cache) as suite_api_client:
+            assert suite_api_client.token == "token"
+            with suite_api_client.get("/api/resources") as response:
+                assert response.ok
+    assert token_requests(suite_api) == ["acquire"]
+    with client(suite_api, token_cache) as suite_api_client:
+        suite_api_client.release_token()
+    assert token_requests(suite_api) == ["acquire", "release"]
+    assert token_cache.get(suite_api_client.credential.host, "user", "LOCAL") is None
+
+
+def test_rejected_token_is_renewed(suite_api, tmp_path) -> None:
+    token_cache = TokenCache(str(tmp_path / "tokens.json"))
+    with client(suite_api, token_cache) as suite_api_client:
+        token_cache.put(suite_api_client.credential.host, "user", "LOCAL", "stale")
+    with client(suite_api, token_cache, page_concurrency=4) as suite_api_client:
+        assert suite_api_client.token == "stale"
+        result = suite_api_client.paged_get(
+            "/api/resources", "resourceList", pageSize=5
+        )
+        assert suite_api_client.token == "token"
+    assert result == {"resourceList": suite_api.resources, "failedPages": []}
+    # The token is acquired once, even though pages are requested concurrently
+    assert token_requests(suite_api) == ["acquire", "acquire"]
+    assert token_cache.get(suite_api_client.credential.host, "user", "LOCAL") == (
+        "token"
+    )
@@ -0,0 +1,47 @@
+#  Copyright 2023 VMware, Inc.
+#  SPDX-License-Identifier: Apache-2.0
+import gzip
+
+import httpx
+
+from vmware_aria_operations_integration_sdk.containerized_adapter_rest_api import (
+    get_response_sizes,
+)
+from vmware_aria_operations_integration_sdk.serialization import CollectionBundle
+
+BODY = b'{"result": [' + b", ".join([b'{"key": {"name": "object"}}'] * 100) + b"]}"
+
+
+def get(headers, content):
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            200, headers=headers, stream=httpx.ByteStream(content)
+        )
+    )
+    with httpx.Client(transport=transport) as client:
+        return client.get("http://localhost/collect")
+
+
+def test_response_sizes_compressed():
+    compressed = gzip.compress(BODY)
+    response = get({"Content-Encoding": "gzip"}, compressed)
+    assert response.content == BODY
+    assert get_response_sizes(response) == (len(BODY), len(compressed))
+
+
+def test_response_sizes_uncompressed():
+    response = get({}, BODY)
+    assert get_response_sizes(response) == (len(BODY), None)
+
+
+def test_response_sizes_not_downloaded():
+    response = httpx.Response(408)
+    assert get_response_sizes(response) == (0, None)
+
+
+def test_collection_response_size_message():
+    response = get({"Content-Encoding": "gzip"}, gzip.compress(BODY))
+    bundle = CollectionBundle(None, response, 1.0, None)
+    message = bundle.get_response_size_message()
+    assert message.startswith(f"Collection response size: {len(BODY) / 1024:.2f} KiB")
+    assert "with gzip encoding" in message
@@ -3,6 +3,7 @@
 import json
 import os
 from typing import Dict
+from typing import Optional
 from typing import Tuple
 
 import httpx
@@ -17,6 +18,9 @@ from vmware_aria_operations_integration_sdk.project import Connection
 from vmware_aria_operations_integration_sdk.project import Project
 from vmware_aria_operations_integration_sdk.timer import timed
 
+# Collect results are large, repetitive JSON, and the adapter server compresses them
+ACCEPT_ENCODING = "gzip"
+
 
 @timed
 async def get(
@@ -48,7 +52,7 @@ async def send_post_to_adapter(
             client,
             url=f"http://localhost:{port}/{endpoint}",
             json=await get_request_body(port, connection, send_cluster_connection_info),
-            headers={"Accept": "application/json"},
+            headers={"Accept": "application/json", "Accept-Encoding": ACCEPT_ENCODING},
         )
     except ReadTimeout as timeout:
         # Translate the error to a standard request response format (for validation purposes)
@@ -156,6 +160,18 @@ async def get_request_body(
     return request_body
 
 
+def get_response_sizes(response: Response) -> Tuple[int, Optional[int]]:
+    """
+    Returns the size of the response body, and the number of bytes it was transferred
+    in if it was compressed (otherwise None).
+    """
+    size = len(response.content)
+    encoding = response.headers.get("Content-Encoding", "identity")
+    if encoding == "identity" or not response.num_bytes_downloaded:
+        return size, None
+    return size, response.num_bytes_downloaded
+
+
 def get_failure_message(response: Response) -> str:
     message = ""
     if not response.is_success:
@@ -24,10 +24,14 @@ from vmware_aria_operations_integration_sdk.collection_statistics import (
 from vmware_aria_operations_integration_sdk.containerized_adapter_rest_api import (
     get_failure_message,
 )
+from vmware_aria_operations_integration_sdk.containerized_adapter_rest_api import (
+    get_response_sizes,
+)
 from vmware_aria_operations_integration_sdk.docker_wrapper import ContainerStats
 from vmware_aria_operations_integration_sdk.logging_format import CustomFormatter
 from vmware_aria_operations_integration_sdk.logging_format import PTKHandler
 from vmware_aria_operations_integration_sdk.project import Project
+from vmware_aria_operations_integration_sdk.stats import convert_bytes
 from vmware_aria_operations_integration_sdk.util import LazyAttribute
 from vmware_aria_operations_integration_sdk.validation.adapter_definition_validator import (
     validate_adapter_definition,
@@ -154,6 +158,14 @@ class CollectionBundle(ResponseBundle):
             else CollectionStatistics(json.loads(self.response.text))
         )
 
+    def get_response_size_message(self) -> str:
+        size, compressed_size = get_response_sizes(self.response)
+        message = f"Collection response size: {convert_bytes(size)}"
+        if compressed_size is not None:
+            encoding = self.response.headers.get("Content-Encoding")
+            message += f" ({convert_bytes(compressed_size)} with {encoding} encoding)"
+        return message + "\n"
+
     def __repr__(self) -> str:
         _str = ""
         if not self.failed():
@@ -170,6 +182,7 @@ class CollectionBundle(ResponseBundle):
         ):  # Allows the error message to be highlighted
             if self.container_statistics:
                 _str += str(self.container_statistics.get_table()) + "\n"
+            _str += self.get_response_size_message()
             _str += f"Collection completed in {self.duration:0.2f} seconds.\n"
 
         return _str